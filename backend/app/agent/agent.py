@@ -1,6 +1,8 @@
 # backend/app/agent/agent.py
 
 import os
+import hashlib
+from functools import lru_cache
 from langchain.agents import initialize_agent, AgentType
 from langchain.agents import AgentExecutor
 
@@ -19,24 +21,6 @@ from langfuse.langchain import CallbackHandler
 from backend.app.agent.prompt_loader import get_main_agent_prompt
 
 
-# =====================================
-# Load LLM
-# =====================================
-
-llm = get_llm()
-
-# =====================================
-# Langfuse Setup (SAFE)
-# =====================================
-
-langfuse = Langfuse(
-    public_key=os.getenv("LANGFUSE_PUBLIC_KEY"),
-    secret_key=os.getenv("LANGFUSE_SECRET_KEY"),
-    host=os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com"),
-)
-
-langfuse_handler = CallbackHandler()
-
 # =====================================
 # Register Tools
 # =====================================
@@ -51,43 +35,65 @@ tools = [
 # LOAD PROMPT FROM LANGFUSE
 # =====================================
 
-SYSTEM_PREFIX = get_main_agent_prompt()
+@lru_cache(maxsize=1)
+def get_system_prefix() -> str:
+    return get_main_agent_prompt()
 
-# =====================================
-# Create Structured Agent
-# =====================================
 
-base_agent = initialize_agent(
-    tools=tools,
-    llm=llm,
-    agent=AgentType.STRUCTURED_CHAT_ZERO_SHOT_REACT_DESCRIPTION,
-    verbose=True,
-    agent_kwargs={
-        "prefix": SYSTEM_PREFIX
-    }
-)
+# ✅ STEP 54 — Prompt version (part of the response cache key)
+@lru_cache(maxsize=1)
+def get_prompt_version() -> str:
+    return hashlib.sha256(get_system_prefix().encode()).hexdigest()[:12]
 
 # =====================================
-# Stability Executor + Langfuse
+# Create Structured Agent
 # =====================================
 
-agent = AgentExecutor.from_agent_and_tools(
-    agent=base_agent.agent,
-    tools=tools,
-    verbose=True,
-    handle_parsing_errors=True,
-    max_iterations=3,
-    early_stopping_method="generate",
-    callbacks=[langfuse_handler]
-)
+@lru_cache(maxsize=1)
+def get_agent() -> AgentExecutor:
+    """
+    Builds the LLM, Langfuse handler and executor on first use, so
+    importing the routes does not need LLM_PROVIDER or Langfuse.
+    """
+    llm = get_llm()
+
+    # Langfuse v3 (SAFE) — registers the client CallbackHandler uses
+    Langfuse(
+        public_key=os.getenv("LANGFUSE_PUBLIC_KEY"),
+        secret_key=os.getenv("LANGFUSE_SECRET_KEY"),
+        host=os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com"),
+    )
+
+    langfuse_handler = CallbackHandler()
+
+    base_agent = initialize_agent(
+        tools=tools,
+        llm=llm,
+        agent=AgentType.STRUCTURED_CHAT_ZERO_SHOT_REACT_DESCRIPTION,
+        verbose=True,
+        agent_kwargs={
+            "prefix": get_system_prefix()
+        }
+    )
+
+    # Stability Executor + Langfuse
+    return AgentExecutor.from_agent_and_tools(
+        agent=base_agent.agent,
+        tools=tools,
+        verbose=True,
+        handle_parsing_errors=True,
+        max_iterations=3,
+        early_stopping_method="generate",
+        callbacks=[langfuse_handler]
+    )
 
 # =====================================
 # Public invoke function
 # =====================================
 
 def run_agent(user_input: str):
-    response = agent.invoke({
+    response = get_agent().invoke({
         "input": user_input
     })
 
-    return response["output"]
\ No newline at end of file
+    return response["output"]
@@ -0,0 +1,204 @@
+# backend/app/agent/intent_router.py
+# STEP 50 — Deterministic Intent Fast Path
+# Rule-based router that answers single-tool intents without the LLM.
+# Ambiguous input always falls back to the ReAct agent.
+
+import re
+import threading
+from collections import deque
+
+from backend.app.agent.tools import check_inventory, proactive_refill_check
+
+
+# =====================================================
+# INTENT RULES (mirror the agent prompt)
+# =====================================================
+
+# Any refill talk; only the status questions below are served directly
+REFILL_MENTION = re.compile(r"\b(refills?|overdue)\b")
+
+_MEDICINES = r"(?:medicines|medications|meds|prescriptions)"
+
+REFILL_STATUS_PATTERNS = [
+    re.compile(r"^(?:show|list|check|view)\s+(?:me\s+)?(?:my\s+)?(?:upcoming\s+|overdue\s+|due\s+)?"
+               r"(?:refills?|refill status|refill predictions?)$"),
+    re.compile(r"^(?:when|what)\s+(?:is|are)\s+my\s+(?:next\s+)?(?:refills?|refill status)(?:\s+due)?$"),
+    re.compile(rf"^(?:what|which)\s+(?:refills|{_MEDICINES})\s+(?:are\s+)?(?:due|overdue)"
+               r"(?:\s+for\s+(?:a\s+)?refill)?$"),
+    re.compile(r"^(?:do|will)\s+i\s+need\s+(?:a\s+)?refill(?:\s+soon)?$"),
+    re.compile(r"^am\s+i\s+(?:due|overdue)\s+for\s+(?:a\s+)?refill$"),
+    re.compile(rf"^(?:is|are)\s+(?:anything|any\s+(?:of\s+)?my\s+(?:refills|{_MEDICINES}))\s+(?:due|overdue)$"),
+    re.compile(r"^(?:are there\s+)?any\s+(?:refills\s+)?(?:due|overdue)(?:\s+refills)?$"),
+    re.compile(r"^(?:refill status|refill prediction|my refills)$"),
+]
+
+ORDER_PATTERN = re.compile(
+    r"\b(order|orders|buy|purchase)\b"
+    # Refill requests are reorders: they need the agent's order flow
+    r"|^(?:i|we)(?:'d| would)?\s+(?:need|want|like)\b.*\brefill"
+    r"|^(?:can|could)\s+(?:i|you)\s+(?:get|have|send)\b.*\brefill"
+    r"|^refill\s+(?:my|the)\b"
+    r"|\brefill\s+of\b"
+)
+
+INVENTORY_PATTERNS = [
+    re.compile(r"^(?:is|are)\s+(?P<name>.+?)\s+(?:in stock|available)$"),
+    re.compile(r"^(?:do|does)\s+(?:you|the pharmacy)\s+(?:have|stock)\s+(?P<name>.+?)(?:\s+in stock)?$"),
+    re.compile(r"^(?:check\s+)?(?:stock|inventory|availability)\s+(?:of|for)\s+(?P<name>.+)$"),
+    re.compile(r"^check\s+(?:if\s+)?(?P<name>.+?)\s+(?:is\s+)?(?:in stock|available)$"),
+    re.compile(r"^how (?:much|many)\s+(?P<name>.+?)\s+(?:is|are)?\s*(?:in stock|left|available)$"),
+]
+
+FILLER_PREFIXES = ("any ", "some ", "the ")
+
+FAST_PATH = "fast"
+LLM_PATH = "llm"
+
+
+def _normalize(message: str) -> str:
+    text = message.strip().lower()
+    text = re.sub(r"[?!.]+$", "", text)
+    text = re.sub(r"^(please|hi|hello|hey)[,\s]+", "", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _clean_medicine_name(name: str) -> str:
+    name = name.strip(" ,'\"")
+    for prefix in FILLER_PREFIXES:
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+    return name.strip()
+
+
+# =====================================================
+# CLASSIFIER
+# =====================================================
+
+def classify_intent(message: str):
+    """
+    Deterministic intent classifier.
+
+    Returns {"intent": "refill"} or {"intent": "inventory", "medicine_name": ...}
+    when exactly one read-only intent matches, otherwise None.
+    Order intents (including refill requests) are never served here —
+    they need the agent's inventory check + explicit order
+    confirmation flow.
+    """
+
+    if not message:
+        return None
+
+    text = _normalize(message)
+
+    if ORDER_PATTERN.search(text):
+        return None
+
+    refill_match = any(pattern.match(text) for pattern in REFILL_STATUS_PATTERNS)
+
+    # Refill talk that is not a plain status question ("why did my
+    # refill get cancelled?") needs the LLM
+    if REFILL_MENTION.search(text) and not refill_match:
+        return None
+
+    inventory_name = None
+    for pattern in INVENTORY_PATTERNS:
+        match = pattern.match(text)
+        if match:
+            inventory_name = _clean_medicine_name(match.group("name"))
+            break
+
+    # Both intents present → ambiguous, let the LLM decide
+    if refill_match and inventory_name:
+        return None
+
+    if refill_match:
+        return {"intent": "refill"}
+
+    if inventory_name:
+        return {"intent": "inventory", "medicine_name": inventory_name}
+
+    return None
+
+
+# =====================================================
+# ROUTER
+# =====================================================
+
+def route_message(message: str, patient_id: int):
+    """
+    Serves the message directly through the tool functions when the
+    intent is unambiguous. Returns None when the LLM must handle it.
+    """
+
+    match = classify_intent(message)
+
+    if not match:
+        return None
+
+    if match["intent"] == "refill":
+        response = proactive_refill_check(patient_id)
+    else:
+        response = check_inventory(match["medicine_name"])
+
+    return {
+        "response": response,
+        "intent": match["intent"],
+    }
+
+
+# =====================================================
+# PATH METRICS
+# =====================================================
+
+class RouterStats:
+    """
+    Thread-safe per-path request counters and latency samples.
+    Latency percentiles are computed over the most recent samples only.
+    """
+
+    def __init__(self, max_samples: int = 1000):
+        self._lock = threading.Lock()
+        self._max_samples = max_samples
+        self._counts = {}
+        self._latencies = {}
+
+    def record(self, path: str, elapsed_ms: float):
+        with self._lock:
+            self._counts[path] = self._counts.get(path, 0) + 1
+            samples = self._latencies.setdefault(
+                path, deque(maxlen=self._max_samples)
+            )
+            samples.append(elapsed_ms)
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+            self._latencies.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            total = sum(self._counts.values())
+            paths = {}
+
+            for path, count in self._counts.items():
+                samples = sorted(self._latencies.get(path, []))
+                paths[path] = {
+                    "count": count,
+                    "share": round(count / total, 4) if total else 0.0,
+                    "avg_latency_ms": round(sum(samples) / len(samples), 2) if samples else 0.0,
+                    "p50_latency_ms": _percentile(samples, 50),
+                    "p95_latency_ms": _percentile(samples, 95),
+                }
+
+            return {"total_requests": total, "paths": paths}
+
+
+def _percentile(sorted_samples: list, pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(pct / 100 * (len(sorted_samples) - 1))))
+    return round(sorted_samples[index], 2)
+
+
+router_stats = RouterStats()
+
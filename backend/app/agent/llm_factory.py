@@ -22,4 +22,18 @@ def get_llm():
         )
 
     else:
-        raise ValueError("Invalid LLM_PROVIDER in .env")
\ No newline at end of file
+        raise ValueError("Invalid LLM_PROVIDER in .env")
+
+def get_llm_identity():
+    """
+    (provider, model) of the configured LLM — used in cache keys.
+    """
+    provider = os.getenv("LLM_PROVIDER")
+
+    if provider == "ollama":
+        return provider, os.getenv("OLLAMA_MODEL", "mistral")
+
+    if provider == "openai":
+        return provider, os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+    return provider, None
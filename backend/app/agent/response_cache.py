@@ -0,0 +1,177 @@
+# backend/app/agent/response_cache.py
+# STEP 54 — LLM Response Cache
+# Exact-match cache for agent answers. Keys include a patient data
+# version, so a new order, refill alert change or stock change on one
+# of the patient's medicines produces a new key and stale answers are
+# never served. Other patients' stock moves leave the key alone.
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend.app.models.medicine import Medicine
+from backend.app.models.order import Order
+from backend.app.models.refill_alert import RefillAlert
+
+
+AGENT_CACHE_TTL_SECONDS = int(os.getenv("AGENT_CACHE_TTL_SECONDS", "300"))
+AGENT_CACHE_MAX_ENTRIES = int(os.getenv("AGENT_CACHE_MAX_ENTRIES", "1000"))
+
+CACHE_PATH = "cache"
+
+
+# =====================================================
+# KEY COMPONENTS
+# =====================================================
+
+def normalize_message(message: str) -> str:
+    text = re.sub(r"\s+", " ", (message or "").strip().lower())
+    return re.sub(r"[?!.]+$", "", text).strip()
+
+
+def get_patient_data_version(db: Session, patient_id: int) -> str:
+    """
+    Cheap fingerprint of everything an agent answer can depend on:
+    - the patient's orders (count + max id)
+    - the patient's refill alerts (id + status of each, in id order)
+    - the stock version of each medicine the patient has ordered, in
+      id order. Stock versions only ever increase, so any stock change
+      moves them, even moves that cancel out in units
+    - the catalog's max medicine id (new medicines)
+
+    Every query is an index lookup for this patient; none scans the
+    catalog.
+    """
+    order_count, max_order_id = (
+        db.query(func.count(Order.id), func.max(Order.id))
+        .filter(Order.patient_id == patient_id)
+        .one()
+    )
+
+    alerts = (
+        db.query(RefillAlert.id, RefillAlert.status)
+        .filter(RefillAlert.patient_id == patient_id)
+        .order_by(RefillAlert.id)
+        .all()
+    )
+
+    patient_medicines = (
+        db.query(Order.medicine_id)
+        .filter(Order.patient_id == patient_id)
+        .distinct()
+    )
+
+    stock_versions = (
+        db.query(Medicine.id, Medicine.stock_version)
+        .filter(Medicine.id.in_(patient_medicines))
+        .order_by(Medicine.id)
+        .all()
+    )
+
+    max_medicine_id = db.query(func.max(Medicine.id)).scalar()
+
+    fingerprint = (
+        f"o:{order_count}:{max_order_id}|"
+        f"a:{','.join(f'{alert_id}={status}' for alert_id, status in alerts)}|"
+        f"s:{','.join(f'{medicine_id}={version}' for medicine_id, version in stock_versions)}|"
+        f"m:{max_medicine_id}"
+    )
+
+    return hashlib.sha256(fingerprint.encode()).hexdigest()[:16]
+
+
+def build_cache_key(
+    provider: str,
+    model: str,
+    prompt_version: str,
+    patient_id: int,
+    message: str,
+    data_version: str,
+) -> str:
+    raw = "\x1f".join([
+        str(provider),
+        str(model),
+        str(prompt_version),
+        str(patient_id),
+        normalize_message(message),
+        data_version,
+    ])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+# =====================================================
+# CACHE
+# =====================================================
+
+class AgentResponseCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and hit-rate metrics.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: str):
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires_at, value = entry
+
+            if expires_at <= now:
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: str, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+
+response_cache = AgentResponseCache(AGENT_CACHE_MAX_ENTRIES, AGENT_CACHE_TTL_SECONDS)
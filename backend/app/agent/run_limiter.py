@@ -0,0 +1,93 @@
+# backend/app/agent/run_limiter.py
+# STEP 53 — Agent Run Concurrency Limits
+# Bounds concurrent LLM agent runs per process and rejects
+# requests once the wait queue is full (surfaced as HTTP 429).
+
+import asyncio
+import os
+
+
+MAX_CONCURRENT_AGENT_RUNS = int(os.getenv("MAX_CONCURRENT_AGENT_RUNS", "4"))
+MAX_AGENT_QUEUE = int(os.getenv("MAX_AGENT_QUEUE", "16"))
+
+
+class AgentQueueFull(Exception):
+    pass
+
+
+class AgentSlot:
+    """
+    One acquired run slot. release() is idempotent, so a streaming
+    response can release from both its generator and a background task
+    without double-counting.
+    """
+
+    def __init__(self, limiter: "AgentRunLimiter"):
+        self._limiter = limiter
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._limiter.release()
+
+
+class AgentRunLimiter:
+    """
+    asyncio semaphore with a bounded number of waiters.
+
+    acquire() raises AgentQueueFull immediately instead of waiting
+    when max_queue requests are already queued for a slot.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._active = 0
+        self._waiting = 0
+        self._rejected = 0
+        self._completed = 0
+
+    async def acquire(self):
+        if self._semaphore.locked() and self._waiting >= self.max_queue:
+            self._rejected += 1
+            raise AgentQueueFull()
+
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._active += 1
+
+    async def acquire_slot(self) -> AgentSlot:
+        await self.acquire()
+        return AgentSlot(self)
+
+    def release(self):
+        self._active -= 1
+        self._completed += 1
+        self._semaphore.release()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+    def snapshot(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self._active,
+            "waiting": self._waiting,
+            "rejected": self._rejected,
+            "completed": self._completed,
+        }
+
+
+agent_limiter = AgentRunLimiter(MAX_CONCURRENT_AGENT_RUNS, MAX_AGENT_QUEUE)
@@ -1,14 +1,13 @@
 from langchain.tools import StructuredTool
 from pydantic import BaseModel
-from datetime import datetime
 from sqlalchemy.orm import Session
 import threading
 
 from ..core.database import SessionLocal
-from ..models.medicine import Medicine
-from ..models.order import Order
 from ..services.refill_predictor import predict_refills
 from ..services.warehouse_service import trigger_fulfillment
+from ..services.catalog_search_service import find_catalog_medicine
+from ..services.order_service import place_order, InsufficientStock
 
 
 # =====================================================
@@ -22,9 +21,8 @@ class InventoryInput(BaseModel):
 def check_inventory(medicine_name: str) -> str:
     db: Session = SessionLocal()
     try:
-        med = db.query(Medicine).filter(
-            Medicine.name.ilike(f"%{medicine_name}%")
-        ).first()
+        # ✅ STEP 52 — FTS5 catalog lookup (fuzzy index fallback)
+        med = find_catalog_medicine(db, medicine_name)
 
         if not med:
             return "Medicine not found."
@@ -62,30 +60,19 @@ class CreateOrderInput(BaseModel):
 def create_order(patient_id: int, medicine_name: str, quantity: int) -> str:
     db: Session = SessionLocal()
     try:
-        med = db.query(Medicine).filter(
-            Medicine.name.ilike(f"%{medicine_name}%")
-        ).first()
+        # ✅ STEP 52 — FTS5 catalog lookup (fuzzy index fallback)
+        med = find_catalog_medicine(db, medicine_name)
 
         if not med:
             return "Medicine not found."
 
-        if med.stock < quantity:
+        # ✅ STEP 55 — Conditional decrement + order insert, one transaction
+        try:
+            order = place_order(db, patient_id, med.id, quantity)
+        except InsufficientStock:
             return "Insufficient stock."
-
-        order = Order(
-            patient_id=patient_id,
-            medicine_id=med.id,
-            quantity=quantity,
-            order_date=datetime.utcnow(),
-            daily_dosage=1
-        )
-
-        # Reduce inventory
-        med.stock -= quantity
-
-        db.add(order)
-        db.commit()
-        db.refresh(order)
+        except ValueError as e:
+            return str(e)
 
         # =================================================
         # 🔥 STEP 30 – NON-BLOCKING BACKGROUND THREAD
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends
+from datetime import date
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from backend.app.services.admin_analytics_service import get_admin_dashboard_stats
 from backend.app.services.proactive_refill_scanner import run_proactive_refill_scan
 from backend.app.core.security import admin_required
 from backend.app.core.database import SessionLocal, get_db
-from backend.app.models.refill_alert import RefillAlert
 
 # ✅ STEP 48 — Observability
 from backend.app.services.observability_service import ObservabilityService
@@ -13,6 +16,17 @@ from backend.app.services.audit_service import create_audit_log
 # ✅ STEP 49 — RBAC
 from backend.app.core.rbac import RBACService
 
+# ✅ STEP 61 — Scheduler leadership
+from backend.app.services.scheduler_lease_service import get_scheduler_status
+
+# ✅ STEP 69 — Refill alert pagination / export
+from backend.app.services.refill_alert_service import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    export_refill_alerts_ndjson,
+    list_refill_alerts,
+)
+
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 
@@ -35,27 +49,38 @@ def trigger_refill_scan(user=Depends(admin_required)):
 
 
 # ==============================
-# View Refill Alerts
+# View Refill Alerts (STEP 69 — keyset pages / NDJSON export)
 # ==============================
 
 @router.get("/refill-alerts")
-def get_refill_alerts(user=Depends(admin_required)):
+def get_refill_alerts(
+    status: Optional[str] = None,
+    patient_id: Optional[int] = None,
+    created_from: Optional[date] = None,
+    created_to: Optional[date] = None,
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    format: Literal["json", "ndjson"] = "json",
+    user=Depends(admin_required)
+):
+    if format == "ndjson":
+        return StreamingResponse(
+            export_refill_alerts_ndjson(status, patient_id, created_from, created_to),
+            media_type="application/x-ndjson"
+        )
+
     db = SessionLocal()
 
     try:
-        alerts = db.query(RefillAlert).all()
-
-        return [
-            {
-                "alert_id": alert.id,
-                "patient_id": alert.patient_id,
-                "medicine_name": alert.medicine_name,
-                "expected_refill_date": alert.expected_refill_date,
-                "status": alert.status,
-                "created_at": alert.created_at
-            }
-            for alert in alerts
-        ]
+        return list_refill_alerts(
+            db,
+            status=status,
+            patient_id=patient_id,
+            created_from=created_from,
+            created_to=created_to,
+            cursor=cursor,
+            limit=limit
+        )
 
     finally:
         db.close()
@@ -95,4 +120,26 @@ def get_system_metrics(
     return {
         "status": "ok",
         "metrics": metrics
-    }
\ No newline at end of file
+    }
+
+
+# =====================================================
+# STEP 61 — SCHEDULER LEADERSHIP + JOB RUNS
+# =====================================================
+
+@router.get("/scheduler-status")
+def get_scheduler_leadership(
+    admin=Depends(admin_required),
+    db: Session = Depends(get_db)
+):
+    """
+    Current scheduler leader (across all workers) and per-job run,
+    overlap and missed-run counts.
+    """
+
+    RBACService.require_role(admin, ["admin"], db)
+
+    return {
+        "status": "ok",
+        "scheduler": get_scheduler_status(db)
+    }
@@ -1,17 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from datetime import datetime
-import json
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
 
 from ..core.database import get_db
 from ..models.mitigation_review import MitigationReview
-from ..services.mitigation_execution_service import execute_mitigation_from_payload
 from ..models.fulfillment_log import FulfillmentLog
 from ..core.security import admin_required
 
 # ✅ STEP 44
 from backend.app.services.audit_service import create_audit_log
 
+# ✅ STEP 70 — Review queue
+from backend.app.services.mitigation_review_service import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    get_review_queue,
+)
+
+# ✅ STEP 71 — Bulk review decisions
+from backend.app.services.mitigation_review_service import decide_reviews
+
+# ✅ STEP 72 — Background execution of approved reviews
+from backend.app.services.mitigation_job_service import get_job, submit_job
+
+BULK_REVIEW_LIMIT = 1000
+
 
 router = APIRouter(
     prefix="/admin/mitigations",
@@ -25,14 +41,56 @@ router = APIRouter(
 
 @router.get("/pending")
 def get_pending_reviews(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     admin=Depends(admin_required),
     db: Session = Depends(get_db)
 ):
-    reviews = db.query(MitigationReview).filter(
-        MitigationReview.status == "pending"
-    ).all()
+    """
+    STEP 70 — One pending review per medicine, highest risk first.
+    """
+    try:
+        return get_review_queue(db, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# =====================================================
+# BULK APPROVE / REJECT (STEP 71)
+# =====================================================
+
+class BulkReviewRequest(BaseModel):
+    approve: List[int] = Field(default_factory=list, max_length=BULK_REVIEW_LIMIT)
+    reject: List[int] = Field(default_factory=list, max_length=BULK_REVIEW_LIMIT)
 
-    return reviews
+
+@router.post("/bulk")
+def bulk_review(
+    payload: BulkReviewRequest,
+    admin=Depends(admin_required),
+    db: Session = Depends(get_db)
+):
+    """
+    Approves and rejects many reviews at once. All review state changes
+    commit in one transaction; approved mitigations execute as one
+    background job (STEP 72), polled via GET /jobs/{job_id}. Reviews
+    that are unknown or already processed are returned under "skipped".
+    """
+    try:
+        decided = decide_reviews(db, payload.approve, payload.reject, reviewer_id=admin.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    submit_job(decided["job_id"])
+
+    return {
+        "approved": [item["review_id"] for item in decided["approved"]],
+        "rejected": decided["rejected"],
+        "skipped": decided["skipped"],
+        "job_id": decided["job_id"]
+    }
 
 
 # =====================================================
@@ -56,39 +114,23 @@ def approve_review(
     if review.status != "pending":
         raise HTTPException(status_code=400, detail="Review already processed")
 
-    # Update review state
-    review.status = "approved"
-    review.reviewed_by = admin.id
-    review.reviewed_at = datetime.utcnow()
-    db.commit()
+    # ✅ STEP 72 — Approval, audit and the execution job commit together;
+    # the mitigation executes in the background
+    try:
+        decided = decide_reviews(db, [review_id], [], reviewer_id=admin.id)
+    except LookupError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
-    # ✅ STEP 44 — AUDIT LOG (APPROVED)
-    create_audit_log(
-        db=db,
-        event_type="REVIEW_APPROVED",
-        actor="admin",
-        mode_at_time="REVIEW",
-        decision="approved",
-        risk_score=review.risk_score,
-        reference_id=review.id,
-        reference_table="mitigation_reviews",
-    )
-
-    # Execute mitigation from stored payload
-    payload = json.loads(review.payload)
-    execute_mitigation_from_payload(payload)
+    if not decided["approved"]:
+        raise HTTPException(status_code=409, detail="Review processed concurrently")
 
-    # Log approval
-    log = FulfillmentLog(
-        order_id=None,
-        status="APPROVED_BY_ADMIN",
-        message=f"Review {review_id} approved and executed"
-    )
-
-    db.add(log)
-    db.commit()
+    submit_job(decided["job_id"])
 
-    return {"status": "approved_and_executed"}
+    return {
+        "status": "approved",
+        "review_id": review_id,
+        "job_id": decided["job_id"]
+    }
 
 
 # =====================================================
@@ -139,4 +181,26 @@ def reject_review(
     db.add(log)
     db.commit()
 
-    return {"status": "rejected"}
\ No newline at end of file
+    return {"status": "rejected"}
+
+
+# =====================================================
+# EXECUTION JOB STATUS (STEP 72)
+# =====================================================
+
+@router.get("/jobs/{job_id}")
+def get_execution_job(
+    job_id: int,
+    admin=Depends(admin_required),
+    db: Session = Depends(get_db)
+):
+    """
+    Status of a background execution: queued / running / succeeded /
+    failed, attempts so far, the last error and per-review results.
+    """
+    job = get_job(db, job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job
@@ -1,19 +1,51 @@
 from fastapi import APIRouter, Depends, HTTPException
-from backend.app.agent.agent import agent
-from backend.app.core.security import get_current_user
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from backend.app.agent.agent import get_agent, get_prompt_version
+from backend.app.agent.llm_factory import get_llm_identity
+from backend.app.core.security import get_current_user, admin_required
 from backend.app.core.database import SessionLocal
 from backend.app.models.patient import Patient
 import json
+import time
+
+# ✅ STEP 50 — Deterministic Intent Fast Path
+from backend.app.agent.intent_router import (
+    route_message,
+    router_stats,
+    FAST_PATH,
+    LLM_PATH,
+)
+
+# ✅ STEP 53 — Concurrency Limits
+from backend.app.agent.run_limiter import agent_limiter, AgentQueueFull
+
+# ✅ STEP 54 — LLM Response Cache
+from backend.app.agent.response_cache import (
+    response_cache,
+    build_cache_key,
+    get_patient_data_version,
+    CACHE_PATH,
+)
 
 router = APIRouter()
 
+QUEUE_FULL_RETRY_AFTER_SECONDS = 5
 
-@router.post("/agent/chat")
-def agent_chat(message: str, user=Depends(get_current_user)):
+
+# =====================================================
+# HELPERS
+# =====================================================
+
+def _get_patient_id(user) -> int:
+    """
+    Short-lived session: resolves the patient and closes the
+    connection before any LLM call starts.
+    """
     db = SessionLocal()
 
     try:
-        # Get patient linked to logged-in user
         patient = db.query(Patient).filter(
             Patient.user_id == user.id
         ).first()
@@ -24,24 +56,222 @@ def agent_chat(message: str, user=Depends(get_current_user)):
                 detail="Patient profile not found for this user."
             )
 
-        # Inject patient ID context automatically
-        full_prompt = (
-            f"Patient ID: {patient.id}. "
-            f"User says: {message}"
+        return patient.id
+
+    finally:
+        db.close()
+
+
+def _get_cache_key(patient_id: int, message: str) -> str:
+    db = SessionLocal()
+
+    try:
+        data_version = get_patient_data_version(db, patient_id)
+    finally:
+        db.close()
+
+    provider, model = get_llm_identity()
+
+    return build_cache_key(
+        provider=provider,
+        model=model,
+        prompt_version=get_prompt_version(),
+        patient_id=patient_id,
+        message=message,
+        data_version=data_version,
+    )
+
+
+def _build_prompt(patient_id: int, message: str) -> str:
+    # Inject patient ID context automatically
+    return (
+        f"Patient ID: {patient_id}. "
+        f"User says: {message}"
+    )
+
+
+def _clean_output(output):
+    # 🔥 Clean structured agent JSON if returned
+    try:
+        parsed = json.loads(output)
+        if isinstance(parsed, dict) and "action_input" in parsed:
+            return parsed["action_input"]
+    except Exception:
+        pass
+
+    return output
+
+
+async def _acquire_agent_slot():
+    try:
+        return await agent_limiter.acquire_slot()
+    except AgentQueueFull:
+        raise HTTPException(
+            status_code=429,
+            detail="Agent is at capacity. Please retry shortly.",
+            headers={"Retry-After": str(QUEUE_FULL_RETRY_AFTER_SECONDS)},
         )
 
-        result = agent.invoke({"input": full_prompt})
-        output = result["output"]
 
-        # 🔥 Clean structured agent JSON if returned
-        try:
-            parsed = json.loads(output)
-            if isinstance(parsed, dict) and "action_input" in parsed:
-                return {"response": parsed["action_input"]}
-        except Exception:
-            pass
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+# =====================================================
+# CHAT (JSON RESPONSE)
+# =====================================================
+
+@router.post("/agent/chat")
+async def agent_chat(message: str, user=Depends(get_current_user)):
+    patient_id = await run_in_threadpool(_get_patient_id, user)
+
+    # ✅ STEP 50 — Serve unambiguous intents without the LLM
+    started = time.perf_counter()
+    routed = await run_in_threadpool(route_message, message, patient_id)
+
+    if routed:
+        router_stats.record(FAST_PATH, (time.perf_counter() - started) * 1000)
+        return {
+            "response": routed["response"],
+            "route": FAST_PATH,
+            "intent": routed["intent"],
+        }
+
+    # ✅ STEP 54 — Repeat questions on unchanged patient data
+    cache_key = await run_in_threadpool(_get_cache_key, patient_id, message)
+    cached = response_cache.get(cache_key)
+
+    if cached is not None:
+        router_stats.record(CACHE_PATH, (time.perf_counter() - started) * 1000)
+        return {"response": cached, "route": CACHE_PATH}
 
-        return {"response": output}
+    # ✅ STEP 53 — Bounded concurrent LLM runs (429 when queue full)
+    slot = await _acquire_agent_slot()
 
+    try:
+        result = await get_agent().ainvoke({"input": _build_prompt(patient_id, message)})
     finally:
-        db.close()
\ No newline at end of file
+        slot.release()
+
+    router_stats.record(LLM_PATH, (time.perf_counter() - started) * 1000)
+
+    response = _clean_output(result["output"])
+    response_cache.put(cache_key, response)
+
+    return {"response": response, "route": LLM_PATH}
+
+
+# =====================================================
+# STEP 53 — STREAMING CHAT (SERVER-SENT EVENTS)
+# =====================================================
+
+@router.post("/agent/chat/stream")
+async def agent_chat_stream(message: str, user=Depends(get_current_user)):
+    """
+    Streams agent output as SSE events:
+    route, token, tool_start, tool_end, final, error.
+    """
+
+    patient_id = await run_in_threadpool(_get_patient_id, user)
+
+    started = time.perf_counter()
+    routed = await run_in_threadpool(route_message, message, patient_id)
+
+    if routed:
+        router_stats.record(FAST_PATH, (time.perf_counter() - started) * 1000)
+
+        async def fast_path_events():
+            yield _sse("route", {"route": FAST_PATH, "intent": routed["intent"]})
+            yield _sse("final", {"response": routed["response"]})
+
+        return StreamingResponse(fast_path_events(), media_type="text/event-stream")
+
+    cache_key = await run_in_threadpool(_get_cache_key, patient_id, message)
+    cached = response_cache.get(cache_key)
+
+    if cached is not None:
+        router_stats.record(CACHE_PATH, (time.perf_counter() - started) * 1000)
+
+        async def cached_events():
+            yield _sse("route", {"route": CACHE_PATH})
+            yield _sse("final", {"response": cached})
+
+        return StreamingResponse(cached_events(), media_type="text/event-stream")
+
+    # Reject before the stream starts so the client sees a real 429
+    slot = await _acquire_agent_slot()
+
+    async def agent_events():
+        try:
+            yield _sse("route", {"route": LLM_PATH})
+
+            final_output = None
+
+            async for event in get_agent().astream_events(
+                {"input": _build_prompt(patient_id, message)},
+                version="v1",
+            ):
+                kind = event["event"]
+
+                if kind == "on_chat_model_stream":
+                    chunk = event["data"].get("chunk")
+                    content = getattr(chunk, "content", None)
+                    if content:
+                        yield _sse("token", {"text": content})
+
+                elif kind == "on_tool_start":
+                    yield _sse("tool_start", {
+                        "tool": event["name"],
+                        "input": event["data"].get("input"),
+                    })
+
+                elif kind == "on_tool_end":
+                    yield _sse("tool_end", {
+                        "tool": event["name"],
+                        "output": str(event["data"].get("output")),
+                    })
+
+                elif kind == "on_chain_end" and event["name"] == "AgentExecutor":
+                    output = event["data"].get("output")
+                    if isinstance(output, dict) and "output" in output:
+                        final_output = output["output"]
+
+            router_stats.record(LLM_PATH, (time.perf_counter() - started) * 1000)
+
+            response = _clean_output(final_output)
+            if response is not None:
+                response_cache.put(cache_key, response)
+
+            yield _sse("final", {"response": response})
+
+        except Exception as e:
+            yield _sse("error", {"detail": str(e)})
+
+        finally:
+            slot.release()
+
+    # The generator never runs if the client disconnects before the
+    # body starts; the background task releases the slot either way
+    return StreamingResponse(
+        agent_events(),
+        media_type="text/event-stream",
+        background=BackgroundTask(slot.release),
+    )
+
+
+# =====================================================
+# STEP 50 — ROUTING METRICS
+# =====================================================
+
+@router.get("/agent/metrics")
+def agent_metrics(admin=Depends(admin_required)):
+    """
+    Share of chat requests served by the fast path, the response
+    cache and the LLM, with per-path latency, plus agent concurrency
+    and cache state.
+    """
+    return {
+        "routing": router_stats.snapshot(),
+        "concurrency": agent_limiter.snapshot(),
+        "cache": response_cache.snapshot(),
+    }
@@ -0,0 +1,78 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from ..core.database import get_db
+from ..core.security import get_current_user
+from ..models.medicine import Medicine
+from ..services.medicine_search_service import search_medicines
+from ..services.catalog_search_service import search_catalog
+
+router = APIRouter(prefix="/medicines", tags=["Medicines"])
+
+
+# =====================================================
+# STEP 51 — FUZZY MEDICINE SEARCH
+# =====================================================
+
+@router.get("/search")
+def search(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user)
+):
+    """
+    Ranked fuzzy medicine name search backed by the in-memory
+    trigram index shared with the agent tools.
+    """
+
+    candidates = search_medicines(db, q, limit=limit)
+
+    if not candidates:
+        return {"query": q, "results": []}
+
+    ids = [c["medicine_id"] for c in candidates]
+    rows = {
+        med.id: med
+        for med in db.query(Medicine).filter(Medicine.id.in_(ids)).all()
+    }
+
+    results = []
+    for candidate in candidates:
+        med = rows.get(candidate["medicine_id"])
+        if not med:
+            continue
+
+        results.append({
+            "medicine_id": med.id,
+            "name": med.name,
+            "score": candidate["score"],
+            "price": med.price,
+            "stock": med.stock,
+            "prescription_required": med.prescription_required,
+        })
+
+    return {"query": q, "results": results}
+
+
+# =====================================================
+# STEP 52 — FTS5 CATALOG SEARCH
+# =====================================================
+
+@router.get("/catalog-search")
+def catalog_search(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    prefix: bool = True,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user)
+):
+    """
+    BM25-ranked search over medicine names and product metadata
+    (PZN, package size, description). Prefix matching per token.
+    """
+
+    return {
+        "query": q,
+        "results": search_catalog(db, q, limit=limit, prefix=prefix)
+    }
@@ -0,0 +1,94 @@
+from typing import List, Optional
+import threading
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+
+from ..core.database import get_db
+from ..core.security import get_current_user
+from ..core.rbac import RBACService
+from ..services.order_service import (
+    place_orders_bulk,
+    InsufficientStock,
+    UnknownReferences,
+)
+from ..services.warehouse_service import trigger_bulk_fulfillment
+
+router = APIRouter(prefix="/orders", tags=["Orders"])
+
+MAX_BULK_ORDER_LINES = 1000
+
+
+class OrderLine(BaseModel):
+    patient_id: int
+    medicine_id: int
+    quantity: int = Field(..., gt=0)
+    daily_dosage: Optional[float] = Field(None, gt=0)
+
+
+class BulkOrderRequest(BaseModel):
+    lines: List[OrderLine] = Field(..., min_length=1, max_length=MAX_BULK_ORDER_LINES)
+
+
+# =====================================================
+# STEP 56 — BULK ORDER CREATION (POS INTEGRATION)
+# =====================================================
+
+@router.post("/bulk")
+def create_orders_bulk(
+    payload: BulkOrderRequest,
+    user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    All-or-nothing: every line is created, or none is.
+    - 422 when medicine or patient IDs are unknown
+    - 409 when any medicine lacks stock for its summed quantity
+    Fulfillment for the whole batch is sent as one warehouse call.
+    """
+    RBACService.require_role(user, ["admin", "system"], db)
+
+    lines = [line.model_dump() for line in payload.lines]
+
+    try:
+        order_ids = place_orders_bulk(db, lines)
+
+    except UnknownReferences as e:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "message": "Unknown references in order lines",
+                "unknown_medicine_ids": e.medicine_ids,
+                "unknown_patient_ids": e.patient_ids,
+            }
+        )
+
+    except InsufficientStock as e:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "Insufficient stock; no orders were created",
+                "medicine_ids": e.medicine_ids,
+            }
+        )
+
+    # Non-blocking, single batch (STEP 30 pattern)
+    threading.Thread(
+        target=trigger_bulk_fulfillment,
+        args=(order_ids,),
+        daemon=True
+    ).start()
+
+    return {
+        "created": len(order_ids),
+        "orders": [
+            {
+                "order_id": order_id,
+                "patient_id": line["patient_id"],
+                "medicine_id": line["medicine_id"],
+                "quantity": line["quantity"],
+            }
+            for order_id, line in zip(order_ids, lines)
+        ]
+    }
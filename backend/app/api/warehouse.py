@@ -1,12 +1,19 @@
+from typing import List
+
 from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from backend.app.core.database import SessionLocal
+from backend.app.core.event_dispatcher import StockChanged, publish
 from backend.app.models.fulfillment_log import FulfillmentLog
 from backend.app.models.medicine import Medicine
+from backend.app.services.order_service import release_stock
 
 router = APIRouter(prefix="/warehouse", tags=["Warehouse"])
 
+RESTOCK_UNITS = 50
+
 
 def get_db():
     db = SessionLocal()
@@ -53,8 +60,9 @@ def fulfill_order(
         if not medicine:
             raise HTTPException(status_code=404, detail="Medicine not found")
 
-        # Simulate restock (add 50 units)
-        medicine.stock += 50
+        # Simulate restock (add 50 units) — atomic, never overwrites
+        # concurrent order decrements
+        release_stock(db, medicine_id, RESTOCK_UNITS)
 
         log = FulfillmentLog(
             order_id=None,
@@ -65,6 +73,10 @@ def fulfill_order(
         db.add(log)
         db.commit()
         db.refresh(log)
+        db.refresh(medicine)
+
+        # STEP 63
+        publish(StockChanged(medicine_id=medicine_id, delta=RESTOCK_UNITS, reason="restock"))
 
         return {
             "message": "Medicine restocked successfully",
@@ -75,4 +87,79 @@ def fulfill_order(
     # ===============================
     # INVALID REQUEST
     # ===============================
-    raise HTTPException(status_code=400, detail="order_id or medicine_id required")
\ No newline at end of file
+    raise HTTPException(status_code=400, detail="order_id or medicine_id required")
+
+
+# ===============================
+# STEP 56 — BULK ORDER FULFILLMENT
+# ===============================
+
+class BulkFulfillRequest(BaseModel):
+    order_ids: List[int] = Field(..., min_length=1, max_length=5000)
+
+
+@router.post("/fulfill/bulk")
+def fulfill_orders_bulk(
+    payload: BulkFulfillRequest,
+    db: Session = Depends(get_db)
+):
+    db.add_all([
+        FulfillmentLog(
+            order_id=order_id,
+            status="PROCESSING",
+            message="Order sent to warehouse for packing"
+        )
+        for order_id in payload.order_ids
+    ])
+    db.commit()
+
+    return {
+        "message": "Warehouse processing started",
+        "fulfilled": len(payload.order_ids)
+    }
+
+
+# ===============================
+# STEP 71 — BULK INVENTORY RESTOCK
+# ===============================
+
+class BulkRestockRequest(BaseModel):
+    medicine_ids: List[int] = Field(..., min_length=1, max_length=5000)
+
+
+@router.post("/restock/bulk")
+def restock_medicines_bulk(
+    payload: BulkRestockRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Same restock as /fulfill?medicine_id=…, for a batch of medicines in
+    one transaction. Unknown medicine IDs are reported, not fatal.
+    """
+    restocked, missing = [], []
+
+    for medicine_id in payload.medicine_ids:
+        if release_stock(db, medicine_id, RESTOCK_UNITS):
+            restocked.append(medicine_id)
+        else:
+            missing.append(medicine_id)
+
+    db.add_all([
+        FulfillmentLog(
+            order_id=None,
+            status="RESTOCK",
+            message=f"Auto restock completed for Medicine ID {medicine_id}"
+        )
+        for medicine_id in restocked
+    ])
+    db.commit()
+
+    # STEP 63
+    for medicine_id in restocked:
+        publish(StockChanged(medicine_id=medicine_id, delta=RESTOCK_UNITS, reason="restock"))
+
+    return {
+        "message": "Medicines restocked successfully",
+        "restocked": restocked,
+        "missing": missing
+    }
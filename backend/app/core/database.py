@@ -1,3 +1,5 @@
+import os
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
@@ -5,16 +7,20 @@ from sqlalchemy.orm import declarative_base, sessionmaker
 # Database URL
 # ===============================
 
-DATABASE_URL = "sqlite:///./pharmaagentx.db"
+# Override (e.g. generated load-test datasets) via DATABASE_URL
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./pharmaagentx.db")
 
 # ===============================
 # Engine
 # ===============================
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Required for SQLite
-)
+def engine_kwargs(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {"connect_args": {"check_same_thread": False}}  # Required for SQLite
+    return {}
+
+
+engine = create_engine(DATABASE_URL, **engine_kwargs(DATABASE_URL))
 
 # ===============================
 # Session Factory
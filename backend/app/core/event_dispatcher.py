@@ -1,10 +1,168 @@
-from fastapi import BackgroundTasks
-from app.services.fulfillment_service import trigger_fulfillment
-
-def dispatch_event(event_name: str, payload: dict, background_tasks: BackgroundTasks):
-    
-    if event_name == "ORDER_CREATED":
-        background_tasks.add_task(
-            trigger_fulfillment,
-            payload["order_id"]
-        )
\ No newline at end of file
+# backend/app/core/event_dispatcher.py
+# STEP 63 — In-Process Event Bus
+# Typed domain events published after commit. Handlers run on a bounded
+# thread pool so an order triggers targeted risk / refill / restock
+# evaluation for just its medicine and patient right away, instead of
+# waiting for the next polling scan. The polling scans remain the
+# safety net: events dropped under load are picked up there.
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+logger = logging.getLogger("pharmaagentx.events")
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_PENDING = 1000
+
+
+# =====================================================
+# EVENTS
+# =====================================================
+
+@dataclass(frozen=True)
+class OrderCreated:
+    order_id: int
+    patient_id: int
+    medicine_id: int
+    quantity: int
+
+
+@dataclass(frozen=True)
+class StockChanged:
+    medicine_id: int
+    delta: int
+    reason: str
+
+
+@dataclass(frozen=True)
+class EscalationCreated:
+    escalation_id: int
+    medicine_id: int
+    current_stock: int
+
+
+@dataclass(frozen=True)
+class ModeChanged:
+    old_mode: Optional[str]
+    new_mode: str
+    changed_by: Optional[int] = None
+
+
+# =====================================================
+# BUS
+# =====================================================
+
+class EventBus:
+    """
+    publish() never blocks the caller. Each (handler, key) pair has at
+    most one queued run: a burst of orders for one medicine coalesces
+    into a single evaluation. Past max_pending queued runs, new ones
+    are dropped and counted.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, max_pending: int = DEFAULT_MAX_PENDING):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+
+        self._handlers = {}
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._idle = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._stats = {"published": 0, "dispatched": 0, "coalesced": 0, "dropped": 0, "failed": 0}
+
+    # -------------------------------
+    # Registration
+    # -------------------------------
+    def subscribe(self, event_type: type, handler: Callable, key: Callable = None):
+        """
+        key(event) → coalescing key (e.g. lambda e: e.medicine_id);
+        without one every event gets its own run.
+        """
+        self._handlers.setdefault(event_type, []).append((handler, key))
+
+    def clear(self):
+        self._handlers = {}
+
+    # -------------------------------
+    # Publishing
+    # -------------------------------
+    def publish(self, event):
+        handlers = self._handlers.get(type(event), [])
+
+        with self._lock:
+            self._stats["published"] += 1
+
+            if not handlers:
+                return
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="event-bus"
+                )
+
+            for handler, key in handlers:
+                slot = (handler, key(event) if key else object())
+
+                if slot in self._pending:
+                    self._stats["coalesced"] += 1
+                    continue
+
+                if len(self._pending) >= self.max_pending:
+                    self._stats["dropped"] += 1
+                    logger.warning(f"⚠ Event bus full — dropped {handler.__name__} for {event}")
+                    continue
+
+                self._pending.add(slot)
+                self._in_flight += 1
+                self._stats["dispatched"] += 1
+                self._executor.submit(self._run, slot, handler, event)
+
+    def _run(self, slot, handler, event):
+        # Free the slot before running: a change that arrives while the
+        # handler works gets its own follow-up run
+        with self._lock:
+            self._pending.discard(slot)
+
+        try:
+            handler(event)
+        except Exception as e:
+            with self._lock:
+                self._stats["failed"] += 1
+            logger.error(f"❌ Event handler {handler.__name__} failed for {event}: {str(e)}")
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                if self._in_flight == 0:
+                    self._idle.notify_all()
+
+    # -------------------------------
+    # Introspection / lifecycle
+    # -------------------------------
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "pending": len(self._pending), "in_flight": self._in_flight}
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        with self._lock:
+            return self._idle.wait_for(lambda: self._in_flight == 0, timeout)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+event_bus = EventBus()
+
+
+def publish(event):
+    event_bus.publish(event)
@@ -1,6 +1,13 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
+from datetime import datetime
+from functools import wraps
 import logging
+import os
+import socket
+import threading
+import uuid
 
 from ..services.refill_service import scan_and_create_refill_alerts
 from ..services.inventory_service import inventory_threshold_scan
@@ -9,6 +16,39 @@ from ..services.mitigation_execution_service import execute_mitigation_if_safe
 from ..core.database import SessionLocal
 from ..models.medicine import Medicine
 
+# ✅ STEP 62 — Incremental scans
+from ..services.system_governor_service import get_current_mode
+from ..services.scan_watermark_service import (
+    MITIGATION_SCAN,
+    changed_medicine_ids,
+    current_max_order_id,
+    load_watermark,
+    needs_full_scan,
+    save_watermark,
+)
+
+# Trailing windows the risk snapshot sums over (acceleration 7/14, demand 30)
+MITIGATION_WINDOWS = (7, 14, 30)
+
+# ✅ STEP 65 — Columnar order history refresh
+from ..core.database import engine
+from ..services.order_column_store import DEFAULT_STORE_DIR, META_FILE, refresh_order_store
+
+# ✅ STEP 70 — Review queue expiry
+from ..services.mitigation_review_service import expire_stale_reviews
+
+# ✅ STEP 72 — Background mitigation execution (recovery sweep)
+from ..services.mitigation_job_service import recover_jobs, submit_job
+
+# ✅ STEP 61 — Leader election + per-job locks
+from ..services.scheduler_lease_service import (
+    LEADER_LEASE,
+    job_lease_name,
+    record_skip,
+    release,
+    try_acquire,
+)
+
 
 # ===============================
 # Logging Configuration
@@ -25,16 +65,139 @@ scheduler = BackgroundScheduler()
 _scheduler_started = False  # Prevent duplicate starts
 
 
+# ==========================================
+# LEADERSHIP (STEP 61)
+# ==========================================
+# Every worker starts a scheduler, but only the holder of the leader
+# lease runs jobs. The lease is renewed by a heartbeat job; if the
+# leader dies, another worker takes over once the lease expires.
+# Each job additionally holds its own lease while it runs, so a run
+# never overlaps the previous one even across a leadership change.
+
+LEASE_TTL_SECONDS = int(os.getenv("SCHEDULER_LEASE_TTL_SECONDS", "30"))
+HEARTBEAT_SECONDS = int(os.getenv("SCHEDULER_HEARTBEAT_SECONDS", "10"))
+
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_is_leader = False
+_held_job_leases = set()
+_lease_lock = threading.Lock()
+
+
+def is_leader() -> bool:
+    return _is_leader
+
+
+def leadership_heartbeat():
+    """
+    Acquires or renews the leader lease, and renews the leases of
+    jobs this process is currently running.
+    """
+    global _is_leader
+
+    db = SessionLocal()
+    try:
+        leader = try_acquire(db, LEADER_LEASE, PROCESS_ID, LEASE_TTL_SECONDS)
+
+        with _lease_lock:
+            running = list(_held_job_leases)
+
+        for name in running:
+            try_acquire(db, name, PROCESS_ID, LEASE_TTL_SECONDS)
+
+    except Exception as e:
+        logger.error(f"❌ Scheduler heartbeat failed: {str(e)}")
+        leader = False
+    finally:
+        db.close()
+
+    if leader and not _is_leader:
+        logger.info(f"👑 Acquired scheduler leadership ({PROCESS_ID})")
+    elif _is_leader and not leader:
+        logger.warning(f"⚠ Lost scheduler leadership ({PROCESS_ID})")
+
+    _is_leader = leader
+
+
+def _record_skip(job_id: str, reason: str):
+    logger.warning(f"⏭ Skipped run of {job_id}: {reason}")
+
+    db = SessionLocal()
+    try:
+        record_skip(db, job_lease_name(job_id), reason)
+    except Exception as e:
+        logger.error(f"❌ Could not record skipped run of {job_id}: {str(e)}")
+    finally:
+        db.close()
+
+
+def exclusive_job(job_id: str):
+    """
+    Runs the job only on the leader, and only if no other run of the
+    same job holds its lease. Overlapping runs are skipped and counted.
+    """
+    name = job_lease_name(job_id)
+
+    def decorator(fn):
+        @wraps(fn)
+        def run():
+            if not _is_leader:
+                return
+
+            db = SessionLocal()
+            try:
+                acquired = try_acquire(db, name, PROCESS_ID, LEASE_TTL_SECONDS)
+            finally:
+                db.close()
+
+            if not acquired:
+                _record_skip(job_id, "overlap")
+                return
+
+            with _lease_lock:
+                _held_job_leases.add(name)
+
+            try:
+                return fn()
+            finally:
+                with _lease_lock:
+                    _held_job_leases.discard(name)
+
+                db = SessionLocal()
+                try:
+                    release(db, name, PROCESS_ID, finished=True)
+                finally:
+                    db.close()
+
+        return run
+
+    return decorator
+
+
+def _on_job_not_run(event):
+    # APScheduler's own skips: previous instance still running in this
+    # process, or the run time passed (e.g. process suspended)
+    if event.job_id == "leadership_heartbeat" or not _is_leader:
+        return
+
+    reason = "max_instances" if event.code == EVENT_JOB_MAX_INSTANCES else "missed"
+    _record_skip(event.job_id, reason)
+
+
 # ==========================================
 # REFILL SCAN JOB
 # ==========================================
 
+@exclusive_job("refill_scan_job")
 def refill_scan_job():
     db = SessionLocal()
     try:
         logger.info("🔁 Running scheduled refill scan...")
-        scan_and_create_refill_alerts(db)
-        logger.info("✅ Refill scan completed successfully.")
+        result = scan_and_create_refill_alerts(db)
+        logger.info(
+            f"✅ Refill scan completed successfully "
+            f"({result['mode']}, {result['patients_scanned']} patients)."
+        )
     except Exception as e:
         logger.error(f"❌ Refill scan failed: {str(e)}")
     finally:
@@ -45,6 +208,7 @@ def refill_scan_job():
 # INVENTORY THRESHOLD JOB
 # ==========================================
 
+@exclusive_job("inventory_scan_job")
 def inventory_scan_job():
     try:
         logger.info("📦 Running scheduled inventory threshold scan...")
@@ -58,6 +222,7 @@ def inventory_scan_job():
 # PREDICTIVE DEMAND JOB
 # ==========================================
 
+@exclusive_job("predictive_demand_job")
 def predictive_demand_job():
     try:
         logger.info("📊 Running predictive demand intelligence scan...")
@@ -71,22 +236,43 @@ def predictive_demand_job():
 # AUTONOMOUS MITIGATION EXECUTION JOB (STEP 40C)
 # ==========================================
 
+@exclusive_job("autonomous_mitigation_job")
 def autonomous_mitigation_job():
     db = SessionLocal()
     try:
         logger.info("🧠 Running autonomous mitigation execution scan...")
 
-        medicines = db.query(Medicine).all()
+        today = datetime.utcnow().date()
+        upto_order_id = current_max_order_id(db)
+        mode = get_current_mode(db)
+
+        # A mode change can unblock earlier decisions → full rescan
+        mark = load_watermark(db, MITIGATION_SCAN)
+
+        # STEP 70 — Stale pending reviews expire and get a fresh look
+        expired_ids = expire_stale_reviews(db)
+
+        if needs_full_scan(mark, context=mode):
+            medicine_ids = [mid for (mid,) in db.query(Medicine.id).order_by(Medicine.id).all()]
+        else:
+            medicine_ids = sorted(
+                changed_medicine_ids(db, mark, upto_order_id, today, MITIGATION_WINDOWS)
+                | expired_ids
+            )
 
-        for medicine in medicines:
-            result = execute_mitigation_if_safe(medicine.id)
+        for medicine_id in medicine_ids:
+            result = execute_mitigation_if_safe(medicine_id)
 
             if result and result.get("status") == "executed":
                 logger.info(
-                    f"🚀 Autonomous mitigation executed for Medicine ID {medicine.id}"
+                    f"🚀 Autonomous mitigation executed for Medicine ID {medicine_id}"
                 )
 
-        logger.info("✅ Autonomous mitigation scan completed.")
+        save_watermark(db, MITIGATION_SCAN, upto_order_id, today, context=mode)
+
+        logger.info(
+            f"✅ Autonomous mitigation scan completed ({len(medicine_ids)} medicines evaluated)."
+        )
 
     except Exception as e:
         logger.error(f"❌ Autonomous mitigation scan failed: {str(e)}")
@@ -94,6 +280,50 @@ def autonomous_mitigation_job():
         db.close()
 
 
+# ==========================================
+# ORDER STORE REFRESH JOB (STEP 65)
+# ==========================================
+
+@exclusive_job("order_store_refresh_job")
+def order_store_refresh_job():
+    # Opt-in: only maintained once someone ran scripts/export_order_store.py
+    if not os.path.exists(os.path.join(DEFAULT_STORE_DIR, META_FILE)):
+        return
+
+    try:
+        result = refresh_order_store(engine)
+        logger.info(f"✅ Order store refreshed: {result}")
+    except Exception as e:
+        logger.error(f"❌ Order store refresh failed: {str(e)}")
+
+
+# ==========================================
+# MITIGATION JOB RECOVERY (STEP 72)
+# ==========================================
+
+@exclusive_job("mitigation_job_recovery_job")
+def mitigation_job_recovery_job():
+    db = SessionLocal()
+
+    try:
+        result = recover_jobs(db)
+
+        for job_id in result["due"]:
+            submit_job(job_id)
+
+        if result["abandoned"] or result["due"]:
+            logger.info(
+                f"🔁 Mitigation jobs: {result['abandoned']} abandoned, {len(result['due'])} submitted"
+            )
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Mitigation job recovery failed: {str(e)}")
+
+    finally:
+        db.close()
+
+
 # ==========================================
 # START SCHEDULER
 # ==========================================
@@ -107,11 +337,26 @@ def start_scheduler():
 
     logger.info("🧠 Registering scheduled jobs...")
 
+    # Decide leadership before the first job fires
+    leadership_heartbeat()
+
+    scheduler.add_job(
+        leadership_heartbeat,
+        trigger=IntervalTrigger(seconds=HEARTBEAT_SECONDS),
+        id="leadership_heartbeat",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+
     scheduler.add_job(
         refill_scan_job,
         trigger=IntervalTrigger(minutes=5),
         id="refill_scan_job",
         replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=60,
     )
 
     scheduler.add_job(
@@ -119,6 +364,9 @@ def start_scheduler():
         trigger=IntervalTrigger(minutes=3),
         id="inventory_scan_job",
         replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=60,
     )
 
     scheduler.add_job(
@@ -126,6 +374,9 @@ def start_scheduler():
         trigger=IntervalTrigger(minutes=10),
         id="predictive_demand_job",
         replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=60,
     )
 
     scheduler.add_job(
@@ -133,8 +384,33 @@ def start_scheduler():
         trigger=IntervalTrigger(minutes=4),
         id="autonomous_mitigation_job",
         replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=60,
     )
 
+    scheduler.add_job(
+        order_store_refresh_job,
+        trigger=IntervalTrigger(minutes=10),
+        id="order_store_refresh_job",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=60,
+    )
+
+    scheduler.add_job(
+        mitigation_job_recovery_job,
+        trigger=IntervalTrigger(seconds=30),
+        id="mitigation_job_recovery_job",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=30,
+    )
+
+    scheduler.add_listener(_on_job_not_run, EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED)
+
     scheduler.start()
     _scheduler_started = True
 
@@ -142,7 +418,10 @@ def start_scheduler():
     for job in scheduler.get_jobs():
         logger.info(f"🗂 Registered Job: {job.id}")
 
-    logger.info("🚀 APScheduler started with full autonomous intelligence.")
+    logger.info(
+        f"🚀 APScheduler started with full autonomous intelligence "
+        f"({'leader' if _is_leader else 'standby'}: {PROCESS_ID})."
+    )
 
 
 # ==========================================
@@ -150,10 +429,21 @@ def start_scheduler():
 # ==========================================
 
 def shutdown_scheduler():
-    global _scheduler_started
+    global _scheduler_started, _is_leader
 
     if scheduler.running:
         scheduler.shutdown()
         logger.info("🛑 APScheduler stopped.")
 
+    # Hand leadership over now instead of after the lease expires
+    if _is_leader:
+        db = SessionLocal()
+        try:
+            release(db, LEADER_LEASE, PROCESS_ID)
+        except Exception as e:
+            logger.error(f"❌ Could not release scheduler leadership: {str(e)}")
+        finally:
+            db.close()
+
+    _is_leader = False
     _scheduler_started = False
\ No newline at end of file
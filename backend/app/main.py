@@ -15,12 +15,37 @@ load_dotenv()
 from backend.app.core.database import engine, Base
 import backend.app.models  # Ensures all models are registered
 
+# ✅ STEP 52 — FTS5 Catalog Search
+from backend.app.services.catalog_search_service import ensure_catalog_fts
+
+# ✅ STEP 54 — Stock version column on existing DBs (response cache)
+from backend.app.services.order_service import ensure_stock_version_column
+
+# ✅ STEP 62 — Incremental scans (order indexes on existing DBs)
+from backend.app.services.scan_watermark_service import ensure_scan_indexes
+
+# ✅ STEP 64 — Daily consumption rollup
+from backend.app.services.consumption_rollup_service import ensure_consumption_rollup
+
+# ✅ STEP 69 — Refill alert filter indexes on existing DBs
+from backend.app.services.refill_alert_service import ensure_refill_alert_indexes
+
+# ✅ STEP 70 — Review queue dedupe + indexes on existing DBs
+from backend.app.services.mitigation_review_service import ensure_mitigation_review_schema
+
 # ===============================
 # Import Scheduler (STEP 31)
 # ===============================
 
 from backend.app.core.scheduler import start_scheduler, shutdown_scheduler
 
+# ✅ STEP 63 — Event bus
+from backend.app.core.event_dispatcher import event_bus
+from backend.app.services.event_handlers import register_event_handlers
+
+# ✅ STEP 72 — Background mitigation execution
+from backend.app.services.mitigation_job_service import job_queue
+
 # ===============================
 # Import API Routers
 # ===============================
@@ -32,6 +57,7 @@ from backend.app.api import auth
 from backend.app.api import medical_history_routes
 from backend.app.api import ai_context
 from backend.app.api import agent_routes
+from backend.app.agent.agent import get_agent
 from backend.app.api import warehouse
 
 # ✅ STEP 37 — Explainability Router
@@ -49,6 +75,12 @@ from backend.app.api import system_mode
 # ✅ STEP 43 — Human Approval Router
 from backend.app.api import admin_mitigation
 
+# ✅ STEP 51 — Medicine Search Router
+from backend.app.api import medicine_search
+
+# ✅ STEP 56 — Bulk Orders Router
+from backend.app.api import orders
+
 
 # ===============================
 # Create FastAPI App
@@ -92,12 +124,39 @@ app.include_router(system_mode.router)
 # ✅ STEP 43
 app.include_router(admin_mitigation.router)
 
+# ✅ STEP 51
+app.include_router(medicine_search.router)
+
+# ✅ STEP 56
+app.include_router(orders.router)
+
 # ===============================
 # Create Database Tables
 # ===============================
 
 Base.metadata.create_all(bind=engine)
 
+# ✅ STEP 52 — Catalog FTS table + sync triggers (idempotent)
+ensure_catalog_fts(engine)
+
+# ✅ STEP 54 — medicines.stock_version (idempotent)
+ensure_stock_version_column(engine)
+
+# ✅ STEP 62 — Order indexes for incremental scans (idempotent)
+ensure_scan_indexes(engine)
+
+# ✅ STEP 64 — Rollup sync triggers + backfill (idempotent)
+ensure_consumption_rollup(engine)
+
+# ✅ STEP 69 — Refill alert filter indexes (idempotent)
+ensure_refill_alert_indexes(engine)
+
+# ✅ STEP 70 — One pending review per medicine (idempotent)
+ensure_mitigation_review_schema(engine)
+
+# ✅ STEP 63 — Order / stock / escalation / mode events → targeted recompute
+register_event_handlers()
+
 # ===============================
 # Scheduler Startup / Shutdown
 # ===============================
@@ -106,10 +165,15 @@ Base.metadata.create_all(bind=engine)
 def startup_event():
     start_scheduler()
 
+    # Build the LLM agent now, not inside the first chat request
+    get_agent()
+
 
 @app.on_event("shutdown")
 def shutdown_event():
     shutdown_scheduler()
+    event_bus.shutdown()
+    job_queue.shutdown()
 
 
 # ===============================
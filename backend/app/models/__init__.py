@@ -3,4 +3,11 @@ from .patient import Patient
 from .order import Order
 from .medical_history import MedicalHistory
 from .medicine import Medicine
-from .system_config import SystemConfig
\ No newline at end of file
+from .system_config import SystemConfig
+from .import_checkpoint import ImportCheckpoint
+from .order_ingestion_record import OrderIngestionRecord
+from .scheduler_lease import SchedulerLease
+from .scan_watermark import ScanWatermark
+from .refill_schedule import RefillSchedule
+from .medicine_daily_consumption import MedicineDailyConsumption
+from .mitigation_job import MitigationJob
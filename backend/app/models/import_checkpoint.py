@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from backend.app.core.database import Base
+
+
+class ImportCheckpoint(Base):
+    __tablename__ = "import_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Fingerprint of the source file (sha256 of its bytes)
+    source_key = Column(String, unique=True, index=True, nullable=False)
+    source_path = Column(String, nullable=False)
+
+    # Rows of the cleaned sheet already committed (resume offset)
+    rows_committed = Column(Integer, nullable=False, default=0)
+    total_rows = Column(Integer, nullable=False, default=0)
+    status = Column(String, nullable=False, default="RUNNING")
+
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -11,5 +11,7 @@ class Medicine(Base):
     price = Column(Float, nullable=False)
     stock = Column(Integer, nullable=False)
     prescription_required = Column(Boolean, default=False)
+    # STEP 54 — Bumped by every stock adjustment (agent response cache)
+    stock_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     orders = relationship("Order", back_populates="medicine")
\ No newline at end of file
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, Date
+from backend.app.core.database import Base
+
+
+class MedicineDailyConsumption(Base):
+    __tablename__ = "medicine_daily_consumption"
+
+    # One row per medicine per order day, maintained by triggers on orders
+    medicine_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True, index=True)
+
+    qty = Column(Integer, nullable=False, default=0)
+    order_count = Column(Integer, nullable=False, default=0)
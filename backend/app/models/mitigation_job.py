@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from datetime import datetime
+from ..core.database import Base
+
+
+class MitigationJob(Base):
+    """
+    STEP 72 — Background execution of approved mitigation reviews.
+    One job per approval request (a single review or a bulk batch).
+    """
+    __tablename__ = "mitigation_jobs"
+    __table_args__ = (
+        # Recovery sweep: queued jobs due for (re)try
+        Index("ix_mitigation_jobs_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, nullable=False, default="queued")
+    review_ids = Column(Text, nullable=False)     # JSON list
+    payloads = Column(Text, nullable=False)       # JSON list of review payloads
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+    result = Column(Text, nullable=True)          # JSON list, one entry per payload
+    created_by = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
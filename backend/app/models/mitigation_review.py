@@ -1,9 +1,21 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, text
 from datetime import datetime
 from ..core.database import Base
 
 class MitigationReview(Base):
     __tablename__ = "mitigation_reviews"
+    __table_args__ = (
+        # STEP 70 — At most one pending review per medicine (upsert target)
+        Index(
+            "ux_mitigation_reviews_pending_medicine",
+            "mitigation_id",
+            unique=True,
+            sqlite_where=text("status = 'pending'"),
+            postgresql_where=text("status = 'pending'"),
+        ),
+        # STEP 70 — Review queue: pending, highest risk first
+        Index("ix_mitigation_reviews_status_risk_id", "status", "risk_score", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     mitigation_id = Column(Integer, nullable=False)
@@ -13,4 +25,6 @@ class MitigationReview(Base):
     status = Column(String, default="pending")
     reviewed_by = Column(Integer, nullable=True)
     reviewed_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow)
+    # STEP 70 — Last time a scan re-proposed this review (staleness)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Date, Float, String
+from sqlalchemy import Column, Integer, ForeignKey, Date, Float, String, Index
 from sqlalchemy.orm import relationship
 
 from backend.app.core.database import Base
@@ -6,6 +6,12 @@ from backend.app.core.database import Base
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Windowed demand sums and incremental scans filter on date first
+        Index("ix_orders_order_date_medicine_id", "order_date", "medicine_id"),
+        # Per-patient lookups (refill scans, agent cache data version)
+        Index("ix_orders_patient_id_medicine_id", "patient_id", "medicine_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from datetime import datetime
+from backend.app.core.database import Base
+
+
+class OrderIngestionRecord(Base):
+    __tablename__ = "order_ingestion_records"
+
+    # sha256 of the canonical row (dedupe key for re-delivered feeds)
+    row_hash = Column(String(64), primary_key=True)
+
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=True)
+    source = Column(String, nullable=True)
+    ingested_at = Column(DateTime, default=datetime.utcnow)
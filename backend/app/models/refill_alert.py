@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from backend.app.core.database import Base
 
 
 class RefillAlert(Base):
     __tablename__ = "refill_alerts"
+    __table_args__ = (
+        # Keyset pages filter on one of these, then walk id
+        Index("ix_refill_alerts_status_id", "status", "id"),
+        Index("ix_refill_alerts_patient_id_id", "patient_id", "id"),
+        Index("ix_refill_alerts_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(Integer, ForeignKey("patients.id"))
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey
+from backend.app.core.database import Base
+
+
+class RefillSchedule(Base):
+    __tablename__ = "refill_schedules"
+
+    # One row per latest order of a (patient, medicine) pair, maintained
+    # by the refill scan so due/overdue transitions are a date range query
+    order_id = Column(Integer, ForeignKey("orders.id"), primary_key=True)
+
+    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False, index=True)
+    medicine_id = Column(Integer, ForeignKey("medicines.id"), nullable=False)
+    refill_date = Column(Date, nullable=False, index=True)
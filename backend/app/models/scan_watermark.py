@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime
+from datetime import datetime
+from backend.app.core.database import Base
+
+
+class ScanWatermark(Base):
+    __tablename__ = "scan_watermarks"
+
+    # Scheduler job name (refill_scan, demand_scan, mitigation_scan)
+    name = Column(String, primary_key=True)
+
+    # Highest orders.id already processed
+    last_order_id = Column(Integer, nullable=False, default=0)
+
+    # Date of the last completed scan (time-based transitions since then)
+    last_run_date = Column(Date, nullable=True)
+
+    # Anything else that invalidates earlier results (e.g. system mode);
+    # a change forces a full rescan
+    context = Column(String, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from backend.app.core.database import Base
+
+
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_leases"
+
+    # "scheduler_leader" or "job:<job_id>"
+    name = Column(String, primary_key=True)
+
+    # hostname:pid:nonce of the holding process (NULL when released)
+    holder = Column(String, nullable=True)
+    acquired_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    expires_at = Column(DateTime, nullable=True)
+
+    # Run bookkeeping (job locks only)
+    run_count = Column(Integer, nullable=False, default=0)
+    skipped_count = Column(Integer, nullable=False, default=0)
+    last_skip_reason = Column(String, nullable=True)
+    last_skipped_at = Column(DateTime, nullable=True)
+    last_finished_at = Column(DateTime, nullable=True)
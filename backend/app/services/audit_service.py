@@ -2,6 +2,30 @@ from sqlalchemy.orm import Session
 from backend.app.models.audit_log import AuditLog
 
 
+def build_audit_log(
+    event_type: str,
+    actor: str,
+    mode_at_time: str,
+    decision: str,
+    risk_score: int = None,
+    reference_id: int = None,
+    reference_table: str = None
+) -> AuditLog:
+    """
+    STEP 71 — Unsaved audit row, for callers that write several
+    audits inside their own transaction.
+    """
+    return AuditLog(
+        event_type=event_type,
+        actor=actor,
+        risk_score=risk_score,
+        mode_at_time=mode_at_time,
+        decision=decision,
+        reference_id=reference_id,
+        reference_table=reference_table,
+    )
+
+
 def create_audit_log(
     db: Session,
     event_type: str,
@@ -17,7 +41,7 @@ def create_audit_log(
     Append-only. No update. No delete.
     """
 
-    log = AuditLog(
+    log = build_audit_log(
         event_type=event_type,
         actor=actor,
         risk_score=risk_score,
@@ -28,4 +52,4 @@ def create_audit_log(
     )
 
     db.add(log)
-    db.commit()
\ No newline at end of file
+    db.commit()
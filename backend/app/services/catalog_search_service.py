@@ -0,0 +1,204 @@
+# backend/app/services/catalog_search_service.py
+# STEP 52 — SQLite FTS5 Medicine Catalog Search
+# Persistent full-text index mirroring medicines.name (+ product metadata),
+# kept in sync by triggers. Survives restarts and works across workers.
+
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..models.medicine import Medicine
+from .medicine_search_service import find_medicine, normalize_name
+
+
+logger = logging.getLogger("pharmaagentx.catalog")
+
+FTS_TABLE = "medicines_fts"
+
+# bm25 column weights: name matches dominate metadata matches
+NAME_WEIGHT = 10.0
+METADATA_WEIGHT = 1.0
+
+CATALOG_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE}
+    USING fts5(name, metadata, tokenize = 'unicode61 remove_diacritics 2')
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS medicines_fts_ai AFTER INSERT ON medicines BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, metadata) VALUES (new.id, new.name, '');
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS medicines_fts_au AFTER UPDATE OF name ON medicines BEGIN
+        UPDATE {FTS_TABLE} SET name = new.name WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS medicines_fts_ad AFTER DELETE ON medicines BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END
+    """,
+]
+
+_fts_available = None
+
+
+# =====================================================
+# SETUP
+# =====================================================
+
+def ensure_catalog_fts(engine: Engine, rebuild: bool = False) -> bool:
+    """
+    Creates the FTS5 table + sync triggers and backfills missing rows.
+    rebuild=True re-mirrors every name (used after a database reset).
+    Returns False when the backend is not SQLite or lacks FTS5.
+    """
+    global _fts_available
+
+    if engine.dialect.name != "sqlite":
+        _fts_available = False
+        return False
+
+    try:
+        with engine.begin() as conn:
+            for statement in CATALOG_FTS_DDL:
+                conn.exec_driver_sql(statement)
+
+            if rebuild:
+                conn.exec_driver_sql(f"DELETE FROM {FTS_TABLE}")
+            else:
+                conn.exec_driver_sql(
+                    f"DELETE FROM {FTS_TABLE} "
+                    f"WHERE rowid NOT IN (SELECT id FROM medicines)"
+                )
+
+            conn.exec_driver_sql(
+                f"INSERT INTO {FTS_TABLE}(rowid, name, metadata) "
+                f"SELECT id, name, '' FROM medicines "
+                f"WHERE id NOT IN (SELECT rowid FROM {FTS_TABLE})"
+            )
+
+        _fts_available = True
+
+    except Exception as e:
+        logger.warning(f"FTS5 catalog unavailable, falling back to in-memory index: {e}")
+        _fts_available = False
+
+    return _fts_available
+
+
+def is_catalog_fts_available(db: Session = None) -> bool:
+    """
+    True once ensure_catalog_fts() succeeded in this process, or —
+    for processes that never ran it (scripts, workers) — when the
+    FTS table already exists in the database.
+    """
+    global _fts_available
+
+    if _fts_available is None and db is not None:
+        _fts_available = (
+            db.bind.dialect.name == "sqlite"
+            and db.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": FTS_TABLE},
+            ).first() is not None
+        )
+
+    return bool(_fts_available)
+
+
+# =====================================================
+# PRODUCT METADATA (products-export.xlsx)
+# =====================================================
+
+def index_product_metadata(db: Session, metadata_by_medicine_id: dict):
+    """
+    Attaches searchable product metadata (PZN, package size,
+    description) to catalog rows. Single commit.
+    """
+    if not metadata_by_medicine_id:
+        return
+
+    db.execute(
+        text(f"UPDATE {FTS_TABLE} SET metadata = :metadata WHERE rowid = :medicine_id"),
+        [
+            {"medicine_id": medicine_id, "metadata": metadata}
+            for medicine_id, metadata in metadata_by_medicine_id.items()
+        ],
+    )
+    db.commit()
+
+
+# =====================================================
+# SEARCH
+# =====================================================
+
+def build_match_query(query: str, prefix: bool = True) -> str:
+    """
+    Converts free text into a safe FTS5 MATCH expression:
+    every token quoted (no operator injection), implicit AND,
+    optional prefix matching on each token.
+    """
+    tokens = normalize_name(query).split()
+    suffix = "*" if prefix else ""
+    return " ".join(f'"{token}"{suffix}' for token in tokens)
+
+
+def search_catalog(db: Session, query: str, limit: int = 10, prefix: bool = True) -> list:
+    """
+    BM25-ranked catalog search. Lower bm25 = better match;
+    the returned score is negated so higher is better.
+    """
+    match = build_match_query(query, prefix=prefix)
+
+    if not match or not is_catalog_fts_available(db):
+        return []
+
+    rows = db.execute(
+        text(
+            f"SELECT m.id, m.name, m.price, m.stock, m.prescription_required, "
+            f"bm25({FTS_TABLE}, :name_weight, :metadata_weight) AS rank "
+            f"FROM {FTS_TABLE} JOIN medicines m ON m.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH :match "
+            f"ORDER BY rank LIMIT :limit"
+        ),
+        {
+            "match": match,
+            "limit": limit,
+            "name_weight": NAME_WEIGHT,
+            "metadata_weight": METADATA_WEIGHT,
+        },
+    ).all()
+
+    return [
+        {
+            "medicine_id": row.id,
+            "name": row.name,
+            "price": row.price,
+            "stock": row.stock,
+            "prescription_required": bool(row.prescription_required),
+            "score": round(-row.rank, 4),
+        }
+        for row in rows
+    ]
+
+
+def find_catalog_medicine(db: Session, medicine_name: str):
+    """
+    Catalog lookup used by the agent tools:
+    FTS5 first (exact tokens / prefixes), then the fuzzy
+    in-memory index for typos FTS cannot match.
+    """
+    hits = search_catalog(db, medicine_name, limit=1)
+
+    if hits:
+        medicine = db.query(Medicine).filter(
+            Medicine.id == hits[0]["medicine_id"]
+        ).first()
+        if medicine:
+            return medicine
+
+    return find_medicine(db, medicine_name)
@@ -0,0 +1,164 @@
+# backend/app/services/consumption_rollup_service.py
+# STEP 64 — Daily Consumption Rollup
+# medicine_daily_consumption holds SUM(quantity) and COUNT(*) of orders
+# per medicine per day, kept in sync by triggers on orders (every
+# insert path — ORM, bulk Core inserts, imports — is covered). Window
+# sums read at most N small rows per medicine instead of raw orders.
+
+import logging
+from datetime import date
+
+from sqlalchemy import func, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..models.medicine_daily_consumption import MedicineDailyConsumption
+from ..models.order import Order
+
+
+logger = logging.getLogger("pharmaagentx.rollup")
+
+ROLLUP_TABLE = "medicine_daily_consumption"
+INSERT_TRIGGER = "orders_consumption_ai"
+
+_ADD_NEW = f"""
+    INSERT INTO {ROLLUP_TABLE}(medicine_id, day, qty, order_count)
+    VALUES (new.medicine_id, date(new.order_date), new.quantity, 1)
+    ON CONFLICT(medicine_id, day) DO UPDATE SET
+        qty = qty + excluded.qty,
+        order_count = order_count + 1;
+"""
+
+_SUBTRACT_OLD = f"""
+    UPDATE {ROLLUP_TABLE}
+    SET qty = qty - old.quantity, order_count = order_count - 1
+    WHERE medicine_id = old.medicine_id AND day = date(old.order_date);
+"""
+
+CONSUMPTION_ROLLUP_DDL = [
+    f"CREATE TRIGGER IF NOT EXISTS {INSERT_TRIGGER} AFTER INSERT ON orders BEGIN {_ADD_NEW} END",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS orders_consumption_au
+    AFTER UPDATE OF medicine_id, order_date, quantity ON orders BEGIN
+        {_SUBTRACT_OLD}
+        {_ADD_NEW}
+    END
+    """,
+    f"CREATE TRIGGER IF NOT EXISTS orders_consumption_ad AFTER DELETE ON orders BEGIN {_SUBTRACT_OLD} END",
+]
+
+REBUILD_SQL = [
+    f"DELETE FROM {ROLLUP_TABLE}",
+    f"""
+    INSERT INTO {ROLLUP_TABLE}(medicine_id, day, qty, order_count)
+    SELECT medicine_id, date(order_date), SUM(quantity), COUNT(*)
+    FROM orders
+    GROUP BY medicine_id, date(order_date)
+    """,
+]
+
+_rollup_available = None
+
+
+# =====================================================
+# SETUP
+# =====================================================
+
+def ensure_consumption_rollup(engine: Engine, rebuild: bool = False) -> bool:
+    """
+    Creates the sync triggers and backfills from order history when
+    the rollup is empty (or rebuild=True, e.g. after a bulk load that
+    ran before the triggers existed). Returns False when the backend
+    is not SQLite; window sums then read orders directly.
+    """
+    global _rollup_available
+
+    if engine.dialect.name != "sqlite":
+        _rollup_available = False
+        return False
+
+    try:
+        with engine.begin() as conn:
+            for statement in CONSUMPTION_ROLLUP_DDL:
+                conn.exec_driver_sql(statement)
+
+            empty = conn.exec_driver_sql(f"SELECT 1 FROM {ROLLUP_TABLE} LIMIT 1").first() is None
+
+            if rebuild or empty:
+                for statement in REBUILD_SQL:
+                    conn.exec_driver_sql(statement)
+
+        _rollup_available = True
+
+    except Exception as e:
+        logger.warning(f"Consumption rollup unavailable, window sums read orders: {e}")
+        _rollup_available = False
+
+    return _rollup_available
+
+
+def rebuild_consumption_rollup(engine: Engine) -> bool:
+    return ensure_consumption_rollup(engine, rebuild=True)
+
+
+def is_consumption_rollup_available(db: Session = None) -> bool:
+    """
+    True once ensure_consumption_rollup() succeeded in this process,
+    or — for processes that never ran it — when the sync trigger
+    already exists in the database.
+    """
+    global _rollup_available
+
+    if _rollup_available is None and db is not None:
+        _rollup_available = (
+            db.bind.dialect.name == "sqlite"
+            and db.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = :name"),
+                {"name": INSERT_TRIGGER},
+            ).first() is not None
+        )
+
+    return bool(_rollup_available)
+
+
+# =====================================================
+# WINDOW READS
+# =====================================================
+
+def window_totals(db: Session, medicine_id: int, start: date, end: date = None) -> tuple:
+    """
+    (quantity, order_count) for orders with start <= order_date < end
+    (open-ended when end is None).
+    """
+    if is_consumption_rollup_available(db):
+        day = MedicineDailyConsumption.day
+        query = db.query(
+            func.sum(MedicineDailyConsumption.qty),
+            func.sum(MedicineDailyConsumption.order_count),
+        ).filter(
+            MedicineDailyConsumption.medicine_id == medicine_id,
+            day >= start,
+        )
+    else:
+        day = Order.order_date
+        query = db.query(
+            func.sum(Order.quantity),
+            func.count(Order.id),
+        ).filter(
+            Order.medicine_id == medicine_id,
+            day >= start,
+        )
+
+    if end is not None:
+        query = query.filter(day < end)
+
+    quantity, order_count = query.one()
+    return quantity or 0, order_count or 0
+
+
+def window_quantity(db: Session, medicine_id: int, start: date, end: date = None) -> int:
+    return window_totals(db, medicine_id, start, end)[0]
+
+
+def window_order_count(db: Session, medicine_id: int, start: date, end: date = None) -> int:
+    return window_totals(db, medicine_id, start, end)[1]
@@ -1,13 +1,28 @@
 from datetime import datetime, timedelta
-from sqlalchemy import func
+from sqlalchemy.orm import Session
 from ..core.database import SessionLocal
-from ..models.order import Order
 from ..models.medicine import Medicine
 from ..models.inventory_escalation import InventoryEscalation
 
 # STEP 36 — Load Balancer Integration
 from .load_balancer_service import enqueue_restock
 
+# STEP 64 — Daily consumption rollup
+from .consumption_rollup_service import window_quantity
+
+# STEP 66 — Demand forecasting
+from .forecast_service import forecast_demand
+
+# STEP 62 — Incremental scans
+from .scan_watermark_service import (
+    DEMAND_SCAN,
+    changed_medicine_ids,
+    current_max_order_id,
+    load_watermark,
+    needs_full_scan,
+    save_watermark,
+)
+
 PREDICTIVE_WINDOW_DAYS = 30
 PREDICTIVE_DEPLETION_THRESHOLD_DAYS = 7
 SAFETY_BUFFER_DAYS = 7
@@ -97,107 +112,151 @@ def calculate_priority(
         return "STABLE"
 
 
+# ==========================================================
+# STEP 33 + 34 + 35 + 36 — Single-Medicine Evaluation
+# ==========================================================
+def evaluate_medicine_demand(db: Session, medicine: Medicine, cutoff_date, forecast: dict = None):
+    """
+    Forecast demand → priority → restock enqueue for one medicine.
+    Returns the enqueued quantity, or None when nothing was enqueued.
+
+    forecast: {"avg_daily", "projected"} from forecast_demand (the
+    full scan fits all medicines at once); fitted here when omitted.
+    """
+    # STEP 64 — ≤ 30 rollup rows instead of raw orders
+    total_quantity = window_quantity(db, medicine.id, cutoff_date)
+
+    if total_quantity is None or total_quantity <= 0:
+        return None
+
+    # STEP 66 — Model forecast over the next 30 days; the flat
+    # 30-day average remains the fallback when the model sees no demand
+    if forecast is None:
+        forecast = forecast_demand(db, [medicine.id], horizon=PREDICTIVE_WINDOW_DAYS)[medicine.id]
+
+    avg_daily_consumption = forecast["avg_daily"]
+    projected_30_day_demand = forecast["projected"]
+
+    if avg_daily_consumption <= 0:
+        avg_daily_consumption = total_quantity / PREDICTIVE_WINDOW_DAYS
+        projected_30_day_demand = avg_daily_consumption * 30
+
+    if avg_daily_consumption <= 0:
+        return None
+
+    current_stock = medicine.stock
+
+    days_until_depletion = current_stock / avg_daily_consumption
+
+    # ------------------------------------------------------
+    # STEP 35 — Priority Evaluation
+    # ------------------------------------------------------
+    active_escalation = (
+        db.query(InventoryEscalation)
+        .filter(
+            InventoryEscalation.medicine_id == medicine.id,
+            InventoryEscalation.restock_triggered == False
+        )
+        .first()
+    )
+
+    priority = calculate_priority(
+        days_until_depletion=days_until_depletion,
+        avg_daily_consumption=avg_daily_consumption,
+        current_stock=current_stock,
+        projected_30_day_demand=projected_30_day_demand,
+        has_active_escalation=bool(active_escalation),
+    )
+
+    print(
+        f"[PRIORITY] Medicine={medicine.name} | "
+        f"DaysLeft={round(days_until_depletion,2)} | "
+        f"Priority={priority}"
+    )
+
+    # ------------------------------------------------------
+    # Predictive Restock Trigger (NOW LOAD BALANCED)
+    # ------------------------------------------------------
+    if (
+        days_until_depletion < PREDICTIVE_DEPLETION_THRESHOLD_DAYS
+        or priority == "CRITICAL"
+    ):
+
+        print(
+            f"📊 Predictive alert: Medicine {medicine.id} "
+            f"may deplete in {round(days_until_depletion, 2)} days."
+        )
+
+        restock_quantity = calculate_dynamic_restock_quantity(
+            avg_daily_consumption=avg_daily_consumption,
+            current_stock=current_stock
+        )
+
+        if restock_quantity <= 0:
+            return None
+
+        print(
+            f"[AI-RESTOCK] Medicine={medicine.name} | "
+            f"AvgDaily={round(avg_daily_consumption, 2)} | "
+            f"CurrentStock={current_stock} | "
+            f"RestockQuantity={restock_quantity} | "
+            f"Priority={priority}"
+        )
+
+        # ======================================================
+        # STEP 36 — ENQUEUE INSTEAD OF DIRECT THREAD EXECUTION
+        # ======================================================
+        enqueue_restock(
+            medicine_id=medicine.id,
+            quantity=restock_quantity,
+            priority_level=priority
+        )
+
+        return restock_quantity
+
+    return None
+
+
 # ==========================================================
 # STEP 33 + 34 + 35 + 36 — Predictive Demand Scan
 # ==========================================================
-def run_predictive_demand_scan():
+def run_predictive_demand_scan(incremental: bool = True):
+    """
+    Full scan on the first run (or incremental=False). Afterwards only
+    medicines with new orders, orders leaving the demand window or an
+    open escalation are re-evaluated.
+    """
     db = SessionLocal()
 
     try:
-        cutoff_date = datetime.utcnow().date() - timedelta(days=PREDICTIVE_WINDOW_DAYS)
+        today = datetime.utcnow().date()
+        cutoff_date = today - timedelta(days=PREDICTIVE_WINDOW_DAYS)
 
-        medicines = db.query(Medicine).all()
+        upto_order_id = current_max_order_id(db)
+        mark = load_watermark(db, DEMAND_SCAN)
 
-        for medicine in medicines:
+        medicines_query = db.query(Medicine)
 
-            total_quantity = (
-                db.query(func.sum(Order.quantity))
-                .filter(
-                    Order.medicine_id == medicine.id,
-                    Order.order_date >= cutoff_date
-                )
-                .scalar()
+        if incremental and not needs_full_scan(mark):
+            medicine_ids = changed_medicine_ids(
+                db, mark, upto_order_id, today, windows=(PREDICTIVE_WINDOW_DAYS,)
             )
+            medicines_query = medicines_query.filter(Medicine.id.in_(medicine_ids))
 
-            if total_quantity is None or total_quantity <= 0:
-                continue
-
-            avg_daily_consumption = total_quantity / PREDICTIVE_WINDOW_DAYS
+        medicines = medicines_query.order_by(Medicine.id).all()
 
-            if avg_daily_consumption <= 0:
-                continue
+        # STEP 66 — One vectorized fit for every medicine in this scan
+        forecasts = forecast_demand(
+            db, [medicine.id for medicine in medicines], horizon=PREDICTIVE_WINDOW_DAYS, today=today
+        )
 
-            current_stock = medicine.stock
-
-            days_until_depletion = current_stock / avg_daily_consumption
-            projected_30_day_demand = avg_daily_consumption * 30
-
-            # ------------------------------------------------------
-            # STEP 35 — Priority Evaluation
-            # ------------------------------------------------------
-            active_escalation = (
-                db.query(InventoryEscalation)
-                .filter(
-                    InventoryEscalation.medicine_id == medicine.id,
-                    InventoryEscalation.restock_triggered == False
-                )
-                .first()
-            )
-
-            priority = calculate_priority(
-                days_until_depletion=days_until_depletion,
-                avg_daily_consumption=avg_daily_consumption,
-                current_stock=current_stock,
-                projected_30_day_demand=projected_30_day_demand,
-                has_active_escalation=bool(active_escalation),
-            )
-
-            print(
-                f"[PRIORITY] Medicine={medicine.name} | "
-                f"DaysLeft={round(days_until_depletion,2)} | "
-                f"Priority={priority}"
-            )
+        for medicine in medicines:
+            evaluate_medicine_demand(db, medicine, cutoff_date, forecasts[medicine.id])
 
-            # ------------------------------------------------------
-            # Predictive Restock Trigger (NOW LOAD BALANCED)
-            # ------------------------------------------------------
-            if (
-                days_until_depletion < PREDICTIVE_DEPLETION_THRESHOLD_DAYS
-                or priority == "CRITICAL"
-            ):
-
-                print(
-                    f"📊 Predictive alert: Medicine {medicine.id} "
-                    f"may deplete in {round(days_until_depletion, 2)} days."
-                )
-
-                restock_quantity = calculate_dynamic_restock_quantity(
-                    avg_daily_consumption=avg_daily_consumption,
-                    current_stock=current_stock
-                )
-
-                if restock_quantity <= 0:
-                    continue
-
-                print(
-                    f"[AI-RESTOCK] Medicine={medicine.name} | "
-                    f"AvgDaily={round(avg_daily_consumption, 2)} | "
-                    f"CurrentStock={current_stock} | "
-                    f"RestockQuantity={restock_quantity} | "
-                    f"Priority={priority}"
-                )
-
-                # ======================================================
-                # STEP 36 — ENQUEUE INSTEAD OF DIRECT THREAD EXECUTION
-                # ======================================================
-                enqueue_restock(
-                    medicine_id=medicine.id,
-                    quantity=restock_quantity,
-                    priority_level=priority
-                )
+        save_watermark(db, DEMAND_SCAN, upto_order_id, today)
 
     except Exception as e:
         print("Predictive Demand Scan Error:", e)
 
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -0,0 +1,93 @@
+# backend/app/services/event_handlers.py
+# STEP 63 — Event Bus Subscriptions
+# Targeted recomputation for exactly the patient / medicine an event
+# touches. Handlers open their own sessions (they run on the bus pool).
+# Handlers run in every worker process, so they never execute
+# mitigations or enqueue restocks: that stays with the leader-only
+# scheduler jobs (demand scan, autonomous mitigation).
+
+import logging
+
+from ..core.database import SessionLocal
+from ..core.event_dispatcher import (
+    EscalationCreated,
+    EventBus,
+    ModeChanged,
+    OrderCreated,
+    StockChanged,
+    event_bus,
+)
+from .explainability_service import get_medicine_risk_snapshot
+from .inventory_service import _trigger_restock_signal, inventory_check_medicine
+from .mitigation_execution_service import SAFE_AUTO_THRESHOLD
+from .refill_service import evaluate_patient_refills
+
+
+logger = logging.getLogger("pharmaagentx.events")
+
+
+# =====================================================
+# HANDLERS
+# =====================================================
+
+def refresh_patient_refills(event):
+    db = SessionLocal()
+    try:
+        evaluate_patient_refills(db, event.patient_id)
+        db.commit()
+    finally:
+        db.close()
+
+
+def check_medicine_inventory(event):
+    inventory_check_medicine(event.medicine_id)
+
+
+def evaluate_medicine_risk(event):
+    # Read-only: the next autonomous_mitigation_job tick acts on it
+    db = SessionLocal()
+    try:
+        snapshot = get_medicine_risk_snapshot(db, event.medicine_id)
+    finally:
+        db.close()
+
+    risk_score = snapshot.get("risk_score", 0) if snapshot else 0
+
+    if risk_score >= SAFE_AUTO_THRESHOLD:
+        logger.info(f"⚠ Medicine {event.medicine_id} at risk {risk_score}; mitigation runs on the next tick")
+
+
+def signal_restock(event: EscalationCreated):
+    _trigger_restock_signal(event.medicine_id)
+
+
+def log_mode_change(event: ModeChanged):
+    # The mitigation scan watermark stores the mode, so its next tick
+    # rescans everything under the new mode
+    logger.info(f"🔀 System mode changed {event.old_mode} → {event.new_mode} (by user {event.changed_by})")
+
+
+# =====================================================
+# REGISTRATION
+# =====================================================
+
+def register_event_handlers(bus: EventBus = event_bus):
+    """
+    Idempotent. Handlers sharing a key coalesce across event types:
+    an order and a restock for the same medicine queue one inventory
+    check.
+    """
+    bus.clear()
+
+    by_medicine = lambda e: e.medicine_id
+
+    bus.subscribe(OrderCreated, refresh_patient_refills, key=lambda e: e.patient_id)
+    bus.subscribe(OrderCreated, check_medicine_inventory, key=by_medicine)
+    bus.subscribe(OrderCreated, evaluate_medicine_risk, key=by_medicine)
+
+    bus.subscribe(StockChanged, check_medicine_inventory, key=by_medicine)
+
+    bus.subscribe(EscalationCreated, signal_restock, key=lambda e: e.escalation_id)
+    bus.subscribe(EscalationCreated, evaluate_medicine_risk, key=by_medicine)
+
+    bus.subscribe(ModeChanged, log_mode_change)
@@ -1,10 +1,9 @@
 from datetime import datetime, timedelta
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from ..models.medicine import Medicine
-from ..models.order import Order
 from ..models.inventory_escalation import InventoryEscalation
+from ..services.consumption_rollup_service import window_quantity
 from ..services.demand_service import (
     calculate_priority,
     calculate_dynamic_restock_quantity,
@@ -141,14 +140,8 @@ def get_medicine_risk_snapshot(db: Session, medicine_id: int):
 
     cutoff_date = datetime.utcnow().date() - timedelta(days=PREDICTIVE_WINDOW_DAYS)
 
-    total_quantity = (
-        db.query(func.sum(Order.quantity))
-        .filter(
-            Order.medicine_id == medicine.id,
-            Order.order_date >= cutoff_date,
-        )
-        .scalar()
-    )
+    # STEP 64 — Window sums read the daily consumption rollup
+    total_quantity = window_quantity(db, medicine.id, cutoff_date)
 
     if not total_quantity or total_quantity <= 0:
         return {
@@ -189,24 +182,8 @@ def get_medicine_risk_snapshot(db: Session, medicine_id: int):
     last_7 = now - timedelta(days=7)
     prev_7 = now - timedelta(days=14)
 
-    recent_qty = (
-        db.query(func.sum(Order.quantity))
-        .filter(
-            Order.medicine_id == medicine.id,
-            Order.order_date >= last_7,
-        )
-        .scalar()
-    ) or 0
-
-    previous_qty = (
-        db.query(func.sum(Order.quantity))
-        .filter(
-            Order.medicine_id == medicine.id,
-            Order.order_date >= prev_7,
-            Order.order_date < last_7,
-        )
-        .scalar()
-    ) or 0
+    recent_qty = window_quantity(db, medicine.id, last_7)
+    previous_qty = window_quantity(db, medicine.id, prev_7, last_7)
 
     acceleration_factor = 0
     if previous_qty > 0:
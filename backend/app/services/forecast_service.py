@@ -0,0 +1,258 @@
+# backend/app/services/forecast_service.py
+# STEP 66 — Vectorized Demand Forecasting + Backtest
+# Simple exponential smoothing, Holt linear trend and Holt-Winters with
+# additive weekly seasonality, fitted across all SKUs at once: the
+# recursion runs over days, every SKU is one row of a NumPy matrix.
+# backtest() replays history at several cut-offs and reports MAPE and
+# simulated stockout days per model, so the default model is chosen
+# from data (DEMAND_FORECAST_MODEL).
+
+import os
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..models.medicine_daily_consumption import MedicineDailyConsumption
+from .order_column_store import get_order_store
+
+
+FIT_DAYS = 90
+SEASON_LENGTH = 7
+
+# Smoothing constants (level, trend, season)
+ALPHA = 0.3
+BETA = 0.1
+GAMMA = 0.2
+
+MODELS = ("mean30", "ses", "holt", "holt_weekly")
+DEFAULT_MODEL = os.getenv("DEMAND_FORECAST_MODEL", "holt")
+
+if DEFAULT_MODEL not in MODELS:
+    raise ValueError(f"DEMAND_FORECAST_MODEL must be one of {MODELS}, got {DEFAULT_MODEL!r}")
+
+
+# =====================================================
+# HISTORY MATRIX
+# =====================================================
+
+def demand_matrix(db: Session, medicine_ids: list, start: date, end: date) -> np.ndarray:
+    """
+    (len(medicine_ids), days) float matrix of units ordered per day for
+    start <= day < end. Columnar order store when exported, otherwise
+    one query over the daily consumption rollup.
+    """
+    days = max((end - start).days, 0)
+    matrix = np.zeros((len(medicine_ids), days), dtype=np.float64)
+
+    if not medicine_ids or not days:
+        return matrix
+
+    store = get_order_store()
+
+    if store is not None:
+        for row, medicine_id in enumerate(medicine_ids):
+            matrix[row] = store.daily_series(medicine_id, start, end)
+        return matrix
+
+    position = {medicine_id: row for row, medicine_id in enumerate(medicine_ids)}
+
+    rows = (
+        db.query(
+            MedicineDailyConsumption.medicine_id,
+            MedicineDailyConsumption.day,
+            MedicineDailyConsumption.qty,
+        )
+        .filter(
+            MedicineDailyConsumption.medicine_id.in_(medicine_ids),
+            MedicineDailyConsumption.day >= start,
+            MedicineDailyConsumption.day < end,
+        )
+        .all()
+    )
+
+    if rows:
+        medicine_col, day_col, qty_col = zip(*rows)
+        matrix[
+            [position[m] for m in medicine_col],
+            [(d - start).days for d in day_col],
+        ] = qty_col
+
+    return matrix
+
+
+# =====================================================
+# MODELS (rows = SKUs, columns = days)
+# =====================================================
+
+def _mean30(history: np.ndarray, horizon: int) -> np.ndarray:
+    # Pre-STEP 66 estimate: last 30 days' total / 30, flat
+    rate = history[:, -30:].sum(axis=1) / 30
+    return np.repeat(rate[:, None], horizon, axis=1)
+
+
+def _ses(history: np.ndarray, horizon: int, alpha: float = ALPHA) -> np.ndarray:
+    level = history[:, :SEASON_LENGTH].mean(axis=1)
+
+    for t in range(history.shape[1]):
+        level = alpha * history[:, t] + (1 - alpha) * level
+
+    return np.repeat(level[:, None], horizon, axis=1)
+
+
+def _holt(history: np.ndarray, horizon: int, alpha: float = ALPHA, beta: float = BETA) -> np.ndarray:
+    level = history[:, :SEASON_LENGTH].mean(axis=1)
+    trend = np.zeros_like(level)
+
+    for t in range(history.shape[1]):
+        previous = level
+        level = alpha * history[:, t] + (1 - alpha) * (level + trend)
+        trend = beta * (level - previous) + (1 - beta) * trend
+
+    steps = np.arange(1, horizon + 1)
+    return level[:, None] + trend[:, None] * steps[None, :]
+
+
+def _holt_weekly(history: np.ndarray, horizon: int, alpha: float = ALPHA,
+                 beta: float = BETA, gamma: float = GAMMA) -> np.ndarray:
+    m = SEASON_LENGTH
+    days = history.shape[1]
+
+    level = history[:, :m].mean(axis=1)
+    trend = np.zeros_like(level)
+
+    # seasonal[:, k] is the additive offset of weekday slot k (t % m)
+    seasonal = history[:, :m] - level[:, None]
+
+    for t in range(days):
+        slot = t % m
+        previous = level
+        level = alpha * (history[:, t] - seasonal[:, slot]) + (1 - alpha) * (level + trend)
+        trend = beta * (level - previous) + (1 - beta) * trend
+        seasonal[:, slot] = gamma * (history[:, t] - level) + (1 - gamma) * seasonal[:, slot]
+
+    steps = np.arange(1, horizon + 1)
+    slots = (days + steps - 1) % m
+    return level[:, None] + trend[:, None] * steps[None, :] + seasonal[:, slots]
+
+
+_MODEL_FUNCTIONS = {
+    "mean30": _mean30,
+    "ses": _ses,
+    "holt": _holt,
+    "holt_weekly": _holt_weekly,
+}
+
+
+def forecast_matrix(history: np.ndarray, horizon: int, model: str = DEFAULT_MODEL) -> np.ndarray:
+    """
+    (SKUs, horizon) daily forecasts. Negative forecasts (falling trends)
+    are clipped to zero.
+    """
+    if model not in _MODEL_FUNCTIONS:
+        raise ValueError(f"Unknown forecast model {model!r}; expected one of {MODELS}")
+
+    if history.shape[1] == 0:
+        return np.zeros((history.shape[0], horizon))
+
+    return np.clip(_MODEL_FUNCTIONS[model](history, horizon), 0, None)
+
+
+# =====================================================
+# SERVICE API
+# =====================================================
+
+def forecast_demand(db: Session, medicine_ids: list, horizon: int = 30,
+                    model: str = DEFAULT_MODEL, today: date = None) -> dict:
+    """
+    medicine_id → {"avg_daily": float, "projected": float} over the
+    next `horizon` days, fitted on the last FIT_DAYS of history.
+    """
+    today = today or date.today()
+    history = demand_matrix(db, list(medicine_ids), today - timedelta(days=FIT_DAYS), today)
+    forecasts = forecast_matrix(history, horizon, model)
+    projected = forecasts.sum(axis=1)
+
+    return {
+        medicine_id: {
+            "avg_daily": float(projected[row] / horizon),
+            "projected": float(projected[row]),
+        }
+        for row, medicine_id in enumerate(medicine_ids)
+    }
+
+
+# =====================================================
+# BACKTEST
+# =====================================================
+
+def _mape(actual: np.ndarray, forecast: np.ndarray) -> float:
+    """Mean absolute percentage error of horizon totals, SKUs with demand only."""
+    actual_total = actual.sum(axis=1)
+    forecast_total = forecast.sum(axis=1)
+    mask = actual_total > 0
+
+    if not mask.any():
+        return 0.0
+
+    return float(np.mean(np.abs(actual_total[mask] - forecast_total[mask]) / actual_total[mask]) * 100)
+
+
+def _stockout_days(actual: np.ndarray, forecast: np.ndarray, safety_days: int) -> np.ndarray:
+    """
+    Per SKU: stock the forecast horizon plus safety_days of forecast
+    demand at the cut-off, then count days the actual demand runs it dry.
+    """
+    stock = forecast.sum(axis=1) + forecast.mean(axis=1) * safety_days
+    remaining = stock[:, None] - np.cumsum(actual, axis=1)
+    return (remaining < 0).sum(axis=1)
+
+
+def backtest(db: Session, medicine_ids: list, models: tuple = MODELS, horizon: int = 30,
+             folds: int = 4, step_days: int = 7, safety_days: int = 7, today: date = None) -> dict:
+    """
+    Rolling-origin backtest: `folds` cut-offs, `step_days` apart, the
+    latest one `horizon` days before today. At each cut-off every model
+    is fitted on the preceding FIT_DAYS and scored on the next `horizon`
+    days. History is loaded once as a single matrix.
+    """
+    today = today or date.today()
+    span = FIT_DAYS + horizon + (folds - 1) * step_days
+    start = today - timedelta(days=span)
+
+    matrix = demand_matrix(db, list(medicine_ids), start, today)
+
+    scores = {model: {"mape": [], "stockout_days": [], "stockout_skus": []} for model in models}
+
+    for fold in range(folds):
+        cut = FIT_DAYS + fold * step_days
+        history = matrix[:, cut - FIT_DAYS:cut]
+        actual = matrix[:, cut:cut + horizon]
+
+        for model in models:
+            forecast = forecast_matrix(history, horizon, model)
+            stockouts = _stockout_days(actual, forecast, safety_days)
+
+            scores[model]["mape"].append(_mape(actual, forecast))
+            scores[model]["stockout_days"].append(float(stockouts.mean()))
+            scores[model]["stockout_skus"].append(int((stockouts > 0).sum()))
+
+    results = {
+        model: {
+            "mape": round(float(np.mean(s["mape"])), 2),
+            "avg_stockout_days_per_sku": round(float(np.mean(s["stockout_days"])), 3),
+            "skus_with_stockout": round(float(np.mean(s["stockout_skus"])), 1),
+        }
+        for model, s in scores.items()
+    }
+
+    best = min(results, key=lambda m: (results[m]["avg_stockout_days_per_sku"], results[m]["mape"]))
+
+    return {
+        "skus": len(medicine_ids),
+        "horizon_days": horizon,
+        "folds": folds,
+        "fit_days": FIT_DAYS,
+        "models": results,
+        "recommended_model": best,
+    }
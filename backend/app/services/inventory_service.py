@@ -1,59 +1,72 @@
 from ..core.database import SessionLocal
+from ..core.event_dispatcher import EscalationCreated, publish
 from ..models.medicine import Medicine
 from ..models.inventory_escalation import InventoryEscalation
 from ..services.warehouse_service import trigger_fulfillment
 from sqlalchemy import and_
+from sqlalchemy.orm import Session
 from datetime import datetime
-import threading
 
 LOW_STOCK_THRESHOLD = 10  # Can later be moved to config
 
 
-def inventory_threshold_scan():
-    db = SessionLocal()
+def check_low_stock(db: Session, med: Medicine):
+    """
+    Records an escalation when the medicine is below threshold and no
+    escalation exists for this exact stock level. Commits and returns
+    the new escalation, or None.
+    """
 
-    try:
-        medicines = db.query(Medicine).all()
+    # Safety check
+    if med.stock is None:
+        return None
 
-        for med in medicines:
+    if med.stock >= LOW_STOCK_THRESHOLD:
+        return None
+
+    # Prevent duplicate escalation for same stock level
+    existing = db.query(InventoryEscalation).filter(
+        and_(
+            InventoryEscalation.medicine_id == med.id,
+            InventoryEscalation.current_stock == med.stock
+        )
+    ).first()
 
-            # Safety check
-            if med.stock is None:
-                continue
+    if existing:
+        return None
 
-            if med.stock < LOW_STOCK_THRESHOLD:
+    escalation = InventoryEscalation(
+        medicine_id=med.id,
+        medicine_name=med.name,
+        current_stock=med.stock,
+        threshold=LOW_STOCK_THRESHOLD,
+        restock_triggered=False,
+        created_at=datetime.utcnow()
+    )
 
-                # Prevent duplicate escalation for same stock level
-                existing = db.query(InventoryEscalation).filter(
-                    and_(
-                        InventoryEscalation.medicine_id == med.id,
-                        InventoryEscalation.current_stock == med.stock
-                    )
-                ).first()
+    db.add(escalation)
+    db.commit()
 
-                if existing:
-                    continue
+    print(f"⚠ Low stock detected for {med.name} (Stock: {med.stock})")
 
-                escalation = InventoryEscalation(
-                    medicine_id=med.id,
-                    medicine_name=med.name,
-                    current_stock=med.stock,
-                    threshold=LOW_STOCK_THRESHOLD,
-                    restock_triggered=False,
-                    created_at=datetime.utcnow()
-                )
+    # STEP 63 — Restock signal runs on the event bus (bounded, non-blocking)
+    publish(EscalationCreated(
+        escalation_id=escalation.id,
+        medicine_id=med.id,
+        current_stock=med.stock
+    ))
 
-                db.add(escalation)
-                db.commit()
+    return escalation
 
-                print(f"⚠ Low stock detected for {med.name} (Stock: {med.stock})")
 
-                # Non-blocking restock trigger
-                threading.Thread(
-                    target=_trigger_restock_signal,
-                    args=(med.id,),
-                    daemon=True
-                ).start()
+def inventory_threshold_scan():
+    db = SessionLocal()
+
+    try:
+        medicines = db.query(Medicine).all()
+
+        for med in medicines:
+            check_low_stock(db, med)
 
     except Exception as e:
         print("Inventory scan error:", str(e))
@@ -62,8 +75,24 @@ def inventory_threshold_scan():
         db.close()
 
 
+def inventory_check_medicine(medicine_id: int):
+    """
+    STEP 63 — Threshold check for a single medicine (event bus).
+    """
+    db = SessionLocal()
+
+    try:
+        med = db.query(Medicine).filter(Medicine.id == medicine_id).first()
+
+        if med:
+            return check_low_stock(db, med)
+
+    finally:
+        db.close()
+
+
 def _trigger_restock_signal(medicine_id: int):
     try:
         trigger_fulfillment(medicine_id=medicine_id)
     except Exception as e:
-        print("Restock signal failed:", str(e))
\ No newline at end of file
+        print("Restock signal failed:", str(e))
@@ -0,0 +1,590 @@
+# backend/app/services/inventory_simulation_service.py
+# STEP 67 — Fast-Forward Inventory Simulation
+# Replays historical daily demand through the inventory threshold scan,
+# predictive demand scan, restock dispatch and autonomous mitigation
+# against an in-memory stock model. Every SKU is one element of a NumPy
+# vector; the clock is injected and advanced one day at a time, so a
+# year of history for 10k SKUs runs in seconds instead of a year.
+#
+# The vectorized decision rules mirror calculate_priority,
+# calculate_dynamic_restock_quantity, compute_risk_score and the
+# mitigation recommendation / execution rules (parity is covered in
+# tests/test_inventory_simulation.py). Not modelled: the drift /
+# confidence / ethics layers and the load balancer's WARNING queue cap.
+#
+# Demand-scan restocks go to the load balancer's restock_queue, which
+# nothing drains today: they are counted (units_queued) but never
+# delivered unless the policy sets drain_restock_queue.
+
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models.medicine import Medicine
+from ..models.medicine_daily_consumption import MedicineDailyConsumption
+from ..models.order import Order
+from .consumption_rollup_service import is_consumption_rollup_available
+from .demand_service import (
+    HIGH_VELOCITY_THRESHOLD,
+    MINIMUM_RESTOCK_FLOOR,
+    PREDICTIVE_DEPLETION_THRESHOLD_DAYS,
+    PREDICTIVE_WINDOW_DAYS,
+    SAFETY_BUFFER_DAYS,
+)
+from .forecast_service import DEFAULT_MODEL, FIT_DAYS, forecast_matrix
+from .inventory_service import LOW_STOCK_THRESHOLD
+from .mitigation_execution_service import SAFE_AUTO_THRESHOLD
+from .self_healing_service import LOOKBACK_DAYS
+from .system_governor_service import AUTO, REVIEW, SAFE
+
+
+# The warehouse endpoint adds a fixed 50 units per restock request and
+# ignores the requested quantity (api/warehouse.py RESTOCK_UNITS)
+WAREHOUSE_RESTOCK_UNITS = 50
+
+# A delivered restock publishes StockChanged, which re-runs the
+# inventory check for that medicine; with instant restocks a simulated
+# day repeats it for restocked SKUs until nothing fires (capped)
+MAX_SCAN_PASSES_PER_DAY = 144
+
+ACCELERATION_WINDOW_DAYS = 7
+ESCALATION_WINDOW_DAYS = 30
+
+# Mitigation recommendations (mitigation_service.py)
+MONITOR, SAFETY_STOCK_INCREASE, SUPPLIER_ESCALATION, RESTOCK_IMMEDIATE = range(4)
+
+RESTOCK_SOURCES = ("inventory_scan", "demand_scan", "mitigation")
+
+
+# =====================================================
+# CONFIGURATION
+# =====================================================
+
+@dataclass(frozen=True)
+class SimulationPolicy:
+    """
+    The tunables under test, defaulting to the production constants.
+    honor_restock_quantity=False mirrors today's warehouse (fixed
+    WAREHOUSE_RESTOCK_UNITS per request); True applies the dynamic
+    restock quantity the scans ask for. drain_restock_queue=False
+    mirrors today's undrained demand-scan queue; True delivers those
+    restocks like the others.
+    """
+    predictive_depletion_threshold_days: float = PREDICTIVE_DEPLETION_THRESHOLD_DAYS
+    safety_buffer_days: float = SAFETY_BUFFER_DAYS
+    low_stock_threshold: int = LOW_STOCK_THRESHOLD
+    safe_auto_threshold: int = SAFE_AUTO_THRESHOLD
+    mode: str = AUTO
+    forecast_model: str = DEFAULT_MODEL
+    honor_restock_quantity: bool = False
+    drain_restock_queue: bool = False
+    lead_time_days: int = 0
+
+
+class SimulationClock:
+    """
+    Injectable clock: the engine reads `today` from it and advances it
+    one simulated day at a time. Starting it later than the history's
+    simulate_from skips the days in between.
+    """
+
+    def __init__(self, start: date):
+        self.today = start
+
+    def advance(self, days: int = 1):
+        self.today += timedelta(days=days)
+
+
+@dataclass
+class SimulationHistory:
+    """
+    qty / orders: (SKUs, days) units and order count per day, column 0
+    is `start`. Columns before `simulate_from` are warm-up history for
+    the demand windows and the forecast fit.
+    """
+    medicine_ids: list
+    start: date
+    qty: np.ndarray
+    orders: np.ndarray
+    initial_stock: np.ndarray
+    simulate_from: int
+
+
+# =====================================================
+# HISTORY LOADING
+# =====================================================
+
+def _daily_matrices(db: Session, medicine_ids: list, start: date, end: date) -> tuple:
+    days = (end - start).days
+    position = {medicine_id: row for row, medicine_id in enumerate(medicine_ids)}
+
+    qty = np.zeros((len(medicine_ids), days), dtype=np.float64)
+    orders = np.zeros((len(medicine_ids), days), dtype=np.int64)
+
+    if is_consumption_rollup_available(db):
+        rows = (
+            db.query(
+                MedicineDailyConsumption.medicine_id,
+                MedicineDailyConsumption.day,
+                MedicineDailyConsumption.qty,
+                MedicineDailyConsumption.order_count,
+            )
+            .filter(MedicineDailyConsumption.day >= start, MedicineDailyConsumption.day < end)
+            .all()
+        )
+    else:
+        day = func.date(Order.order_date)
+        rows = (
+            db.query(Order.medicine_id, day, func.sum(Order.quantity), func.count(Order.id))
+            .filter(Order.order_date >= start, Order.order_date < end)
+            .group_by(Order.medicine_id, day)
+            .all()
+        )
+
+    for medicine_id, day, units, count in rows:
+        row = position.get(medicine_id)
+
+        if row is None:
+            continue
+
+        if not isinstance(day, date):
+            day = date.fromisoformat(str(day))
+
+        qty[row, (day - start).days] = units
+        orders[row, (day - start).days] = count
+
+    return qty, orders
+
+
+def load_history(db: Session, days: int = 365, end: date = None,
+                 initial_cover_days: float = None) -> SimulationHistory:
+    """
+    The last `days` days before `end` (default today) plus FIT_DAYS of
+    warm-up. Starting stock is each medicine's current stock, or
+    initial_cover_days × its average daily demand over the warm-up.
+    """
+    end = end or date.today()
+    start = end - timedelta(days=days + FIT_DAYS)
+
+    medicines = db.query(Medicine.id, Medicine.stock).order_by(Medicine.id).all()
+    medicine_ids = [medicine_id for medicine_id, _ in medicines]
+
+    qty, orders = _daily_matrices(db, medicine_ids, start, end)
+
+    if initial_cover_days is None:
+        initial_stock = np.array([stock or 0 for _, stock in medicines], dtype=np.float64)
+    else:
+        initial_stock = np.floor(qty[:, :FIT_DAYS].mean(axis=1) * initial_cover_days)
+
+    return SimulationHistory(
+        medicine_ids=medicine_ids,
+        start=start,
+        qty=qty,
+        orders=orders,
+        initial_stock=initial_stock,
+        simulate_from=FIT_DAYS,
+    )
+
+
+def synthetic_history(skus: int = 10_000, days: int = 365, seed: int = 42) -> SimulationHistory:
+    """
+    Poisson demand with per-SKU rates, trend and weekly shape — for
+    benchmarking the engine without a database.
+    """
+    rng = np.random.default_rng(seed)
+    total_days = days + FIT_DAYS
+
+    rate = rng.gamma(1.5, 2.0, size=skus)
+    trend = 1 + rng.normal(0, 0.3, size=skus)[:, None] * np.linspace(0, 1, total_days)[None, :]
+    weekly = np.array([1.3, 1.1, 1.0, 1.0, 1.0, 0.8, 0.6])[np.arange(total_days) % 7]
+
+    orders = rng.poisson(np.clip(rate[:, None] * trend, 0, None) * weekly[None, :])
+    qty = orders * rng.integers(1, 4, size=skus)[:, None]
+
+    return SimulationHistory(
+        medicine_ids=list(range(1, skus + 1)),
+        start=date.today() - timedelta(days=total_days),
+        qty=qty.astype(np.float64),
+        orders=orders.astype(np.int64),
+        initial_stock=np.floor(rate * 30),
+        simulate_from=FIT_DAYS,
+    )
+
+
+# =====================================================
+# VECTORIZED DECISION RULES
+# =====================================================
+
+def priority_scores(days_until_depletion, avg_daily_consumption, current_stock,
+                    projected_30_day_demand, has_active_escalation) -> np.ndarray:
+    """calculate_priority() score, element-wise (CRITICAL ≥ 70, WARNING ≥ 40)."""
+    return (
+        np.where(days_until_depletion <= 3, 50, np.where(days_until_depletion <= 7, 30, 0))
+        + np.where(current_stock < projected_30_day_demand * 0.5, 25, 0)
+        + np.where(avg_daily_consumption > HIGH_VELOCITY_THRESHOLD, 15, 0)
+        + np.where(has_active_escalation, 20, 0)
+    )
+
+
+def restock_quantities(avg_daily_consumption, current_stock,
+                       safety_buffer_days: float = SAFETY_BUFFER_DAYS) -> np.ndarray:
+    """calculate_dynamic_restock_quantity(), element-wise."""
+    target_stock = avg_daily_consumption * 30 + avg_daily_consumption * safety_buffer_days
+    needed = np.maximum(target_stock - current_stock, MINIMUM_RESTOCK_FLOOR)
+
+    # np.round rounds half to even, like round()
+    needed = np.maximum(np.round(needed / 10.0) * 10, MINIMUM_RESTOCK_FLOOR)
+
+    return np.where(avg_daily_consumption <= 0, MINIMUM_RESTOCK_FLOOR, needed).astype(np.int64)
+
+
+def risk_scores(days_until_depletion, projected_30_day_demand, escalation_active,
+                coverage_ratio, acceleration_factor, recent_escalation_count) -> np.ndarray:
+    """compute_risk_score(), element-wise (coverage_ratio NaN = None)."""
+    score = (
+        np.select(
+            [days_until_depletion <= 3, days_until_depletion <= 7, days_until_depletion <= 14],
+            [50, 30, 15], 0
+        )
+        + np.select([projected_30_day_demand > 100, projected_30_day_demand > 50], [15, 10], 0)
+        + np.select([coverage_ratio < 0.5, coverage_ratio < 1.0, coverage_ratio < 1.5], [30, 20, 10], 0)
+        + np.select([acceleration_factor > 0.4, acceleration_factor > 0.2], [25, 15], 0)
+        + np.where(escalation_active, 20, 0)
+        + np.select([recent_escalation_count >= 4, recent_escalation_count >= 2], [30, 15], 0)
+    )
+    return np.minimum(score, 100)
+
+
+def instability_multipliers(recent_escalations, recent_orders) -> np.ndarray:
+    """calculate_instability_multiplier() multiplier, element-wise."""
+    instability = recent_escalations * 25 + np.where(recent_orders >= 20, 20, 0)
+    return np.select([instability <= 30, instability <= 60, instability <= 90], [1.0, 1.15, 1.30], 1.50)
+
+
+def mitigation_recommendations(risk_score, coverage_ratio, acceleration_factor,
+                               recent_escalation_count, multiplier) -> np.ndarray:
+    """
+    MitigationRecommendationService rules, element-wise. coverage_ratio
+    and acceleration_factor are the rounded snapshot values; a NaN
+    coverage ratio is the snapshot's None.
+    """
+    high = risk_score >= 70
+    medium = (risk_score >= 40) & ~high
+    accelerating = acceleration_factor > 0.3
+
+    recommendation = np.select(
+        [
+            high & (coverage_ratio < 0.5),
+            high & accelerating & (recent_escalation_count > 0),
+            high,
+            medium & (coverage_ratio < 0.75),
+            medium & accelerating,
+        ],
+        [RESTOCK_IMMEDIATE, SUPPLIER_ESCALATION, RESTOCK_IMMEDIATE, SAFETY_STOCK_INCREASE, SUPPLIER_ESCALATION],
+        MONITOR,
+    )
+
+    # STEP 41 — chronic instability escalates one level
+    escalated = np.select(
+        [recommendation == MONITOR, recommendation == SAFETY_STOCK_INCREASE],
+        [SAFETY_STOCK_INCREASE, RESTOCK_IMMEDIATE],
+        RESTOCK_IMMEDIATE,
+    )
+
+    return np.where(multiplier >= 1.3, escalated, recommendation)
+
+
+# =====================================================
+# ENGINE
+# =====================================================
+
+class InventorySimulation:
+    """
+    One run of a policy over a history. Each simulated day: deliveries
+    land, the day's demand is served from stock (unmet demand counts a
+    stockout day), then the scan cycle runs — inventory threshold scan
+    (escalation → restock signal), predictive demand scan and
+    autonomous mitigation — with `clock.today` as the scan date.
+    """
+
+    def __init__(self, history: SimulationHistory, policy: SimulationPolicy = None,
+                 clock: SimulationClock = None):
+        self.history = history
+        self.policy = policy or SimulationPolicy()
+
+        first_day = history.start + timedelta(days=history.simulate_from)
+        self.clock = clock or SimulationClock(first_day)
+
+        if history.simulate_from < max(FIT_DAYS, PREDICTIVE_WINDOW_DAYS + 1):
+            raise ValueError(f"History needs at least {FIT_DAYS} warm-up days before simulate_from")
+
+        if self.clock.today < first_day:
+            raise ValueError(f"Clock starts before the warm-up ends ({first_day})")
+
+        if self.policy.mode not in (AUTO, REVIEW, SAFE):
+            raise ValueError(f"Unknown mode {self.policy.mode!r}")
+
+    def run(self) -> dict:
+        started = time.perf_counter()
+
+        history, policy = self.history, self.policy
+        skus, total_days = history.qty.shape
+        end = history.start + timedelta(days=total_days)
+        first_day = self.clock.today
+        sim_days = max((end - first_day).days, 0)
+
+        # Day-major copy: one simulated day is one contiguous row
+        self._qty_days = np.ascontiguousarray(history.qty.T)
+
+        # Day-major cumulative sums: window [a, b) = cum[b] - cum[a]
+        self._qty_cum = np.vstack([np.zeros((1, skus)), np.cumsum(self._qty_days, axis=0)])
+        self._orders_cum = np.vstack([np.zeros((1, skus), dtype=np.int64), np.cumsum(history.orders.T, axis=0)])
+        self._escalations_cum = np.zeros((total_days + 1, skus), dtype=np.int32)
+
+        self.stock = history.initial_stock.astype(np.float64).copy()
+        self._arrivals = np.zeros((sim_days + policy.lead_time_days + 1, skus))
+        self._in_transit = np.zeros(skus)
+        self._last_escalated_stock = np.full(skus, np.nan)
+
+        self.totals = {
+            "stockout_days": 0,
+            "unmet_units": 0.0,
+            "demand_units": 0.0,
+            "inventory_held": 0.0,
+            "units_restocked": 0.0,
+            "units_queued": 0.0,
+            "reviews_created": 0,
+            "scan_passes": 0,
+        }
+        self.restocks = {source: 0 for source in RESTOCK_SOURCES}
+        stockout_skus = np.zeros(skus, dtype=bool)
+
+        for step in range(sim_days):
+            day = (self.clock.today - history.start).days
+            self._step = step
+
+            # ---------------- deliveries + demand ----------------
+            self.stock += self._arrivals[step]
+            self._in_transit -= self._arrivals[step]
+
+            demand = self._qty_days[day]
+            served = np.minimum(self.stock, demand)
+            unmet = demand - served
+            short = unmet > 0
+
+            self.stock -= served
+            self.totals["stockout_days"] += int(short.sum())
+            self.totals["unmet_units"] += float(unmet.sum())
+            self.totals["demand_units"] += float(demand.sum())
+            stockout_skus |= short
+
+            # ---------------- scan cycle ----------------
+            self._escalations_cum[day + 1] = self._escalations_cum[day]
+            forecast = self._forecast(day)
+            everything = np.ones(skus, dtype=bool)
+
+            restocked = (
+                self._inventory_scan(day, everything)
+                | self._demand_scan(day, forecast, everything)
+                | self._mitigation_scan(day)
+            )
+            passes = 1
+
+            # StockChanged → inventory re-check for SKUs whose stock
+            # changed today (restocks in transit or queued change none)
+            while restocked.any() and passes < MAX_SCAN_PASSES_PER_DAY:
+                restocked = self._inventory_scan(day, restocked)
+                passes += 1
+
+            self.totals["scan_passes"] += passes
+
+            self.totals["inventory_held"] += float(self.stock.sum())
+            self.clock.advance()
+
+        sku_days = max(skus * sim_days, 1)
+
+        return {
+            "policy": asdict(policy),
+            "skus": skus,
+            "days": sim_days,
+            "start": str(first_day),
+            "stockout_days": self.totals["stockout_days"],
+            "stockout_rate": round(self.totals["stockout_days"] / sku_days, 5),
+            "skus_with_stockout": int(stockout_skus.sum()),
+            "unmet_units": round(self.totals["unmet_units"], 1),
+            "fill_rate": round(1 - self.totals["unmet_units"] / max(self.totals["demand_units"], 1), 5),
+            "restock_count": sum(self.restocks.values()),
+            "restocks_by_source": dict(self.restocks),
+            "units_restocked": round(self.totals["units_restocked"], 1),
+            "units_queued": round(self.totals["units_queued"], 1),
+            "avg_inventory_held": round(self.totals["inventory_held"] / sku_days, 2),
+            "reviews_created": self.totals["reviews_created"],
+            "scan_passes": self.totals["scan_passes"],
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+        }
+
+    # -------------------------------
+    # Windows (scan at end of `day`)
+    # -------------------------------
+    def _window(self, cum: np.ndarray, day: int, days_back: int, until_days_back: int = -1) -> np.ndarray:
+        # order_date >= today - days_back (and < today - until_days_back)
+        return cum[day - until_days_back] - cum[day - days_back]
+
+    def _forecast(self, day: int) -> dict:
+        # forecast_demand fits on [today - FIT_DAYS, today)
+        window = self._qty_days[day - FIT_DAYS:day].T
+        projected = forecast_matrix(window, PREDICTIVE_WINDOW_DAYS, self.policy.forecast_model).sum(axis=1)
+        return {"avg_daily": projected / PREDICTIVE_WINDOW_DAYS, "projected": projected}
+
+    # -------------------------------
+    # Restock dispatch (warehouse)
+    # -------------------------------
+    def _position(self) -> np.ndarray:
+        # On hand + in transit: a restock on its way is not requested again
+        return self.stock + self._in_transit
+
+    def _dispatch(self, mask: np.ndarray, quantity, source: str, queued: bool = False) -> np.ndarray:
+        """
+        Counts the restock requests in `mask` and delivers them, unless
+        they went to the undrained restock queue. Returns the SKUs whose
+        on-hand stock changed now (StockChanged).
+        """
+        count = int(mask.sum())
+        changed = np.zeros_like(mask)
+
+        if not count:
+            return changed
+
+        if self.policy.honor_restock_quantity:
+            units = np.where(mask, quantity, 0).astype(np.float64)
+        else:
+            units = np.where(mask, WAREHOUSE_RESTOCK_UNITS, 0).astype(np.float64)
+
+        self.restocks[source] += count
+
+        if queued and not self.policy.drain_restock_queue:
+            self.totals["units_queued"] += float(units.sum())
+            return changed
+
+        if self.policy.lead_time_days:
+            self._arrivals[self._step + self.policy.lead_time_days] += units
+            self._in_transit += units
+        else:
+            self.stock += units
+            changed = mask
+
+        self.totals["units_restocked"] += float(units.sum())
+        return changed
+
+    # -------------------------------
+    # STEP 32 — Inventory threshold scan
+    # -------------------------------
+    def _inventory_scan(self, day: int, candidates: np.ndarray) -> np.ndarray:
+        # No repeat escalation at the last escalated level; the restock
+        # signal (event bus) marks it triggered straight away, so none
+        # stays active
+        position = self._position()
+
+        escalate = (
+            candidates
+            & (position < self.policy.low_stock_threshold)
+            & (position != self._last_escalated_stock)
+        )
+
+        self._last_escalated_stock[escalate] = position[escalate]
+        self._escalations_cum[day + 1] += escalate
+
+        return self._dispatch(escalate, WAREHOUSE_RESTOCK_UNITS, "inventory_scan")
+
+    # -------------------------------
+    # STEP 33–36 + 66 — Predictive demand scan
+    # -------------------------------
+    def _demand_scan(self, day: int, forecast: dict, candidates: np.ndarray) -> np.ndarray:
+        total_quantity = self._window(self._qty_cum, day, PREDICTIVE_WINDOW_DAYS)
+        evaluated = candidates & (total_quantity > 0)
+
+        # Flat 30-day average when the model sees no demand
+        fallback = forecast["avg_daily"] <= 0
+        avg_daily = np.where(fallback, total_quantity / PREDICTIVE_WINDOW_DAYS, forecast["avg_daily"])
+        projected = np.where(fallback, avg_daily * 30, forecast["projected"])
+
+        evaluated &= avg_daily > 0
+        safe_avg = np.where(evaluated, avg_daily, 1.0)
+        position = self._position()
+        days_until_depletion = position / safe_avg
+
+        priority = priority_scores(days_until_depletion, safe_avg, position, projected, False)
+
+        trigger = evaluated & (
+            (days_until_depletion < self.policy.predictive_depletion_threshold_days)
+            | (priority >= 70)
+        )
+
+        quantity = restock_quantities(safe_avg, position, self.policy.safety_buffer_days)
+
+        # STEP 36 — enqueue_restock(): the load balancer queue
+        return self._dispatch(trigger, quantity, "demand_scan", queued=True)
+
+    # -------------------------------
+    # STEP 38–43 — Autonomous mitigation
+    # -------------------------------
+    def _mitigation_scan(self, day: int) -> np.ndarray:
+        total_quantity = self._window(self._qty_cum, day, PREDICTIVE_WINDOW_DAYS)
+        evaluated = total_quantity > 0
+
+        if self.policy.mode == SAFE:
+            return np.zeros_like(evaluated)
+
+        if self.policy.mode == REVIEW:
+            # Every evaluated medicine becomes a pending review
+            self.totals["reviews_created"] += int(evaluated.sum())
+            return np.zeros_like(evaluated)
+
+        avg_daily = np.where(evaluated, total_quantity / PREDICTIVE_WINDOW_DAYS, 1.0)
+        position = self._position()
+        days_until_depletion = position / avg_daily
+        projected = avg_daily * 30
+        coverage_ratio = position / projected
+
+        recent = self._window(self._qty_cum, day, ACCELERATION_WINDOW_DAYS)
+        previous = self._window(self._qty_cum, day, 2 * ACCELERATION_WINDOW_DAYS, ACCELERATION_WINDOW_DAYS)
+        acceleration = np.where(previous > 0, (recent - previous) / np.where(previous > 0, previous, 1), 0.0)
+
+        recent_escalations = self._window(self._escalations_cum, day, ESCALATION_WINDOW_DAYS)
+
+        risk = risk_scores(days_until_depletion, projected, False, coverage_ratio,
+                           acceleration, recent_escalations)
+
+        multiplier = instability_multipliers(
+            self._window(self._escalations_cum, day, LOOKBACK_DAYS),
+            self._window(self._orders_cum, day, LOOKBACK_DAYS),
+        )
+
+        # The snapshot rounds these, and reports a 0 ratio as None
+        snapshot_coverage = np.where(coverage_ratio == 0, np.nan, np.round(coverage_ratio, 2))
+        snapshot_acceleration = np.round(acceleration, 3)
+
+        recommendation = mitigation_recommendations(
+            risk, snapshot_coverage, snapshot_acceleration, recent_escalations, multiplier
+        )
+
+        threshold = self.policy.safe_auto_threshold
+
+        execute = evaluated & (risk >= threshold) & (
+            (recommendation == RESTOCK_IMMEDIATE)
+            | ((recommendation == SAFETY_STOCK_INCREASE) & (snapshot_acceleration > 0.3))
+        )
+
+        quantity = (restock_quantities(avg_daily, position, self.policy.safety_buffer_days)
+                    * multiplier).astype(np.int64)
+
+        return self._dispatch(execute, quantity, "mitigation")
+
+
+def run_simulation(history: SimulationHistory, policy: SimulationPolicy = None,
+                   clock: SimulationClock = None) -> dict:
+    return InventorySimulation(history, policy, clock).run()
@@ -0,0 +1,398 @@
+# backend/app/services/medicine_search_service.py
+# STEP 51 — Indexed Fuzzy Medicine Name Search
+# In-memory token + trigram index over medicines.name.
+# Replaces the un-indexable ILIKE '%name%' scans in the agent tools.
+
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from ..models.medicine import Medicine
+
+
+MIN_MATCH_SCORE = 0.3
+FUZZY_TOKEN_THRESHOLD = 0.35
+PENDING_KEY = "medicine_index_pending"
+
+
+# =====================================================
+# NORMALIZATION
+# =====================================================
+
+def normalize_name(name: str) -> str:
+    """
+    Lowercase, strip accents and trademark symbols,
+    collapse punctuation to single spaces.
+    """
+    if not name:
+        return ""
+
+    text = unicodedata.normalize("NFKD", str(name))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"[^0-9a-z]+", " ", text.lower())
+    return text.strip()
+
+
+def tokenize(name: str) -> list:
+    return normalize_name(name).split()
+
+
+def trigrams(text: str) -> set:
+    """
+    pg_trgm style trigrams: each token padded with two leading
+    spaces and one trailing space.
+    """
+    grams = set()
+    for token in text.split():
+        padded = f"  {token} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+# =====================================================
+# INDEX
+# =====================================================
+
+class MedicineNameIndex:
+    """
+    Thread-safe in-memory name index.
+
+    Two layers:
+    - token postings: normalized token -> medicine ids
+    - vocabulary trigrams: trigram -> tokens (typo tolerance)
+
+    Query tokens are expanded against the (small) vocabulary first,
+    candidates are the intersection of their posting sets, and only
+    those candidates are scored.
+
+    - Built lazily from the medicines table on first use
+    - Updated incrementally from ORM commits (see listeners below)
+    - refresh() catches up rows inserted outside the ORM
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._max_id = 0
+        self._names = {}
+        self._normalized = {}
+        self._grams = {}
+        self._tokens = {}
+        self._exact = defaultdict(set)
+        self._token_postings = defaultdict(set)
+        self._vocab_grams = defaultdict(set)
+        self._vocab_gram_count = {}
+        self._sorted_vocab = []
+        self._vocab_dirty = False
+
+    # -----------------------------------------------
+    # Maintenance
+    # -----------------------------------------------
+
+    def add(self, medicine_id: int, name: str):
+        with self._lock:
+            if medicine_id in self._names:
+                self._remove_unlocked(medicine_id)
+
+            normalized = normalize_name(name)
+            tokens = set(normalized.split())
+
+            self._names[medicine_id] = name
+            self._normalized[medicine_id] = normalized
+            self._grams[medicine_id] = trigrams(normalized)
+            self._tokens[medicine_id] = tokens
+            self._exact[normalized].add(medicine_id)
+
+            for token in tokens:
+                if token not in self._token_postings:
+                    token_grams = trigrams(token)
+                    for gram in token_grams:
+                        self._vocab_grams[gram].add(token)
+                    self._vocab_gram_count[token] = len(token_grams)
+                    self._vocab_dirty = True
+                self._token_postings[token].add(medicine_id)
+
+            self._max_id = max(self._max_id, medicine_id)
+
+    def remove(self, medicine_id: int):
+        with self._lock:
+            self._remove_unlocked(medicine_id)
+
+    def _remove_unlocked(self, medicine_id: int):
+        if medicine_id not in self._names:
+            return
+
+        normalized = self._normalized.pop(medicine_id)
+        self._exact[normalized].discard(medicine_id)
+        if not self._exact[normalized]:
+            del self._exact[normalized]
+
+        for token in self._tokens.pop(medicine_id):
+            postings = self._token_postings[token]
+            postings.discard(medicine_id)
+            if not postings:
+                del self._token_postings[token]
+                del self._vocab_gram_count[token]
+                for gram in trigrams(token):
+                    self._vocab_grams[gram].discard(token)
+                    if not self._vocab_grams[gram]:
+                        del self._vocab_grams[gram]
+                self._vocab_dirty = True
+
+        del self._names[medicine_id]
+        del self._grams[medicine_id]
+
+    def build(self, rows):
+        """
+        Replaces the index contents with (id, name) rows.
+        """
+        with self._lock:
+            self._names.clear()
+            self._normalized.clear()
+            self._grams.clear()
+            self._tokens.clear()
+            self._exact.clear()
+            self._token_postings.clear()
+            self._vocab_grams.clear()
+            self._vocab_gram_count.clear()
+            self._max_id = 0
+
+            for medicine_id, name in rows:
+                self.add(medicine_id, name)
+
+            self._built = True
+
+    def ensure_built(self, db: Session):
+        if self._built:
+            return
+
+        with self._lock:
+            if not self._built:
+                self.build(db.query(Medicine.id, Medicine.name).all())
+
+    def refresh(self, db: Session) -> int:
+        """
+        Incremental catch-up: indexes medicines with id above the
+        highest id already indexed. Returns number of rows added.
+        """
+        if not self._built:
+            self.ensure_built(db)
+            return len(self._names)
+
+        rows = (
+            db.query(Medicine.id, Medicine.name)
+            .filter(Medicine.id > self._max_id)
+            .all()
+        )
+
+        for medicine_id, name in rows:
+            self.add(medicine_id, name)
+
+        return len(rows)
+
+    def invalidate(self):
+        with self._lock:
+            self._built = False
+
+    # -----------------------------------------------
+    # Lookup
+    # -----------------------------------------------
+
+    def __contains__(self, medicine_id: int) -> bool:
+        return medicine_id in self._names
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def name_of(self, medicine_id: int):
+        return self._names.get(medicine_id)
+
+    def _expand_token(self, query_token: str) -> dict:
+        """
+        Vocabulary tokens matching a query token, with weights:
+        exact 1.0, prefix 0.9, fuzzy = trigram similarity * 0.8.
+        Exact hits short-circuit; numbers (doses) never match fuzzily.
+        """
+        if query_token in self._token_postings:
+            return {query_token: 1.0}
+
+        if self._vocab_dirty:
+            self._sorted_vocab = sorted(self._token_postings)
+            self._vocab_dirty = False
+
+        expansions = {}
+
+        i = bisect_left(self._sorted_vocab, query_token)
+        while i < len(self._sorted_vocab) and self._sorted_vocab[i].startswith(query_token):
+            expansions[self._sorted_vocab[i]] = 0.9
+            i += 1
+
+        if expansions or query_token.isdigit():
+            return expansions
+
+        query_grams = trigrams(query_token)
+        shared = defaultdict(int)
+        for gram in query_grams:
+            for token in self._vocab_grams.get(gram, ()):
+                shared[token] += 1
+
+        for token, count in shared.items():
+            similarity = count / (len(query_grams) + self._vocab_gram_count[token] - count)
+            if similarity >= FUZZY_TOKEN_THRESHOLD:
+                expansions[token] = round(similarity * 0.8, 4)
+
+        return expansions
+
+    def search(self, query: str, limit: int = 5, min_score: float = MIN_MATCH_SCORE) -> list:
+        """
+        Ranked fuzzy search.
+
+        Score = mean over query tokens of the best match weight in
+        the name; ties go to the shorter (closer) name.
+        Exact normalized matches always score 1.0.
+        """
+        normalized_query = normalize_name(query)
+        if not normalized_query:
+            return []
+
+        query_tokens = list(dict.fromkeys(normalized_query.split()))
+
+        with self._lock:
+            expansions = [self._expand_token(token) for token in query_tokens]
+
+            posting_sets = []
+            for expansion in expansions:
+                ids = set()
+                for token in expansion:
+                    ids |= self._token_postings[token]
+                posting_sets.append(ids)
+
+            matched = [ids for ids in posting_sets if ids]
+            if not matched:
+                return []
+
+            # All tokens must match; otherwise fall back to any token
+            candidates = set.intersection(*matched) if len(matched) == len(posting_sets) else set()
+            if not candidates:
+                candidates = set.union(*matched)
+
+            scores = dict.fromkeys(candidates, 0.0)
+
+            for expansion in expansions:
+                assigned = set()
+                for token, weight in sorted(expansion.items(), key=lambda item: -item[1]):
+                    hits = (self._token_postings[token] & candidates) - assigned
+                    for medicine_id in hits:
+                        scores[medicine_id] += weight
+                    assigned |= hits
+
+            token_count = len(expansions)
+            exact_ids = self._exact.get(normalized_query, ())
+
+            results = []
+            for medicine_id, total in scores.items():
+                if medicine_id in exact_ids:
+                    score = 1.0
+                else:
+                    score = min(0.99, total / token_count)
+
+                if score >= min_score:
+                    results.append((score, medicine_id))
+
+            top = heapq.nsmallest(
+                limit,
+                results,
+                key=lambda item: (-item[0], len(self._names[item[1]]), item[1]),
+            )
+
+            return [
+                {
+                    "medicine_id": medicine_id,
+                    "name": self._names[medicine_id],
+                    "score": round(score, 4),
+                }
+                for score, medicine_id in top
+            ]
+
+
+medicine_index = MedicineNameIndex()
+
+
+# =====================================================
+# LOOKUP HELPERS (shared by agent tools + API)
+# =====================================================
+
+def search_medicines(db: Session, query: str, limit: int = 5) -> list:
+    medicine_index.ensure_built(db)
+    return medicine_index.search(query, limit=limit)
+
+
+def find_medicine(db: Session, query: str):
+    """
+    Returns the best matching Medicine row, or None.
+    Skips candidates that no longer exist in the database.
+    """
+    for candidate in search_medicines(db, query, limit=3):
+        medicine = db.query(Medicine).filter(
+            Medicine.id == candidate["medicine_id"]
+        ).first()
+
+        if medicine:
+            return medicine
+
+        medicine_index.remove(candidate["medicine_id"])
+
+    return None
+
+
+# =====================================================
+# INCREMENTAL SYNC — applied only after commit
+# =====================================================
+
+def _queue_change(target, op: str):
+    session = object_session(target)
+    if session is None:
+        return
+    session.info.setdefault(PENDING_KEY, []).append((op, target.id, target.name))
+
+
+@event.listens_for(Medicine, "after_insert")
+def _medicine_inserted(mapper, connection, target):
+    _queue_change(target, "add")
+
+
+@event.listens_for(Medicine, "after_update")
+def _medicine_updated(mapper, connection, target):
+    # Stock updates are frequent — only re-index on rename
+    if inspect(target).attrs.name.history.has_changes():
+        _queue_change(target, "add")
+
+
+@event.listens_for(Medicine, "after_delete")
+def _medicine_deleted(mapper, connection, target):
+    _queue_change(target, "remove")
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_changes(session):
+    pending = session.info.pop(PENDING_KEY, None)
+    if not pending or not medicine_index._built:
+        return
+
+    for op, medicine_id, name in pending:
+        if op == "add":
+            medicine_index.add(medicine_id, name)
+        else:
+            medicine_index.remove(medicine_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_changes(session):
+    session.info.pop(PENDING_KEY, None)
@@ -1,21 +1,21 @@
 # backend/app/services/mitigation_execution_service.py
 
 from sqlalchemy.orm import Session
-from datetime import datetime
-import json
 
 from ..core.database import SessionLocal
 from ..models.fulfillment_log import FulfillmentLog
-from ..models.mitigation_review import MitigationReview
 
 from .mitigation_service import MitigationRecommendationService
 from .explainability_service import get_medicine_risk_snapshot
-from .warehouse_service import trigger_fulfillment
+from .warehouse_service import trigger_bulk_restock, trigger_fulfillment
 from .self_healing_service import calculate_instability_multiplier
 from .system_governor_service import is_execution_allowed
 
+# STEP 70 — Deduplicated review queue
+from .mitigation_review_service import upsert_pending_review
+
 # STEP 44 — Structured Audit
-from backend.app.services.audit_service import create_audit_log
+from backend.app.services.audit_service import build_audit_log, create_audit_log
 
 
 SAFE_AUTO_THRESHOLD = 80
@@ -154,7 +154,7 @@ def execute_mitigation_if_safe(medicine_id: int):
         # -----------------------------------------------
         if final_mode == "REVIEW" or reason == "REVIEW_MODE_ACTIVE":
 
-            review_id = _create_review_record(
+            review_id, created = _create_review_record(
                 db=db,
                 medicine_id=medicine_id,
                 risk_score=risk_score,
@@ -162,26 +162,30 @@ def execute_mitigation_if_safe(medicine_id: int):
                 quantity=final_quantity
             )
 
-            create_audit_log(
-                db=db,
-                event_type="REVIEW_CREATED",
-                actor="system",
-                mode_at_time=final_mode,
-                decision="pending",
-                risk_score=risk_score,
-                reference_id=review_id,
-                reference_table="mitigation_reviews",
-            )
-
-            _log_execution(
-                db,
-                status="PENDING_REVIEW_CREATED",
-                message=f"Mitigation queued for review. Review ID: {review_id}"
-            )
+            # STEP 70 — Re-proposals update the pending review in place;
+            # only a new queue entry is audited
+            if created:
+                create_audit_log(
+                    db=db,
+                    event_type="REVIEW_CREATED",
+                    actor="system",
+                    mode_at_time=final_mode,
+                    decision="pending",
+                    risk_score=risk_score,
+                    reference_id=review_id,
+                    reference_table="mitigation_reviews",
+                )
+
+                _log_execution(
+                    db,
+                    status="PENDING_REVIEW_CREATED",
+                    message=f"Mitigation queued for review. Review ID: {review_id}"
+                )
 
             return {
                 "status": "pending_review",
-                "review_id": review_id
+                "review_id": review_id,
+                "superseded": not created
             }
 
         # ---------------- AUTO MODE ----------------
@@ -218,7 +222,10 @@ def execute_mitigation_if_safe(medicine_id: int):
 # =====================================================
 
 def _create_review_record(db: Session, medicine_id: int, risk_score: int, action: str, quantity: int):
-
+    """
+    STEP 70 — Upserts the medicine's single pending review.
+    Returns (review_id, created).
+    """
     payload = {
         "medicine_id": medicine_id,
         "action": action,
@@ -226,48 +233,77 @@ def _create_review_record(db: Session, medicine_id: int, risk_score: int, action
         "risk_score": risk_score
     }
 
-    review = MitigationReview(
-        mitigation_id=medicine_id,
+    return upsert_pending_review(
+        db,
+        medicine_id=medicine_id,
         risk_score=risk_score,
-        action_type=action,
-        payload=json.dumps(payload),
-        status="pending",
-        created_at=datetime.utcnow()
+        action=action,
+        payload=payload
     )
 
-    db.add(review)
-    db.commit()
-    db.refresh(review)
-
-    return review.id
-
 
 # =====================================================
-# EXECUTE FROM STORED PAYLOAD (ADMIN APPROVAL PATH)
+# BULK EXECUTION FROM STORED PAYLOADS (STEP 71)
 # =====================================================
 
-def execute_mitigation_from_payload(payload: dict):
+def execute_mitigations_from_payloads(payloads: list) -> list:
     """
-    Used ONLY after admin approval.
-    Deterministic execution from stored snapshot.
+    Executes approved review payloads (admin approval path, run by the
+    mitigation job queue): the same per-action rules as the autonomous
+    path, one warehouse restock call for every executed restock, and
+    one commit for their logs and audits.
+    Returns one result per payload, in order; restocks the warehouse
+    could not be reached for come back as status "failed".
     """
+    if not payloads:
+        return []
 
     db: Session = SessionLocal()
 
     try:
-        result = _execute_action(
-            db=db,
-            medicine_id=payload["medicine_id"],
-            action=payload["action"],
-            risk_snapshot={},
-            final_quantity=payload["quantity"],
-            risk_score=payload.get("risk_score", 0)
-        )
+        results = [
+            _plan_action(
+                action=payload["action"],
+                risk_snapshot={},
+                final_quantity=payload["quantity"],
+                risk_score=payload.get("risk_score", 0)
+            )
+            for payload in payloads
+        ]
 
-        # 🔥 ADD THIS — Audit execution in REVIEW flow
-        if result.get("status") == "executed":
-            create_audit_log(
-                db=db,
+        executed = [
+            (payload, result)
+            for payload, result in zip(payloads, results)
+            if result.get("status") == "executed"
+        ]
+
+        if not executed:
+            return results
+
+        warehouse = trigger_bulk_restock([payload["medicine_id"] for payload, _ in executed])
+
+        # STEP 72 — A failed warehouse call executes nothing: report it
+        # so the execution job can retry, and write no logs or audits
+        if "error" in warehouse:
+            for _, result in executed:
+                result.update({"status": "failed", "error": warehouse["error"]})
+            return results
+
+        missing = set(warehouse.get("missing", []))
+
+        for payload, result in executed:
+            result["warehouse"] = "missing" if payload["medicine_id"] in missing else "restocked"
+
+        db.add_all([
+            FulfillmentLog(
+                order_id=None,
+                status="AUTO_EXECUTED",
+                message=f"{result['action']} executed with adaptive qty {result['quantity']}"
+            )
+            for _, result in executed
+        ])
+        db.add_all([
+            build_audit_log(
                 event_type="MITIGATION_EXECUTED",
                 actor="system",
                 mode_at_time="REVIEW",
@@ -276,8 +312,11 @@ def execute_mitigation_from_payload(payload: dict):
                 reference_id=payload["medicine_id"],
                 reference_table="medicines",
             )
+            for payload, _ in executed
+        ])
+        db.commit()
 
-        return result
+        return results
 
     finally:
         db.close()
@@ -287,24 +326,14 @@ def execute_mitigation_from_payload(payload: dict):
 # INTERNAL EXECUTION ENGINE
 # =====================================================
 
-def _execute_action(db: Session, medicine_id: int, action: str,
-                    risk_snapshot: dict, final_quantity: int, risk_score: int):
-
+def _plan_action(action: str, risk_snapshot: dict, final_quantity: int, risk_score: int):
+    """
+    Decides the outcome of an action without side effects. STEP 71 —
+    shared by the single and bulk execution paths.
+    """
     if action == "RESTOCK_IMMEDIATE":
 
         if risk_score >= SAFE_AUTO_THRESHOLD:
-
-            trigger_fulfillment(
-                medicine_id=medicine_id,
-                quantity=final_quantity
-            )
-
-            _log_execution(
-                db,
-                status="AUTO_EXECUTED",
-                message=f"RESTOCK_IMMEDIATE executed with adaptive qty {final_quantity}"
-            )
-
             return {
                 "status": "executed",
                 "action": action,
@@ -316,18 +345,6 @@ def _execute_action(db: Session, medicine_id: int, action: str,
     elif action == "SAFETY_STOCK_INCREASE":
 
         if risk_snapshot.get("acceleration_factor", 0) > 0.3:
-
-            trigger_fulfillment(
-                medicine_id=medicine_id,
-                quantity=final_quantity
-            )
-
-            _log_execution(
-                db,
-                status="AUTO_EXECUTED",
-                message=f"SAFETY_STOCK_INCREASE executed with adaptive qty {final_quantity}"
-            )
-
             return {
                 "status": "executed",
                 "action": action,
@@ -342,6 +359,27 @@ def _execute_action(db: Session, medicine_id: int, action: str,
     return {"status": "no_action"}
 
 
+def _execute_action(db: Session, medicine_id: int, action: str,
+                    risk_snapshot: dict, final_quantity: int, risk_score: int):
+
+    result = _plan_action(action, risk_snapshot, final_quantity, risk_score)
+
+    if result.get("status") == "executed":
+
+        trigger_fulfillment(
+            medicine_id=medicine_id,
+            quantity=final_quantity
+        )
+
+        _log_execution(
+            db,
+            status="AUTO_EXECUTED",
+            message=f"{action} executed with adaptive qty {final_quantity}"
+        )
+
+    return result
+
+
 # =====================================================
 # FULFILLMENT LOG
 # =====================================================
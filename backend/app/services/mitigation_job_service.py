@@ -0,0 +1,226 @@
+# backend/app/services/mitigation_job_service.py
+# STEP 72 — Background Execution of Approved Mitigations
+# Approving reviews commits the decision together with a queued
+# MitigationJob and returns at once; the job runs on a small thread pool
+# instead of inside the request. Execution calls the warehouse over
+# HTTP on this same server, so inside the request a single worker would
+# block on its own call until the timeout.
+# A worker claims a job with a conditional UPDATE (queued → running), so
+# submitting it twice runs it once. Failed attempts are re-queued with
+# backoff up to max_attempts. The scheduler's recovery sweep submits due
+# retries, jobs left queued by a restart, and jobs stuck running after a
+# worker died. Delivery is at-least-once: a warehouse call that timed
+# out after succeeding is retried.
+
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from ..core.database import SessionLocal
+from ..models.mitigation_job import MitigationJob
+from .mitigation_execution_service import execute_mitigations_from_payloads
+
+
+logger = logging.getLogger("pharmaagentx.mitigation_jobs")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+MAX_WORKERS = int(os.getenv("MITIGATION_JOB_WORKERS", "2"))
+RETRY_BACKOFF_SECONDS = (30, 120, 600)
+RUNNING_TIMEOUT_SECONDS = 300
+
+
+# =====================================================
+# ONE ATTEMPT
+# =====================================================
+
+def _retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=RETRY_BACKOFF_SECONDS[min(attempts, len(RETRY_BACKOFF_SECONDS)) - 1])
+
+
+def run_job(job_id: int):
+    """
+    Claims the job and runs one attempt. Returns the job's status
+    afterwards, or None when it was not claimable (running elsewhere,
+    finished, or a retry that is not due yet).
+    """
+    db: Session = SessionLocal()
+
+    try:
+        now = datetime.utcnow()
+
+        claimed = db.query(MitigationJob).filter(
+            MitigationJob.id == job_id,
+            MitigationJob.status == QUEUED,
+            MitigationJob.next_attempt_at <= now,
+        ).update({
+            MitigationJob.status: RUNNING,
+            MitigationJob.attempts: MitigationJob.attempts + 1,
+            MitigationJob.started_at: now,
+        }, synchronize_session=False)
+        db.commit()
+
+        if not claimed:
+            return None
+
+        job = db.query(MitigationJob).filter(MitigationJob.id == job_id).one()
+
+        try:
+            results = execute_mitigations_from_payloads(json.loads(job.payloads))
+            failures = [r["error"] for r in results if r.get("status") == "failed"]
+            error = failures[0] if failures else None
+            job.result = json.dumps(results)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+        finished = datetime.utcnow()
+        job.last_error = error
+
+        if error is None:
+            job.status = SUCCEEDED
+            job.finished_at = finished
+        elif job.attempts < job.max_attempts:
+            job.status = QUEUED
+            job.next_attempt_at = finished + _retry_delay(job.attempts)
+        else:
+            job.status = FAILED
+            job.finished_at = finished
+
+        db.commit()
+
+        if error is None:
+            logger.info(f"✅ Mitigation job {job_id} succeeded (attempt {job.attempts})")
+        else:
+            logger.warning(
+                f"⚠ Mitigation job {job_id} attempt {job.attempts}/{job.max_attempts} failed: {error}"
+            )
+
+        return job.status
+
+    finally:
+        db.close()
+
+
+# =====================================================
+# EXECUTION QUEUE
+# =====================================================
+
+class MitigationJobQueue:
+    """
+    In-process worker pool. submit() never blocks the caller; the job
+    row, not this queue, is the source of truth, so anything lost here
+    (restart, crash) is picked up by the recovery sweep.
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, job_id: int):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="mitigation-job"
+                )
+
+            return self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id: int):
+        try:
+            return run_job(job_id)
+        except Exception as e:
+            logger.error(f"❌ Mitigation job {job_id} could not run: {str(e)}")
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+job_queue = MitigationJobQueue()
+
+
+def submit_job(job_id: int):
+    if job_id is not None:
+        job_queue.submit(job_id)
+
+
+# =====================================================
+# RECOVERY SWEEP (scheduler)
+# =====================================================
+
+def recover_jobs(db: Session, now: datetime = None) -> dict:
+    """
+    Jobs running longer than RUNNING_TIMEOUT_SECONDS lost their worker:
+    they are re-queued, or failed when out of attempts. Returns the
+    abandoned count and the IDs of queued jobs that are due to run.
+    """
+    now = now or datetime.utcnow()
+    message = "Worker stopped before the attempt finished"
+
+    abandoned = db.query(MitigationJob).filter(
+        MitigationJob.status == RUNNING,
+        MitigationJob.started_at < now - timedelta(seconds=RUNNING_TIMEOUT_SECONDS),
+    )
+
+    failed = abandoned.filter(MitigationJob.attempts >= MitigationJob.max_attempts).update({
+        MitigationJob.status: FAILED,
+        MitigationJob.last_error: message,
+        MitigationJob.finished_at: now,
+    }, synchronize_session=False)
+
+    requeued = abandoned.update({
+        MitigationJob.status: QUEUED,
+        MitigationJob.last_error: message,
+        MitigationJob.next_attempt_at: now,
+    }, synchronize_session=False)
+
+    db.commit()
+
+    due = [
+        job_id for (job_id,) in
+        db.query(MitigationJob.id)
+        .filter(MitigationJob.status == QUEUED, MitigationJob.next_attempt_at <= now)
+        .order_by(MitigationJob.id)
+        .all()
+    ]
+
+    return {"abandoned": failed + requeued, "due": due}
+
+
+# =====================================================
+# STATUS
+# =====================================================
+
+def serialize_job(job: MitigationJob) -> dict:
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "review_ids": json.loads(job.review_ids),
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "next_attempt_at": job.next_attempt_at if job.status == QUEUED else None,
+        "last_error": job.last_error,
+        "results": json.loads(job.result) if job.result else None,
+        "created_by": job.created_by,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at
+    }
+
+
+def get_job(db: Session, job_id: int):
+    job = db.query(MitigationJob).filter(MitigationJob.id == job_id).first()
+    return serialize_job(job) if job else None
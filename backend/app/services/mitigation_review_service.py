@@ -0,0 +1,338 @@
+# backend/app/services/mitigation_review_service.py
+# STEP 70 — Deduplicated Mitigation Review Queue
+# A medicine has at most one pending review: each REVIEW-mode run
+# upserts it (UPDATE first, INSERT when none exists; a partial unique
+# index on mitigation_id WHERE status = 'pending' settles races), so a
+# re-proposal supersedes the earlier action, quantity and risk in place.
+# Pending reviews nobody re-proposed within REVIEW_TTL_HOURS expire;
+# the mitigation job re-evaluates those medicines, so a review that
+# still applies comes back with a fresh risk snapshot.
+# The admin queue is read highest risk first with keyset pagination
+# over the (status, risk_score, id) index.
+# STEP 71 — decide_reviews() approves/rejects a batch of reviews in one
+# transaction. STEP 72 — the same transaction queues one execution job
+# for the approved payloads (mitigation_job_service runs it).
+
+import json
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, inspect, or_, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models.fulfillment_log import FulfillmentLog
+from ..models.mitigation_job import MitigationJob
+from ..models.mitigation_review import MitigationReview
+from .audit_service import build_audit_log
+
+
+logger = logging.getLogger("pharmaagentx.reviews")
+
+PENDING = "pending"
+EXPIRED = "expired"
+SUPERSEDED = "superseded"
+APPROVED = "approved"
+REJECTED = "rejected"
+
+REVIEW_TTL_HOURS = 24
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+# =====================================================
+# SETUP
+# =====================================================
+
+def ensure_mitigation_review_schema(engine: Engine):
+    """
+    Brings databases created before STEP 70 up to date: adds the
+    updated_at column, marks all but the newest pending review per
+    medicine superseded, then builds the queue indexes.
+    """
+    columns = {column["name"] for column in inspect(engine).get_columns(MitigationReview.__tablename__)}
+
+    with engine.begin() as conn:
+        if "updated_at" not in columns:
+            conn.execute(text("ALTER TABLE mitigation_reviews ADD COLUMN updated_at TIMESTAMP"))
+            conn.execute(text("UPDATE mitigation_reviews SET updated_at = created_at"))
+
+        superseded = conn.execute(text(
+            """
+            UPDATE mitigation_reviews SET status = :superseded
+            WHERE status = :pending AND id NOT IN (
+                SELECT MAX(id) FROM mitigation_reviews
+                WHERE status = :pending
+                GROUP BY mitigation_id
+            )
+            """
+        ), {"pending": PENDING, "superseded": SUPERSEDED}).rowcount
+
+    if superseded:
+        logger.info(f"Superseded {superseded} duplicate pending mitigation reviews")
+
+    for index in MitigationReview.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+
+# =====================================================
+# UPSERT
+# =====================================================
+
+def upsert_pending_review(db: Session, medicine_id: int, risk_score: int, action: str,
+                          payload: dict, now: datetime = None) -> tuple:
+    """
+    Returns (review_id, created). created is False when an existing
+    pending review for the medicine was superseded in place.
+    """
+    now = now or datetime.utcnow()
+
+    values = {
+        MitigationReview.risk_score: risk_score,
+        MitigationReview.action_type: action,
+        MitigationReview.payload: json.dumps(payload),
+        MitigationReview.updated_at: now,
+    }
+
+    def _pending():
+        return db.query(MitigationReview).filter(
+            MitigationReview.mitigation_id == medicine_id,
+            MitigationReview.status == PENDING,
+        )
+
+    created = False
+
+    if not _pending().update(values, synchronize_session=False):
+        try:
+            db.add(MitigationReview(
+                mitigation_id=medicine_id,
+                risk_score=risk_score,
+                action_type=action,
+                payload=json.dumps(payload),
+                status=PENDING,
+                created_at=now,
+                updated_at=now
+            ))
+            db.flush()
+            created = True
+        except IntegrityError:
+            # A concurrent run inserted it first — supersede that one
+            db.rollback()
+            _pending().update(values, synchronize_session=False)
+
+    db.commit()
+
+    review_id = _pending().with_entities(MitigationReview.id).scalar()
+    return review_id, created
+
+
+# =====================================================
+# EXPIRY
+# =====================================================
+
+def expire_stale_reviews(db: Session, ttl_hours: int = REVIEW_TTL_HOURS, now: datetime = None) -> set:
+    """
+    Pending reviews not re-proposed within ttl_hours no longer reflect
+    current risk; marks them expired. Returns their medicine ids.
+    """
+    now = now or datetime.utcnow()
+
+    stale = db.query(MitigationReview).filter(
+        MitigationReview.status == PENDING,
+        MitigationReview.updated_at < now - timedelta(hours=ttl_hours),
+    )
+
+    medicine_ids = {mid for (mid,) in stale.with_entities(MitigationReview.mitigation_id).all()}
+
+    if medicine_ids:
+        stale.update({MitigationReview.status: EXPIRED}, synchronize_session=False)
+        db.commit()
+
+    return medicine_ids
+
+
+# =====================================================
+# QUEUE
+# =====================================================
+
+def _encode_cursor(review: MitigationReview) -> str:
+    return f"{review.risk_score}:{review.id}"
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    try:
+        risk_score, review_id = cursor.split(":")
+        return int(risk_score), int(review_id)
+    except ValueError:
+        raise ValueError(f"Invalid cursor {cursor!r}")
+
+
+def serialize_review(review: MitigationReview) -> dict:
+    return {
+        "review_id": review.id,
+        "medicine_id": review.mitigation_id,
+        "risk_score": review.risk_score,
+        "action_type": review.action_type,
+        "payload": json.loads(review.payload),
+        "status": review.status,
+        "created_at": review.created_at,
+        "updated_at": review.updated_at
+    }
+
+
+def get_review_queue(db: Session, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE) -> dict:
+    """
+    One page of pending reviews, highest risk first (ties: newest
+    first).
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    query = db.query(MitigationReview).filter(MitigationReview.status == PENDING)
+
+    if cursor:
+        risk_score, review_id = _decode_cursor(cursor)
+        query = query.filter(or_(
+            MitigationReview.risk_score < risk_score,
+            and_(MitigationReview.risk_score == risk_score, MitigationReview.id < review_id),
+        ))
+
+    rows = (
+        query
+        .order_by(MitigationReview.risk_score.desc(), MitigationReview.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    page = rows[:limit]
+
+    return {
+        "items": [serialize_review(review) for review in page],
+        "next_cursor": _encode_cursor(page[-1]) if len(rows) > limit else None
+    }
+
+
+# =====================================================
+# BULK DECISIONS (STEP 71)
+# =====================================================
+
+_DECISIONS = {
+    APPROVED: ("REVIEW_APPROVED", "APPROVED_BY_ADMIN", "approved"),
+    REJECTED: ("REVIEW_REJECTED", "REJECTED_BY_ADMIN", "rejected"),
+}
+
+
+def decide_reviews(db: Session, approve_ids: list, reject_ids: list,
+                   reviewer_id: int, now: datetime = None) -> dict:
+    """
+    Approves and rejects pending reviews in a single transaction: status
+    updates, audit rows and fulfillment logs commit together or not at
+    all. IDs that are unknown or no longer pending are skipped.
+
+    Approved payloads are queued as one MitigationJob in the same
+    transaction; submit job_id to the execution queue after this returns.
+
+    Returns {"approved": [{"review_id", "payload"}], "rejected": [ids],
+    "skipped": [ids], "job_id": id or None}. Raises ValueError when an
+    ID is both approved and rejected, LookupError when another admin
+    decided one of the reviews in the meantime (nothing is written).
+    """
+    now = now or datetime.utcnow()
+
+    approve_ids, reject_ids = list(dict.fromkeys(approve_ids)), list(dict.fromkeys(reject_ids))
+
+    conflicting = set(approve_ids) & set(reject_ids)
+    if conflicting:
+        raise ValueError(f"Reviews both approved and rejected: {sorted(conflicting)}")
+
+    requested = {**{rid: APPROVED for rid in approve_ids}, **{rid: REJECTED for rid in reject_ids}}
+
+    if not requested:
+        return {"approved": [], "rejected": [], "skipped": [], "job_id": None}
+
+    pending = (
+        db.query(MitigationReview)
+        .filter(MitigationReview.id.in_(list(requested)), MitigationReview.status == PENDING)
+        .with_for_update()
+        .all()
+    )
+    by_id = {review.id: review for review in pending}
+
+    result = {
+        "approved": [],
+        "rejected": [],
+        "skipped": [rid for rid in requested if rid not in by_id],
+        "job_id": None
+    }
+
+    try:
+        for status, (event_type, log_status, decision) in _DECISIONS.items():
+            ids = [rid for rid, wanted in requested.items() if wanted == status and rid in by_id]
+
+            if not ids:
+                continue
+
+            updated = db.query(MitigationReview).filter(
+                MitigationReview.id.in_(ids),
+                MitigationReview.status == PENDING,
+            ).update({
+                MitigationReview.status: status,
+                MitigationReview.reviewed_by: reviewer_id,
+                MitigationReview.reviewed_at: now,
+                MitigationReview.updated_at: now,
+            }, synchronize_session=False)
+
+            if updated != len(ids):
+                raise LookupError("Some reviews were processed concurrently; retry the batch")
+
+            db.add_all([
+                build_audit_log(
+                    event_type=event_type,
+                    actor="admin",
+                    mode_at_time="REVIEW",
+                    decision=decision,
+                    risk_score=by_id[rid].risk_score,
+                    reference_id=rid,
+                    reference_table="mitigation_reviews",
+                )
+                for rid in ids
+            ])
+            db.add_all([
+                FulfillmentLog(
+                    order_id=None,
+                    status=log_status,
+                    message=f"Review {rid} {decision}"
+                )
+                for rid in ids
+            ])
+
+            if status == APPROVED:
+                result["approved"] = [
+                    {"review_id": rid, "payload": json.loads(by_id[rid].payload)} for rid in ids
+                ]
+
+                job = MitigationJob(
+                    status="queued",
+                    review_ids=json.dumps(ids),
+                    payloads=json.dumps([item["payload"] for item in result["approved"]]),
+                    created_by=reviewer_id,
+                    next_attempt_at=now,
+                    created_at=now
+                )
+                db.add(job)
+                db.flush()
+                result["job_id"] = job.id
+            else:
+                result["rejected"] = ids
+
+        db.commit()
+
+    except Exception:
+        db.rollback()
+        raise
+
+    logger.info(
+        "Bulk review by %s: %d approved, %d rejected, %d skipped",
+        reviewer_id, len(result["approved"]), len(result["rejected"]), len(result["skipped"])
+    )
+
+    return result
@@ -0,0 +1,398 @@
+# backend/app/services/order_column_store.py
+# STEP 65 — Memory-Mapped Columnar Order History
+# Full order history as flat int32 columns (medicine_id, patient_id,
+# day, qty) sorted by (medicine_id, day), plus an int64 offsets index:
+# rows of medicine m are [offsets[m], offsets[m + 1]). Analytics read
+# per-medicine slices of the memmaps with zero copy.
+#
+# New orders are appended to an unsorted delta segment (refresh); once
+# the delta grows past COMPACT_RATIO of the main segment it is merged
+# back into sorted order (compaction). Order edits and deletes are not
+# tracked — run a full export after history rewrites.
+
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import date
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+
+from ..models.order import Order
+
+
+logger = logging.getLogger("pharmaagentx.order_store")
+
+DEFAULT_STORE_DIR = os.getenv("ORDER_STORE_DIR", "./order_store")
+DEFAULT_CHUNK_ROWS = 500_000
+COMPACT_RATIO = 0.10
+STORE_VERSION = 1
+
+COLUMNS = ("medicine_id", "patient_id", "day", "qty")
+COLUMN_DTYPE = np.int32
+OFFSETS_FILE = "offsets.i64"
+META_FILE = "meta.json"
+
+EPOCH = date(1970, 1, 1)
+
+
+def to_day(value: date) -> int:
+    """Days since 1970-01-01 (the store's `day` column)."""
+    return (value - EPOCH).days
+
+
+def _column_file(directory: str, column: str, segment: str = "main") -> str:
+    return os.path.join(directory, f"{segment}.{column}.i32")
+
+
+def _dates_to_days(values) -> np.ndarray:
+    return np.array(values, dtype="datetime64[D]").astype(COLUMN_DTYPE)
+
+
+def _meta_stamp(meta_path: str):
+    """(inode, mtime) of meta.json — it is only ever swapped in with os.replace."""
+    try:
+        stat = os.stat(meta_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+# =====================================================
+# READ SIDE
+# =====================================================
+
+class OrderColumnStore:
+    """
+    Read-only view of an exported store. Open once and share: the
+    memmaps are backed by the OS page cache, not the Python heap.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+        meta_path = os.path.join(directory, META_FILE)
+        self.meta_stamp = _meta_stamp(meta_path)
+
+        with open(meta_path) as f:
+            self.meta = json.load(f)
+
+        if self.meta.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported order store version: {self.meta.get('version')}")
+
+        self.rows = self.meta["rows"]
+        self.delta_rows = self.meta["delta_rows"]
+        self.last_order_id = self.meta["last_order_id"]
+
+        self.main = {c: self._map(_column_file(directory, c), self.rows) for c in COLUMNS}
+        self.offsets = np.memmap(os.path.join(directory, OFFSETS_FILE), dtype=np.int64, mode="r")
+
+        # Delta is small by construction (≤ COMPACT_RATIO of main): load it
+        self.delta = {
+            c: np.fromfile(_column_file(directory, c, "delta"), dtype=COLUMN_DTYPE, count=self.delta_rows)
+            if self.delta_rows else np.empty(0, dtype=COLUMN_DTYPE)
+            for c in COLUMNS
+        }
+
+    @staticmethod
+    def _map(path: str, rows: int):
+        if rows == 0:
+            return np.empty(0, dtype=COLUMN_DTYPE)
+        return np.memmap(path, dtype=COLUMN_DTYPE, mode="r", shape=(rows,))
+
+    # -------------------------------
+    # Slices
+    # -------------------------------
+    def medicine_ids(self) -> np.ndarray:
+        """Medicine ids with at least one order in the main segment."""
+        return np.flatnonzero(np.diff(self.offsets))
+
+    def medicine_slice(self, medicine_id: int) -> dict:
+        """
+        Zero-copy views of the main segment for one medicine, sorted by
+        day. Does not include delta rows (see medicine_columns).
+        """
+        if medicine_id < 0 or medicine_id + 1 >= len(self.offsets):
+            return {c: self.main[c][0:0] for c in COLUMNS}
+
+        start, end = int(self.offsets[medicine_id]), int(self.offsets[medicine_id + 1])
+        return {c: self.main[c][start:end] for c in COLUMNS}
+
+    def medicine_columns(self, medicine_id: int) -> dict:
+        """
+        Main slice plus any not-yet-compacted delta rows, sorted by day.
+        Zero copy when the medicine has no delta rows.
+        """
+        main = self.medicine_slice(medicine_id)
+
+        if not self.delta_rows:
+            return main
+
+        mask = self.delta["medicine_id"] == medicine_id
+        if not mask.any():
+            return main
+
+        order = None
+        merged = {}
+        for c in COLUMNS:
+            merged[c] = np.concatenate([main[c], self.delta[c][mask]])
+            if c == "day":
+                order = np.argsort(merged[c], kind="stable")
+
+        return {c: merged[c][order] for c in COLUMNS}
+
+    # -------------------------------
+    # Window helpers
+    # -------------------------------
+    def window_quantity(self, medicine_id: int, start: date, end: date = None) -> int:
+        """SUM(qty) for start <= day < end, by binary search on the day slice."""
+        cols = self.medicine_columns(medicine_id)
+        days = cols["day"]
+
+        lo = np.searchsorted(days, to_day(start), side="left")
+        hi = len(days) if end is None else np.searchsorted(days, to_day(end), side="left")
+
+        return int(cols["qty"][lo:hi].sum(dtype=np.int64))
+
+    def daily_series(self, medicine_id: int, start: date, end: date) -> np.ndarray:
+        """Quantity per day for start <= day < end (zeros on days without orders)."""
+        cols = self.medicine_columns(medicine_id)
+        first, last = to_day(start), to_day(end)
+
+        lo = np.searchsorted(cols["day"], first, side="left")
+        hi = np.searchsorted(cols["day"], last, side="left")
+
+        return np.bincount(
+            cols["day"][lo:hi] - first,
+            weights=cols["qty"][lo:hi],
+            minlength=max(last - first, 0),
+        ).astype(np.int64)
+
+
+# =====================================================
+# WRITE SIDE
+# =====================================================
+
+def _write_meta(directory: str, **meta):
+    tmp = os.path.join(directory, META_FILE + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump({"version": STORE_VERSION, **meta}, f, indent=2)
+    os.replace(tmp, os.path.join(directory, META_FILE))
+
+
+def _read_meta(directory: str) -> dict:
+    with open(os.path.join(directory, META_FILE)) as f:
+        return json.load(f)
+
+
+def _write_offsets(directory: str, medicine_ids: np.ndarray, max_medicine_id: int):
+    counts = np.bincount(medicine_ids, minlength=max_medicine_id + 1)
+    offsets = np.zeros(max_medicine_id + 2, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    offsets.tofile(os.path.join(directory, OFFSETS_FILE))
+
+
+def export_order_store(engine: Engine, directory: str = DEFAULT_STORE_DIR,
+                       chunk_rows: int = DEFAULT_CHUNK_ROWS) -> dict:
+    """
+    Full export. Streams orders sorted by (medicine_id, order_date, id)
+    straight into preallocated memmaps, so memory stays at one chunk.
+    Built in a temp directory and swapped in at the end; readers of the
+    previous store keep their mapping.
+    """
+    with engine.connect() as conn:
+        rows, max_medicine_id, last_order_id = conn.execute(
+            select(func.count(Order.id), func.max(Order.medicine_id), func.max(Order.id))
+        ).one()
+
+    rows, max_medicine_id, last_order_id = rows or 0, max_medicine_id or 0, last_order_id or 0
+
+    build = directory.rstrip("/") + ".building"
+    shutil.rmtree(build, ignore_errors=True)
+    os.makedirs(build)
+
+    columns = {
+        c: np.memmap(_column_file(build, c), dtype=COLUMN_DTYPE, mode="w+", shape=(rows,))
+        for c in COLUMNS
+    } if rows else {}
+
+    counts = np.zeros(max_medicine_id + 1, dtype=np.int64)
+    written = 0
+
+    query = (
+        select(Order.medicine_id, Order.patient_id, Order.order_date, Order.quantity)
+        .where(Order.id <= last_order_id)
+        .order_by(Order.medicine_id, Order.order_date, Order.id)
+    )
+
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True).execute(query)
+
+        while True:
+            chunk = result.fetchmany(chunk_rows)
+            if not chunk:
+                break
+
+            medicine_ids, patient_ids, order_dates, quantities = zip(*chunk)
+            n = len(chunk)
+            window = slice(written, written + n)
+
+            columns["medicine_id"][window] = medicine_ids
+            columns["patient_id"][window] = patient_ids
+            columns["day"][window] = _dates_to_days(order_dates)
+            columns["qty"][window] = quantities
+
+            counts += np.bincount(np.asarray(medicine_ids), minlength=max_medicine_id + 1)
+            written += n
+
+    for column in columns.values():
+        column.flush()
+    del columns
+
+    offsets = np.zeros(max_medicine_id + 2, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    offsets.tofile(os.path.join(build, OFFSETS_FILE))
+
+    for c in COLUMNS:
+        open(_column_file(build, c, "delta"), "wb").close()
+        if not written:
+            open(_column_file(build, c), "wb").close()
+
+    _write_meta(build, rows=written, delta_rows=0, last_order_id=last_order_id,
+                max_medicine_id=max_medicine_id)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(build, directory)
+    invalidate_order_store()
+
+    logger.info(f"📦 Order store exported: {written} rows → {directory}")
+    return {"rows": written, "delta_rows": 0, "last_order_id": last_order_id, "compacted": False}
+
+
+def refresh_order_store(engine: Engine, directory: str = DEFAULT_STORE_DIR,
+                        chunk_rows: int = DEFAULT_CHUNK_ROWS) -> dict:
+    """
+    Appends orders with id > last_order_id to the delta segment, then
+    compacts if the delta outgrew COMPACT_RATIO of the main segment.
+    Falls back to a full export when no store exists yet.
+    """
+    if not os.path.exists(os.path.join(directory, META_FILE)):
+        return export_order_store(engine, directory, chunk_rows)
+
+    meta = _read_meta(directory)
+    last_order_id = meta["last_order_id"]
+    delta_rows = meta["delta_rows"]
+    max_medicine_id = meta["max_medicine_id"]
+
+    query = (
+        select(Order.id, Order.medicine_id, Order.patient_id, Order.order_date, Order.quantity)
+        .where(Order.id > last_order_id)
+        .order_by(Order.id)
+    )
+
+    handles = {c: open(_column_file(directory, c, "delta"), "ab") for c in COLUMNS}
+    try:
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True).execute(query)
+
+            while True:
+                chunk = result.fetchmany(chunk_rows)
+                if not chunk:
+                    break
+
+                order_ids, medicine_ids, patient_ids, order_dates, quantities = zip(*chunk)
+
+                np.asarray(medicine_ids, dtype=COLUMN_DTYPE).tofile(handles["medicine_id"])
+                np.asarray(patient_ids, dtype=COLUMN_DTYPE).tofile(handles["patient_id"])
+                _dates_to_days(order_dates).tofile(handles["day"])
+                np.asarray(quantities, dtype=COLUMN_DTYPE).tofile(handles["qty"])
+
+                delta_rows += len(chunk)
+                last_order_id = max(order_ids)
+                max_medicine_id = max(max_medicine_id, max(medicine_ids))
+    finally:
+        for handle in handles.values():
+            handle.close()
+
+    _write_meta(directory, rows=meta["rows"], delta_rows=delta_rows,
+                last_order_id=last_order_id, max_medicine_id=max_medicine_id)
+
+    compacted = False
+    if delta_rows and delta_rows > COMPACT_RATIO * max(meta["rows"], 1):
+        compact_order_store(directory)
+        compacted = True
+
+    invalidate_order_store()
+    final = _read_meta(directory)
+    return {"rows": final["rows"], "delta_rows": final["delta_rows"],
+            "last_order_id": final["last_order_id"], "compacted": compacted}
+
+
+def compact_order_store(directory: str = DEFAULT_STORE_DIR):
+    """
+    Merges the delta into the sorted main segment. Reads main through
+    the memmaps; peak memory is one copy of each column.
+    """
+    store = OrderColumnStore(directory)
+    max_medicine_id = store.meta["max_medicine_id"]
+
+    merged = {c: np.concatenate([store.main[c], store.delta[c]]) for c in COLUMNS}
+    order = np.lexsort((merged["day"], merged["medicine_id"]))
+
+    build = directory.rstrip("/") + ".building"
+    shutil.rmtree(build, ignore_errors=True)
+    os.makedirs(build)
+
+    for c in COLUMNS:
+        merged[c][order].tofile(_column_file(build, c))
+        open(_column_file(build, c, "delta"), "wb").close()
+
+    _write_offsets(build, merged["medicine_id"], max_medicine_id)
+    _write_meta(build, rows=len(order), delta_rows=0,
+                last_order_id=store.last_order_id, max_medicine_id=max_medicine_id)
+
+    del store, merged
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(build, directory)
+
+
+# =====================================================
+# SHARED INSTANCE
+# =====================================================
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_order_store(directory: str = DEFAULT_STORE_DIR):
+    """
+    Process-wide store, opened lazily. None when nothing has been
+    exported yet — callers fall back to SQL.
+
+    Only the scheduler leader refreshes the store, so other workers
+    never see invalidate_order_store(). Every access compares
+    meta.json's stamp with the open store's and reopens on change.
+    """
+    global _store
+
+    stamp = _meta_stamp(os.path.join(directory, META_FILE))
+
+    with _store_lock:
+        if stamp is None:
+            _store = None
+            return None
+
+        if _store is None or _store.directory != directory or _store.meta_stamp != stamp:
+            _store = OrderColumnStore(directory)
+
+        return _store
+
+
+def invalidate_order_store():
+    global _store
+
+    with _store_lock:
+        _store = None
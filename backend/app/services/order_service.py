@@ -0,0 +1,235 @@
+# backend/app/services/order_service.py
+# STEP 55 — Contention-Safe Order Creation
+# Stock is checked and decremented by a single conditional UPDATE,
+# committed together with the order row. Concurrent buyers of the
+# same SKU can never oversell or lose each other's decrements.
+
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import inspect, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..core.event_dispatcher import OrderCreated, publish
+from ..models.medicine import Medicine
+from ..models.order import Order
+from ..models.patient import Patient
+from .medicine_search_service import medicine_index
+
+
+class InsufficientStock(Exception):
+    def __init__(self, medicine_ids: list = None):
+        self.medicine_ids = medicine_ids or []
+        super().__init__(f"Insufficient stock for medicine IDs: {self.medicine_ids}")
+
+
+class UnknownReferences(Exception):
+    def __init__(self, medicine_ids: list = None, patient_ids: list = None):
+        self.medicine_ids = medicine_ids or []
+        self.patient_ids = patient_ids or []
+        super().__init__(
+            f"Unknown medicine IDs: {self.medicine_ids}, "
+            f"unknown patient IDs: {self.patient_ids}"
+        )
+
+
+# =====================================================
+# ATOMIC STOCK ADJUSTMENTS
+# =====================================================
+# Every adjustment also bumps medicines.stock_version, so the agent
+# response cache sees any stock change on a patient's medicines, even
+# ones that cancel out.
+
+def ensure_stock_version_column(engine: Engine):
+    """
+    create_all does not add columns to existing tables; add
+    stock_version to databases created before it existed.
+    """
+    columns = {c["name"] for c in inspect(engine).get_columns("medicines")}
+
+    if "stock_version" not in columns:
+        with engine.begin() as conn:
+            conn.execute(text(
+                "ALTER TABLE medicines ADD COLUMN stock_version INTEGER NOT NULL DEFAULT 0"
+            ))
+
+
+def reserve_stock(db: Session, medicine_id: int, quantity: int) -> bool:
+    """
+    UPDATE medicines SET stock = stock - :q
+    WHERE id = :id AND stock >= :q
+
+    The check and the write happen in the database, so it holds
+    under concurrency. Returns False when stock is insufficient.
+    Does not commit — the caller owns the transaction.
+    """
+    result = db.execute(
+        update(Medicine)
+        .where(Medicine.id == medicine_id, Medicine.stock >= quantity)
+        .values(stock=Medicine.stock - quantity, stock_version=Medicine.stock_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def release_stock(db: Session, medicine_id: int, quantity: int) -> bool:
+    """
+    Atomic increment (restock / returned units). Does not commit.
+    """
+    result = db.execute(
+        update(Medicine)
+        .where(Medicine.id == medicine_id)
+        .values(stock=Medicine.stock + quantity, stock_version=Medicine.stock_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+# =====================================================
+# ORDER CREATION
+# =====================================================
+
+def place_order(
+    db: Session,
+    patient_id: int,
+    medicine_id: int,
+    quantity: int,
+    daily_dosage: float = 1
+) -> Order:
+    """
+    Decrements stock and inserts the order in one transaction.
+    Raises InsufficientStock (nothing written) when the
+    conditional decrement matches no row.
+    """
+    if quantity <= 0:
+        raise ValueError("Quantity must be positive.")
+
+    try:
+        if not reserve_stock(db, medicine_id, quantity):
+            raise InsufficientStock()
+
+        order = Order(
+            patient_id=patient_id,
+            medicine_id=medicine_id,
+            quantity=quantity,
+            order_date=datetime.utcnow(),
+            daily_dosage=daily_dosage
+        )
+
+        db.add(order)
+        db.commit()
+
+    except Exception:
+        db.rollback()
+        raise
+
+    db.refresh(order)
+
+    # STEP 63 — Targeted risk / refill / restock evaluation
+    publish(OrderCreated(
+        order_id=order.id,
+        patient_id=order.patient_id,
+        medicine_id=order.medicine_id,
+        quantity=order.quantity
+    ))
+
+    return order
+
+
+# =====================================================
+# STEP 56 — BULK ORDER CREATION
+# =====================================================
+
+def find_unknown_medicine_ids(db: Session, medicine_ids) -> list:
+    """
+    Validates IDs against the in-memory catalog (kept in sync by
+    ORM events). Misses trigger one incremental refresh before
+    being reported, so rows added outside the ORM are still found.
+    """
+    medicine_index.ensure_built(db)
+    unknown = [mid for mid in set(medicine_ids) if mid not in medicine_index]
+
+    if unknown:
+        medicine_index.refresh(db)
+        unknown = [mid for mid in unknown if mid not in medicine_index]
+
+    return sorted(unknown)
+
+
+def find_unknown_patient_ids(db: Session, patient_ids) -> list:
+    wanted = set(patient_ids)
+    found = {
+        pid for (pid,) in
+        db.query(Patient.id).filter(Patient.id.in_(wanted)).all()
+    }
+    return sorted(wanted - found)
+
+
+def place_orders_bulk(db: Session, lines: list) -> list:
+    """
+    All-or-nothing bulk order creation. Returns order IDs in line order.
+
+    lines: [{"patient_id", "medicine_id", "quantity", "daily_dosage"?}]
+
+    Quantities are summed per medicine and reserved with one
+    conditional UPDATE each; orders are inserted and everything is
+    committed in a single transaction. Any shortfall rolls back
+    every line and raises InsufficientStock listing the medicines.
+    """
+    if any(line["quantity"] <= 0 for line in lines):
+        raise ValueError("Quantity must be positive.")
+
+    unknown_medicines = find_unknown_medicine_ids(db, [l["medicine_id"] for l in lines])
+    unknown_patients = find_unknown_patient_ids(db, [l["patient_id"] for l in lines])
+
+    if unknown_medicines or unknown_patients:
+        raise UnknownReferences(unknown_medicines, unknown_patients)
+
+    demand = defaultdict(int)
+    for line in lines:
+        demand[line["medicine_id"]] += line["quantity"]
+
+    try:
+        # Fixed lock order (sorted ids) keeps concurrent bulk
+        # requests from deadlocking on databases with row locks
+        short = [
+            medicine_id
+            for medicine_id in sorted(demand)
+            if not reserve_stock(db, medicine_id, demand[medicine_id])
+        ]
+
+        if short:
+            raise InsufficientStock(short)
+
+        now = datetime.utcnow()
+        orders = [
+            Order(
+                patient_id=line["patient_id"],
+                medicine_id=line["medicine_id"],
+                quantity=line["quantity"],
+                order_date=now,
+                daily_dosage=line.get("daily_dosage") or 1
+            )
+            for line in lines
+        ]
+
+        db.add_all(orders)
+        db.flush()
+        order_ids = [order.id for order in orders]
+        db.commit()
+
+    except Exception:
+        db.rollback()
+        raise
+
+    # STEP 63 — Bus coalesces per medicine / patient
+    for order_id, line in zip(order_ids, lines):
+        publish(OrderCreated(
+            order_id=order_id,
+            patient_id=line["patient_id"],
+            medicine_id=line["medicine_id"],
+            quantity=line["quantity"]
+        ))
+
+    return order_ids
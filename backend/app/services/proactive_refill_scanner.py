@@ -1,46 +1,50 @@
-from backend.app.core.database import SessionLocal
-from backend.app.models.patient import Patient
-from backend.app.models.refill_alert import RefillAlert
-from backend.app.services.refill_predictor import predict_refills
-
-
-def run_proactive_refill_scan():
-    db = SessionLocal()
+import os
+import socket
+from uuid import uuid4
 
-    try:
-        patients = db.query(Patient).all()
-        alerts_created = 0
+from backend.app.core.database import SessionLocal
+from backend.app.services.refill_service import scan_and_create_refill_alerts
 
-        for patient in patients:
+# STEP 61 — Same lease as the scheduler's refill job: one cycle at a time
+from backend.app.services.scheduler_lease_service import job_lease_name, release, try_acquire
 
-            predictions = predict_refills(db, patient.id)
 
-            for item in predictions:
-                if item["overdue"]:
+REFILL_JOB_LEASE = job_lease_name("refill_scan_job")
+LEASE_TTL_SECONDS = 300
+ADMIN_HOLDER = f"admin:{socket.gethostname()}:{os.getpid()}"
 
-                    existing_alert = db.query(RefillAlert).filter(
-                        RefillAlert.patient_id == patient.id,
-                        RefillAlert.medicine_name == item["medicine_name"],
-                        RefillAlert.status == "pending"
-                    ).first()
 
-                    if not existing_alert:
-                        alert = RefillAlert(
-                            patient_id=patient.id,
-                            medicine_name=item["medicine_name"],
-                            expected_refill_date=item["expected_refill_date"],
-                            status="pending"
-                        )
+def run_proactive_refill_scan():
+    """
+    STEP 68 — On-demand run of the shared refill cycle
+    (refill_service.scan_and_create_refill_alerts). Patients the
+    scheduler already evaluated this cycle are not evaluated again.
+    """
+    # Unique per call: try_acquire renews a lease its holder already
+    # owns, so a per-process holder would let two requests overlap
+    holder = f"{ADMIN_HOLDER}:{uuid4().hex}"
 
-                        db.add(alert)
-                        alerts_created += 1
+    db = SessionLocal()
 
-        db.commit()
+    try:
+        if not try_acquire(db, REFILL_JOB_LEASE, holder, LEASE_TTL_SECONDS):
+            return {
+                "message": "Refill scan already running",
+                "alerts_created": 0
+            }
+
+        try:
+            result = scan_and_create_refill_alerts(db)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            release(db, REFILL_JOB_LEASE, holder, finished=True)
 
         return {
             "message": "Proactive refill scan completed",
-            "alerts_created": alerts_created
+            **result
         }
 
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
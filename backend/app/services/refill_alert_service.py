@@ -0,0 +1,118 @@
+# backend/app/services/refill_alert_service.py
+# STEP 69 — Refill Alert Listing + Export
+# Keyset pagination (newest first, cursor = last alert id: ids grow
+# with created_at) and an NDJSON export that streams rows with
+# yield_per, so neither path loads the whole table. Every filter has a
+# composite index ending in id, so each page is an index range scan.
+
+import json
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..core.database import SessionLocal
+from ..models.refill_alert import RefillAlert
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+
+
+def ensure_refill_alert_indexes(engine: Engine):
+    """Adds the status / patient / created_at keyset indexes on old databases."""
+    for index in RefillAlert.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+
+# =====================================================
+# FILTERS
+# =====================================================
+
+def _filtered(db: Session, status: str = None, patient_id: int = None,
+              created_from: date = None, created_to: date = None):
+    """
+    created_from / created_to are inclusive calendar days.
+    """
+    query = db.query(RefillAlert)
+
+    if status:
+        query = query.filter(RefillAlert.status == status)
+
+    if patient_id is not None:
+        query = query.filter(RefillAlert.patient_id == patient_id)
+
+    if created_from:
+        query = query.filter(RefillAlert.created_at >= datetime.combine(created_from, time.min))
+
+    if created_to:
+        query = query.filter(RefillAlert.created_at < datetime.combine(created_to + timedelta(days=1), time.min))
+
+    return query
+
+
+def serialize_alert(alert: RefillAlert) -> dict:
+    return {
+        "alert_id": alert.id,
+        "patient_id": alert.patient_id,
+        "medicine_name": alert.medicine_name,
+        "expected_refill_date": alert.expected_refill_date,
+        "status": alert.status,
+        "created_at": alert.created_at
+    }
+
+
+# =====================================================
+# PAGINATION
+# =====================================================
+
+def list_refill_alerts(db: Session, status: str = None, patient_id: int = None,
+                       created_from: date = None, created_to: date = None,
+                       cursor: int = None, limit: int = DEFAULT_PAGE_SIZE) -> dict:
+    """
+    One page, newest first. Pass the returned next_cursor back as
+    `cursor` for the following page; it is None on the last page.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    query = _filtered(db, status, patient_id, created_from, created_to)
+
+    if cursor is not None:
+        query = query.filter(RefillAlert.id < cursor)
+
+    # One extra row tells whether another page exists
+    rows = query.order_by(RefillAlert.id.desc()).limit(limit + 1).all()
+    page = rows[:limit]
+
+    return {
+        "items": [serialize_alert(alert) for alert in page],
+        "next_cursor": page[-1].id if len(rows) > limit else None
+    }
+
+
+# =====================================================
+# NDJSON EXPORT
+# =====================================================
+
+def export_refill_alerts_ndjson(status: str = None, patient_id: int = None,
+                                created_from: date = None, created_to: date = None,
+                                batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Generator of NDJSON lines in id order. Owns its session: a
+    streaming response outlives the request's dependencies.
+    """
+    db = SessionLocal()
+
+    try:
+        query = (
+            _filtered(db, status, patient_id, created_from, created_to)
+            .order_by(RefillAlert.id)
+            .yield_per(batch_size)
+        )
+
+        for alert in query:
+            yield json.dumps(serialize_alert(alert), default=str) + "\n"
+
+    finally:
+        db.close()
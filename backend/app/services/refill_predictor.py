@@ -1,51 +1,65 @@
-from datetime import date, timedelta
+from datetime import date
+
+import numpy as np
 from sqlalchemy.orm import Session
-from backend.app.models.order import Order
 
+# STEP 68 — Shared refill engine (latest orders, days covered)
+from backend.app.services.refill_service import latest_refill_orders
 
-def predict_refills(db: Session, patient_id: int):
+
+def predict_refills_bulk(db: Session, patient_ids: list = None, today: date = None) -> dict:
     """
-    Predict refill dates based on:
-    - order quantity
-    - daily dosage
-    - last order date
+    patient_id → refill predictions (latest order per medicine, newest
+    first) for the given patients, or every patient when patient_ids is
+    None. Supply durations and refill dates are computed for all rows at
+    once with NumPy.
     """
+    today = today or date.today()
 
-    orders = (
-        db.query(Order)
-        .filter(Order.patient_id == patient_id)
-        .order_by(Order.order_date.desc())
-        .all()
-    )
+    if patient_ids is not None and not patient_ids:
+        return {}
 
-    predictions = []
-    today = date.today()
+    rows = [row for row in latest_refill_orders(db, patient_ids) if row.daily_dosage and row.daily_dosage > 0]
 
-    for order in orders:
+    results = {patient_id: [] for patient_id in (patient_ids or [])}
 
-        # Skip invalid dosage
-        if not order.daily_dosage or order.daily_dosage <= 0:
-            continue
+    if not rows:
+        return results
 
-        # Calculate supply duration (rounded)
-        days_supply = round(order.quantity / order.daily_dosage)
+    _, patient_col, medicine_col, name_col, date_col, quantity_col, dosage_col = zip(*rows)
 
-        expected_refill_date = order.order_date + timedelta(days=days_supply)
+    quantity = np.array(quantity_col, dtype=np.float64)
+    dosage = np.array(dosage_col, dtype=np.float64)
+    ordinal = np.array([d.toordinal() for d in date_col], dtype=np.int64)
 
-        is_overdue = today > expected_refill_date
+    # refill_service.days_covered(), element-wise
+    days_supply = (quantity // dosage).astype(np.int64)
+    expected = ordinal + days_supply
+    days_remaining = expected - today.toordinal()
 
-        days_remaining = (expected_refill_date - today).days
+    for i, patient_id in enumerate(patient_col):
+        expected_refill_date = date.fromordinal(int(expected[i]))
 
-        predictions.append({
-            "medicine_id": order.medicine.id,
-            "medicine_name": order.medicine.name,
-            "last_order_date": order.order_date.isoformat(),
-            "quantity_bought": order.quantity,
-            "daily_dosage": order.daily_dosage,
-            "days_supply": days_supply,
+        results.setdefault(patient_id, []).append({
+            "medicine_id": medicine_col[i],
+            "medicine_name": name_col[i],
+            "last_order_date": date_col[i].isoformat(),
+            "quantity_bought": quantity_col[i],
+            "daily_dosage": dosage_col[i],
+            "days_supply": int(days_supply[i]),
             "expected_refill_date": expected_refill_date.isoformat(),
-            "days_remaining": max(days_remaining, 0),
-            "overdue": is_overdue
+            "days_remaining": max(int(days_remaining[i]), 0),
+            "overdue": bool(days_remaining[i] < 0)
         })
 
-    return predictions
\ No newline at end of file
+    return results
+
+
+def predict_refills(db: Session, patient_id: int):
+    """
+    Predict refill dates based on:
+    - order quantity
+    - daily dosage
+    - last order date (latest order per medicine)
+    """
+    return predict_refills_bulk(db, [patient_id]).get(patient_id, [])
@@ -1,37 +1,66 @@
-from datetime import timedelta, date
+from datetime import datetime, timedelta, date
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, insert
 
 from backend.app.models.order import Order
 from backend.app.models.patient import Patient
 from backend.app.models.medicine import Medicine
 from backend.app.models.refill_alert import RefillAlert
+from backend.app.models.refill_schedule import RefillSchedule
+
+# STEP 62 — Incremental scans
+from backend.app.services.scan_watermark_service import (
+    REFILL_SCAN,
+    current_max_order_id,
+    load_watermark,
+    needs_full_scan,
+    refill_transition_patient_ids,
+    save_watermark,
+    touched_patient_ids,
+)
+
+DUE_SOON_DAYS = 3
+
+
+# -------------------------------
+# Days covered (STEP 68 — the one definition shared by the
+# scheduler scan, the proactive scan and the predictor)
+# -------------------------------
+def days_covered(quantity, daily_dosage):
+    if not daily_dosage or daily_dosage <= 0:
+        return None
+
+    # Whole days only (floor): the refill falls due on the last
+    # covered day. refill_predictor applies the same floor division
+    # element-wise.
+    return int(quantity // daily_dosage)
 
 
 # -------------------------------
 # Calculate refill date
 # -------------------------------
 def calculate_refill_date(order: Order):
-    if not order.daily_dosage or order.daily_dosage <= 0:
+    days = days_covered(order.quantity, order.daily_dosage)
+
+    if days is None:
         return None
 
-    days_covered = order.quantity / order.daily_dosage
-    return order.order_date + timedelta(days=int(days_covered))
+    return order.order_date + timedelta(days=days)
 
 
 # -------------------------------
 # Determine status ONLY
 # (Used by scheduler)
 # -------------------------------
-def get_status(refill_date):
+def get_status(refill_date, today: date = None):
     if not refill_date:
         return "unknown"
 
-    today = date.today()
+    today = today or date.today()
 
     if refill_date < today:
         return "overdue"
-    elif (refill_date - today).days <= 3:
+    elif (refill_date - today).days <= DUE_SOON_DAYS:
         return "due_soon"
     else:
         return "ok"
@@ -49,7 +78,7 @@ def get_status_and_risk(refill_date):
 
     if refill_date < today:
         return "overdue", "High"
-    elif (refill_date - today).days <= 3:
+    elif (refill_date - today).days <= DUE_SOON_DAYS:
         return "due_soon", "Medium"
     else:
         return "ok", "Low"
@@ -85,47 +114,156 @@ def get_latest_orders(db: Session, patient_id: int):
 
 
 # ======================================================
-# STEP 31 – Scheduled Refill Scan Engine
+# STEP 31 + 68 – Unified Refill Engine
 # ======================================================
 
-def scan_and_create_refill_alerts(db: Session):
+ALERT_STATUSES = ("overdue", "due_soon")
+
+
+def latest_refill_orders(db: Session, patient_ids: list = None):
+    """
+    Latest order per (patient, medicine) with its medicine name — one
+    query, no lazy loads. Same-day duplicates resolve to the highest
+    order id. patient_ids=None covers every patient.
+    """
+    ranked = db.query(
+        Order.id.label("order_id"),
+        func.row_number().over(
+            partition_by=(Order.patient_id, Order.medicine_id),
+            order_by=(Order.order_date.desc(), Order.id.desc()),
+        ).label("rank"),
+    )
+
+    if patient_ids is not None:
+        ranked = ranked.filter(Order.patient_id.in_(patient_ids))
+
+    ranked = ranked.subquery()
+
+    return (
+        db.query(
+            Order.id,
+            Order.patient_id,
+            Order.medicine_id,
+            Medicine.name,
+            Order.order_date,
+            Order.quantity,
+            Order.daily_dosage,
+        )
+        .join(ranked, (ranked.c.order_id == Order.id) & (ranked.c.rank == 1))
+        .join(Medicine, Medicine.id == Order.medicine_id)
+        .order_by(Order.patient_id, Order.order_date.desc(), Order.medicine_id)
+        .all()
+    )
+
+
+def evaluate_refills(db: Session, patient_ids: list = None, today: date = None) -> int:
+    """
+    Computes refill state for the given patients (all when None) in one
+    pass: replaces their refill schedule rows and adds any missing
+    due_soon / overdue alerts. Does not commit. Returns alerts created.
+    """
+    today = today or date.today()
+
+    if patient_ids is not None and not patient_ids:
+        return 0
+
+    rows = latest_refill_orders(db, patient_ids)
+
+    schedule = db.query(RefillSchedule)
+    existing = db.query(RefillAlert.patient_id, RefillAlert.medicine_name, RefillAlert.status).filter(
+        RefillAlert.status.in_(ALERT_STATUSES)
+    )
+
+    if patient_ids is not None:
+        schedule = schedule.filter(RefillSchedule.patient_id.in_(patient_ids))
+        existing = existing.filter(RefillAlert.patient_id.in_(patient_ids))
+
+    schedule.delete(synchronize_session=False)
+    existing = set(existing.all())
+
+    schedule_rows = []
+    alert_rows = []
+    now = datetime.utcnow()
+
+    for order_id, patient_id, medicine_id, medicine_name, order_date, quantity, daily_dosage in rows:
+        days = days_covered(quantity, daily_dosage)
+
+        if days is None:
+            continue
 
-    patients = db.query(Patient).all()
+        refill_date = order_date + timedelta(days=days)
 
-    for patient in patients:
-        latest_orders = get_latest_orders(db, patient.id)
+        schedule_rows.append({
+            "order_id": order_id,
+            "patient_id": patient_id,
+            "medicine_id": medicine_id,
+            "refill_date": refill_date
+        })
 
-        for order in latest_orders:
+        status = get_status(refill_date, today)
+        key = (patient_id, medicine_name, status)
 
-            refill_date = calculate_refill_date(order)
-            status = get_status(refill_date)
+        if status in ALERT_STATUSES and key not in existing:
+            alert_rows.append({
+                "patient_id": patient_id,
+                "medicine_name": medicine_name,
+                "expected_refill_date": str(refill_date),
+                "status": status,
+                "created_at": now
+            })
+            existing.add(key)
 
-            if status in ["overdue", "due_soon"]:
+    # One executemany per table instead of a flush per row
+    if schedule_rows:
+        db.execute(insert(RefillSchedule), schedule_rows)
 
-                medicine = db.query(Medicine).filter(
-                    Medicine.id == order.medicine_id
-                ).first()
+    if alert_rows:
+        db.execute(insert(RefillAlert), alert_rows)
+
+    return len(alert_rows)
+
+
+def evaluate_patient_refills(db: Session, patient_id: int):
+    """
+    Refreshes one patient's refill state. Does not commit.
+    (STEP 63: called directly on OrderCreated.)
+    """
+    return evaluate_refills(db, [patient_id])
+
+
+def scan_and_create_refill_alerts(db: Session, incremental: bool = True):
+    """
+    One refill cycle, shared by the scheduler job and the admin
+    proactive scan. Full scan on the first run (or incremental=False).
+    Afterwards only patients with new orders or a refill that crossed
+    a status boundary since the last cycle are re-evaluated, so a
+    second caller in the same cycle finds nothing left to do.
+    """
+    today = date.today()
+    upto_order_id = current_max_order_id(db)
+    mark = load_watermark(db, REFILL_SCAN)
+
+    full_scan = not incremental or needs_full_scan(mark)
+
+    if full_scan:
+        patient_ids = None
+    else:
+        patient_ids = sorted(
+            touched_patient_ids(db, mark.last_order_id, upto_order_id)
+            | refill_transition_patient_ids(db, mark.last_run_date, today, DUE_SOON_DAYS)
+        )
 
-                if not medicine:
-                    continue
+    alerts_created = evaluate_refills(db, patient_ids, today)
 
-                existing_alert = (
-                    db.query(RefillAlert)
-                    .filter(
-                        RefillAlert.patient_id == patient.id,
-                        RefillAlert.medicine_name == medicine.name,
-                        RefillAlert.status == status
-                    )
-                    .first()
-                )
+    db.commit()
 
-                if not existing_alert:
-                    new_alert = RefillAlert(
-                        patient_id=patient.id,
-                        medicine_name=medicine.name,
-                        expected_refill_date=str(refill_date),
-                        status=status
-                    )
-                    db.add(new_alert)
+    save_watermark(db, REFILL_SCAN, upto_order_id, today)
 
-    db.commit()
\ No newline at end of file
+    return {
+        "mode": "full" if full_scan else "incremental",
+        "patients_scanned": (
+            db.query(Patient.id).count() if patient_ids is None else len(patient_ids)
+        ),
+        "alerts_created": alerts_created,
+        "watermark_order_id": upto_order_id
+    }
@@ -0,0 +1,161 @@
+# backend/app/services/scan_watermark_service.py
+# STEP 62 — Watermark-Based Incremental Scans
+# Each scheduler scan remembers the highest orders.id it processed and
+# the date it last ran. The next tick re-evaluates only patients and
+# medicines with newer orders, plus the ones a date-indexed query
+# shows have crossed a time boundary (refill falling due, orders
+# leaving a demand window) since the last run.
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from ..models.inventory_escalation import InventoryEscalation
+from ..models.order import Order
+from ..models.refill_schedule import RefillSchedule
+from ..models.scan_watermark import ScanWatermark
+
+
+REFILL_SCAN = "refill_scan"
+DEMAND_SCAN = "demand_scan"
+MITIGATION_SCAN = "mitigation_scan"
+
+
+# =====================================================
+# SETUP
+# =====================================================
+
+def ensure_scan_indexes(engine: Engine):
+    """
+    Adds the orders (order_date, medicine_id) and (patient_id,
+    medicine_id) indexes to databases that predate them.
+    """
+    for index in Order.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+
+# =====================================================
+# WATERMARKS
+# =====================================================
+
+def load_watermark(db: Session, name: str):
+    return db.query(ScanWatermark).filter(ScanWatermark.name == name).first()
+
+
+def save_watermark(db: Session, name: str, last_order_id: int, run_date: date, context: str = None):
+    mark = load_watermark(db, name)
+
+    if mark is None:
+        mark = ScanWatermark(name=name)
+        db.add(mark)
+
+    mark.last_order_id = last_order_id
+    mark.last_run_date = run_date
+    mark.context = context
+    mark.updated_at = datetime.utcnow()
+    db.commit()
+
+
+def needs_full_scan(mark, context: str = None) -> bool:
+    return mark is None or mark.last_run_date is None or mark.context != context
+
+
+def current_max_order_id(db: Session) -> int:
+    return db.query(func.max(Order.id)).scalar() or 0
+
+
+# =====================================================
+# CHANGED SINCE THE WATERMARK
+# =====================================================
+
+def touched_patient_ids(db: Session, after_order_id: int, upto_order_id: int) -> set:
+    rows = (
+        db.query(Order.patient_id)
+        .filter(Order.id > after_order_id, Order.id <= upto_order_id)
+        .distinct()
+        .all()
+    )
+    return {pid for (pid,) in rows}
+
+
+def touched_medicine_ids(db: Session, after_order_id: int, upto_order_id: int) -> set:
+    rows = (
+        db.query(Order.medicine_id)
+        .filter(Order.id > after_order_id, Order.id <= upto_order_id)
+        .distinct()
+        .all()
+    )
+    return {mid for (mid,) in rows}
+
+
+def refill_transition_patient_ids(db: Session, last_run_date: date, today: date, due_soon_days: int) -> set:
+    """
+    Patients with a refill that became due_soon (refill_date - today
+    reached due_soon_days) or overdue (refill_date passed) since the
+    last run.
+    """
+    if last_run_date >= today:
+        return set()
+
+    due_soon_from = last_run_date + timedelta(days=due_soon_days)
+    due_soon_to = today + timedelta(days=due_soon_days)
+
+    rows = (
+        db.query(RefillSchedule.patient_id)
+        .filter(
+            ((RefillSchedule.refill_date > due_soon_from) & (RefillSchedule.refill_date <= due_soon_to))
+            | ((RefillSchedule.refill_date >= last_run_date) & (RefillSchedule.refill_date < today))
+        )
+        .distinct()
+        .all()
+    )
+    return {pid for (pid,) in rows}
+
+
+def window_exit_medicine_ids(db: Session, last_run_date: date, today: date, windows: tuple) -> set:
+    """
+    Medicines with orders that dropped out of a trailing N-day window
+    since the last run (their windowed sums changed without a new order).
+    """
+    if last_run_date >= today:
+        return set()
+
+    medicine_ids = set()
+
+    for days in windows:
+        rows = (
+            db.query(Order.medicine_id)
+            .filter(
+                Order.order_date >= last_run_date - timedelta(days=days),
+                Order.order_date < today - timedelta(days=days),
+            )
+            .distinct()
+            .all()
+        )
+        medicine_ids.update(mid for (mid,) in rows)
+
+    return medicine_ids
+
+
+def active_escalation_medicine_ids(db: Session) -> set:
+    rows = (
+        db.query(InventoryEscalation.medicine_id)
+        .filter(InventoryEscalation.restock_triggered == False)
+        .distinct()
+        .all()
+    )
+    return {mid for (mid,) in rows}
+
+
+def changed_medicine_ids(db: Session, mark, upto_order_id: int, today: date, windows: tuple) -> set:
+    """
+    Medicines whose windowed demand or escalation state may differ
+    from the last run.
+    """
+    return (
+        touched_medicine_ids(db, mark.last_order_id, upto_order_id)
+        | window_exit_medicine_ids(db, mark.last_run_date, today, windows)
+        | active_escalation_medicine_ids(db)
+    )
@@ -0,0 +1,154 @@
+# backend/app/services/scheduler_lease_service.py
+# STEP 61 — DB-Backed Scheduler Leases
+# One row per lease ("scheduler_leader", "job:<job_id>"). A lease is
+# taken or renewed by a single conditional UPDATE, so concurrent
+# workers can never both hold it. Expired leases can be taken over,
+# which recovers from crashed holders without manual cleanup.
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models.scheduler_lease import SchedulerLease
+
+
+LEADER_LEASE = "scheduler_leader"
+
+
+def job_lease_name(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+def _ensure_row(db: Session, name: str):
+    if db.get(SchedulerLease, name) is not None:
+        return
+
+    try:
+        db.add(SchedulerLease(name=name, run_count=0, skipped_count=0))
+        db.commit()
+    except IntegrityError:
+        # Another worker created it first — fine either way
+        db.rollback()
+
+
+# =====================================================
+# ACQUIRE / RENEW / RELEASE
+# =====================================================
+
+def try_acquire(db: Session, name: str, holder: str, ttl_seconds: int, now: datetime = None) -> bool:
+    """
+    UPDATE scheduler_leases SET holder = :holder, expires_at = :now + ttl
+    WHERE name = :name AND (holder = :holder OR holder IS NULL OR expires_at < :now)
+
+    Acquires a free or expired lease, or renews one already held by
+    `holder`. Returns False when another live holder owns it.
+    """
+    now = now or datetime.utcnow()
+    _ensure_row(db, name)
+
+    result = db.execute(
+        update(SchedulerLease)
+        .where(
+            SchedulerLease.name == name,
+            or_(
+                SchedulerLease.holder == holder,
+                SchedulerLease.holder.is_(None),
+                SchedulerLease.expires_at < now,
+            ),
+        )
+        .values(
+            holder=holder,
+            heartbeat_at=now,
+            expires_at=now + timedelta(seconds=ttl_seconds),
+            acquired_at=case(
+                (SchedulerLease.holder == holder, SchedulerLease.acquired_at),
+                else_=now,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    return result.rowcount == 1
+
+
+def release(db: Session, name: str, holder: str, finished: bool = False, now: datetime = None) -> bool:
+    """
+    Frees the lease if `holder` still owns it. With finished=True the
+    release also counts a completed run (job locks).
+    """
+    now = now or datetime.utcnow()
+    values = {"holder": None, "expires_at": None}
+
+    if finished:
+        values["run_count"] = SchedulerLease.run_count + 1
+        values["last_finished_at"] = now
+
+    result = db.execute(
+        update(SchedulerLease)
+        .where(SchedulerLease.name == name, SchedulerLease.holder == holder)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    return result.rowcount == 1
+
+
+# =====================================================
+# REPORTING
+# =====================================================
+
+def record_skip(db: Session, name: str, reason: str, now: datetime = None):
+    """
+    Counts a run that did not happen (overlap, missed, max_instances).
+    """
+    now = now or datetime.utcnow()
+    _ensure_row(db, name)
+
+    db.execute(
+        update(SchedulerLease)
+        .where(SchedulerLease.name == name)
+        .values(
+            skipped_count=SchedulerLease.skipped_count + 1,
+            last_skip_reason=reason,
+            last_skipped_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def get_scheduler_status(db: Session, now: datetime = None) -> dict:
+    now = now or datetime.utcnow()
+    leases = db.query(SchedulerLease).order_by(SchedulerLease.name).all()
+
+    def is_live(lease):
+        return lease.holder is not None and lease.expires_at is not None and lease.expires_at >= now
+
+    leader = next((l for l in leases if l.name == LEADER_LEASE), None)
+
+    return {
+        "leader": {
+            "holder": leader.holder if leader and is_live(leader) else None,
+            "acquired_at": leader.acquired_at if leader else None,
+            "heartbeat_at": leader.heartbeat_at if leader else None,
+            "expires_at": leader.expires_at if leader else None,
+        },
+        "jobs": [
+            {
+                "job_id": lease.name.split(":", 1)[1],
+                "running": is_live(lease),
+                "holder": lease.holder if is_live(lease) else None,
+                "run_count": lease.run_count,
+                "skipped_count": lease.skipped_count,
+                "last_skip_reason": lease.last_skip_reason,
+                "last_skipped_at": lease.last_skipped_at,
+                "last_finished_at": lease.last_finished_at,
+            }
+            for lease in leases
+            if lease.name.startswith("job:")
+        ],
+    }
@@ -2,7 +2,7 @@ from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
 from ..models.inventory_escalation import InventoryEscalation
-from ..models.order import Order
+from .consumption_rollup_service import window_order_count
 
 
 LOOKBACK_DAYS = 14
@@ -33,16 +33,9 @@ def calculate_instability_multiplier(db: Session, medicine_id: int):
     )
 
     # -------------------------------------------------
-    # 2️⃣ Recent Orders (uses order_date — FIXED)
+    # 2️⃣ Recent Orders (STEP 64 — daily consumption rollup)
     # -------------------------------------------------
-    recent_orders = (
-        db.query(Order)
-        .filter(
-            Order.medicine_id == medicine_id,
-            Order.order_date >= cutoff_date
-        )
-        .count()
-    )
+    recent_orders = window_order_count(db, medicine_id, cutoff_date)
 
     acceleration_flag = 1 if recent_orders >= 20 else 0
 
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from datetime import datetime
 from backend.app.models.system_config import SystemConfig
+from backend.app.core.event_dispatcher import ModeChanged, publish
 
 SAFE = "SAFE"
 REVIEW = "REVIEW"
@@ -26,6 +27,7 @@ def get_current_mode(db: Session) -> str:
 
 def update_mode(db: Session, new_mode: str, user_id: int):
     config = db.query(SystemConfig).filter(SystemConfig.id == 1).first()
+    old_mode = config.current_mode if config else None
 
     if not config:
         config = SystemConfig(
@@ -41,6 +43,11 @@ def update_mode(db: Session, new_mode: str, user_id: int):
         config.updated_at = datetime.utcnow()
 
     db.commit()
+
+    # STEP 63
+    if old_mode != new_mode:
+        publish(ModeChanged(old_mode=old_mode, new_mode=new_mode, changed_by=user_id))
+
     return config
 
 
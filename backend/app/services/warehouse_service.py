@@ -1,8 +1,11 @@
 import requests
+from sqlalchemy import func
 from backend.app.core.database import SessionLocal
 from backend.app.models.inventory_escalation import InventoryEscalation
 
 WAREHOUSE_URL = "http://127.0.0.1:8000/warehouse/fulfill"
+WAREHOUSE_BULK_URL = "http://127.0.0.1:8000/warehouse/fulfill/bulk"
+WAREHOUSE_BULK_RESTOCK_URL = "http://127.0.0.1:8000/warehouse/restock/bulk"
 
 
 def trigger_fulfillment(
@@ -84,4 +87,70 @@ def trigger_fulfillment(
             return {"error": str(e)}
 
         finally:
-            db.close()
\ No newline at end of file
+            db.close()
+
+def trigger_bulk_fulfillment(order_ids: list):
+    """
+    STEP 56 — One warehouse call for a whole batch of orders.
+    """
+    if not order_ids:
+        return {"fulfilled": 0}
+
+    try:
+        response = requests.post(
+            WAREHOUSE_BULK_URL,
+            json={"order_ids": order_ids},
+            timeout=10
+        )
+
+        if response.status_code != 200:
+            print(f"Warehouse returned non-200 status: {response.status_code}")
+
+        return response.json()
+
+    except Exception as e:
+        print(f"Bulk warehouse trigger failed: {e}")
+        return {"error": str(e)}
+
+
+def trigger_bulk_restock(medicine_ids: list):
+    """
+    STEP 71 — One warehouse call to restock a batch of medicines.
+    Marks each medicine's latest escalation as restock triggered.
+    """
+    if not medicine_ids:
+        return {"restocked": [], "missing": []}
+
+    db = SessionLocal()
+
+    try:
+        print(f"📦 Bulk restock request for {len(medicine_ids)} medicines")
+
+        latest = (
+            db.query(func.max(InventoryEscalation.id))
+            .filter(InventoryEscalation.medicine_id.in_(medicine_ids))
+            .group_by(InventoryEscalation.medicine_id)
+        )
+
+        db.query(InventoryEscalation).filter(
+            InventoryEscalation.id.in_(latest.scalar_subquery())
+        ).update({InventoryEscalation.restock_triggered: True}, synchronize_session=False)
+        db.commit()
+
+        response = requests.post(
+            WAREHOUSE_BULK_RESTOCK_URL,
+            json={"medicine_ids": medicine_ids},
+            timeout=10
+        )
+
+        if response.status_code != 200:
+            print(f"Warehouse returned non-200 status: {response.status_code}")
+
+        return response.json()
+
+    except Exception as e:
+        print(f"Bulk restock trigger failed: {e}")
+        return {"error": str(e)}
+
+    finally:
+        db.close()
@@ -0,0 +1,114 @@
+# backend/perf/bench_medicine_search.py
+# STEP 51 — Benchmark: ILIKE '%name%' scan vs in-memory name index
+#
+# Usage:
+#   python -m backend.perf.bench_medicine_search --medicines 10000 --queries 500
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.core.database import Base
+import backend.app.models  # noqa: F401  (registers all tables)
+from backend.app.models.medicine import Medicine
+from backend.app.services.medicine_search_service import MedicineNameIndex
+
+
+BRANDS = ["NORSAN", "Vividrin", "Panthenol", "Ibuflam", "Aspirin", "Bepanthen",
+          "Voltaren", "Dolormin", "Sinupret", "Mucosolvan", "Cetirizin", "Omeprazol"]
+FORMS = ["Tabletten", "Kapseln", "Spray", "Tropfen", "Salbe", "Gel", "Sirup", "Brausetabletten"]
+QUALIFIERS = ["Omega-3", "Total", "Vegan", "forte", "akut", "Junior", "Duo", "Protect", "extra"]
+
+
+def _synthetic_names(count: int, rng: random.Random) -> list:
+    names = []
+    for i in range(count):
+        names.append(
+            f"{rng.choice(BRANDS)} {rng.choice(QUALIFIERS)} "
+            f"{rng.randint(5, 800)} mg {rng.choice(FORMS)} {i}"
+        )
+    return names
+
+
+def _time_per_query(fn, queries) -> float:
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) / len(queries) * 1_000_000
+
+
+def run(medicine_count: int, query_count: int, seed: int = 42) -> dict:
+    rng = random.Random(seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        db = Session()
+
+        names = _synthetic_names(medicine_count, rng)
+        db.bulk_save_objects([
+            Medicine(name=name, price=1.0, stock=50, prescription_required=False)
+            for name in names
+        ])
+        db.commit()
+
+        # Queries: partial names, lowercase, one typo
+        queries = []
+        for name in rng.sample(names, min(query_count, len(names))):
+            tokens = name.split()
+            q = " ".join(tokens[:3]).lower()
+            if rng.random() < 0.3:
+                pos = rng.randrange(len(q))
+                q = q[:pos] + q[pos + 1:]
+            queries.append(q)
+
+        def ilike_lookup(q):
+            return db.query(Medicine).filter(Medicine.name.ilike(f"%{q}%")).first()
+
+        build_start = time.perf_counter()
+        index = MedicineNameIndex()
+        index.build(db.query(Medicine.id, Medicine.name).all())
+        build_ms = (time.perf_counter() - build_start) * 1000
+
+        ilike_us = _time_per_query(ilike_lookup, queries)
+        index_us = _time_per_query(lambda q: index.search(q, limit=5), queries)
+
+        ilike_hits = sum(1 for q in queries if ilike_lookup(q) is not None)
+        index_hits = sum(1 for q in queries if index.search(q, limit=1))
+
+        db.close()
+        engine.dispose()
+
+    return {
+        "medicines": medicine_count,
+        "queries": len(queries),
+        "index_build_ms": round(build_ms, 2),
+        "ilike_us_per_query": round(ilike_us, 1),
+        "index_us_per_query": round(index_us, 1),
+        "speedup": round(ilike_us / index_us, 1) if index_us else None,
+        "ilike_hit_rate": round(ilike_hits / len(queries), 3),
+        "index_hit_rate": round(index_hits / len(queries), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Medicine name search benchmark")
+    parser.add_argument("--medicines", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    result = run(args.medicines, args.queries, args.seed)
+
+    for key, value in result.items():
+        print(f"{key:>22}: {value}")
+
+
+if __name__ == "__main__":
+    main()
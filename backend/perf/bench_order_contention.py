@@ -0,0 +1,150 @@
+# backend/perf/bench_order_contention.py
+# STEP 55 — Benchmark: concurrent buyers on one SKU
+# Compares the old read-check-write order path with the conditional
+# UPDATE in order_service.place_order. Reports orders/sec, oversold
+# units and lost stock updates.
+#
+# Usage:
+#   python -m backend.perf.bench_order_contention --buyers 50 --stock 100
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.core.database import Base
+import backend.app.models  # noqa: F401  (registers all tables)
+from backend.app.models.medicine import Medicine
+from backend.app.models.order import Order
+from backend.app.models.patient import Patient
+from backend.app.models.user import User
+from backend.app.services.order_service import place_order, InsufficientStock
+
+
+def _naive_order(db, patient_id: int, medicine_id: int, quantity: int) -> bool:
+    # Pre-STEP 55 create_order: check in Python, then write
+    med = db.query(Medicine).filter(Medicine.id == medicine_id).first()
+
+    if med.stock < quantity:
+        return False
+
+    db.add(Order(
+        patient_id=patient_id,
+        medicine_id=medicine_id,
+        quantity=quantity,
+        order_date=datetime.utcnow(),
+        daily_dosage=1
+    ))
+    med.stock -= quantity
+    db.commit()
+    return True
+
+
+def _atomic_order(db, patient_id: int, medicine_id: int, quantity: int) -> bool:
+    try:
+        place_order(db, patient_id, medicine_id, quantity)
+        return True
+    except InsufficientStock:
+        return False
+
+
+STRATEGIES = {"naive": _naive_order, "atomic": _atomic_order}
+
+
+def run(strategy: str, buyers: int, stock: int, attempts: int, quantity: int) -> dict:
+    order_fn = STRATEGIES[strategy]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            connect_args={"check_same_thread": False, "timeout": 30},
+            pool_size=buyers,
+        )
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+
+        setup = Session()
+        user = User(email="buyer@bench.local", hashed_password="-", role="patient")
+        patient = Patient(name="Bench Buyer", age=40, gender="X", owner=user)
+        medicine = Medicine(name="Contended SKU", price=1.0, stock=stock)
+        setup.add_all([user, patient, medicine])
+        setup.commit()
+        patient_id, medicine_id = patient.id, medicine.id
+        setup.close()
+
+        counts = {"created": 0, "rejected": 0, "errors": 0}
+        counts_lock = threading.Lock()
+        barrier = threading.Barrier(buyers)
+
+        def buyer():
+            db = Session()
+            barrier.wait()
+            try:
+                for _ in range(attempts):
+                    try:
+                        outcome = "created" if order_fn(
+                            db, patient_id, medicine_id, quantity
+                        ) else "rejected"
+                    except Exception:
+                        db.rollback()
+                        outcome = "errors"
+
+                    with counts_lock:
+                        counts[outcome] += 1
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=buyer) for _ in range(buyers)]
+
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+
+        check = Session()
+        final_stock = check.query(Medicine.stock).filter(Medicine.id == medicine_id).scalar()
+        ordered_units = sum(q for (q,) in check.query(Order.quantity).all())
+        check.close()
+        engine.dispose()
+
+    return {
+        "strategy": strategy,
+        "buyers": buyers,
+        "attempts": buyers * attempts,
+        "orders_created": counts["created"],
+        "rejected": counts["rejected"],
+        "errors": counts["errors"],
+        "orders_per_sec": round(counts["created"] / elapsed, 1) if elapsed else None,
+        "oversold_units": max(0, ordered_units - stock),
+        "lost_updates": final_stock - (stock - ordered_units),
+        "final_stock": final_stock,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Order creation contention benchmark")
+    parser.add_argument("--buyers", type=int, default=50)
+    parser.add_argument("--stock", type=int, default=100)
+    parser.add_argument("--attempts", type=int, default=5, help="orders per buyer")
+    parser.add_argument("--quantity", type=int, default=1)
+    parser.add_argument("--strategy", choices=[*STRATEGIES, "both"], default="both")
+    args = parser.parse_args()
+
+    strategies = list(STRATEGIES) if args.strategy == "both" else [args.strategy]
+
+    for strategy in strategies:
+        result = run(strategy, args.buyers, args.stock, args.attempts, args.quantity)
+        print()
+        for key, value in result.items():
+            print(f"{key:>16}: {value}")
+
+
+if __name__ == "__main__":
+    main()
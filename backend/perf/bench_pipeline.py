@@ -0,0 +1,354 @@
+# backend/perf/bench_pipeline.py
+# STEP 59 — Benchmark Suite: Scheduler Jobs + Decision Pipeline
+# Runs the scheduler scans and the risk → mitigation pipeline against
+# generated datasets at several scales. Records wall time, SQL query
+# count and peak Python memory per case to JSON, and compares against
+# a saved baseline (exit code 1 on regression).
+#
+# Usage:
+#   python -m backend.perf.bench_pipeline --scales small,medium --output run.json
+#   python -m backend.perf.bench_pipeline --scales small --baseline baseline.json
+#
+# Datasets are generated once per (scale, seed) into --data-dir and
+# copied before every suite run; cases run in a fixed order against
+# that copy, so repeated runs measure scheduler steady state.
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from functools import partial
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, event
+
+from backend.app.core.database import SessionLocal, engine_kwargs
+from backend.app.core.event_dispatcher import event_bus
+from backend.app.models.medicine import Medicine
+from backend.app.services import load_balancer_service
+from backend.app.services.demand_service import run_predictive_demand_scan
+from backend.app.services.event_handlers import register_event_handlers
+from backend.app.services.explainability_service import get_medicine_risk_snapshot
+from backend.app.services.inventory_service import inventory_threshold_scan
+from backend.app.services.mitigation_execution_service import execute_mitigation_if_safe
+from backend.app.services.observability_service import ObservabilityService
+from backend.app.services.refill_service import scan_and_create_refill_alerts
+from backend.perf.generate_dataset import generate
+
+
+SCALES = {
+    "small": dict(medicines=200, patients=2_000, orders=100_000, years=1,
+                  escalations=2_000, audit_logs=20_000, reviews=2_000),
+    "medium": dict(medicines=1_000, patients=10_000, orders=1_000_000, years=2,
+                   escalations=10_000, audit_logs=100_000, reviews=10_000),
+    "large": dict(medicines=5_000, patients=50_000, orders=10_000_000, years=3,
+                  escalations=50_000, audit_logs=500_000, reviews=50_000),
+}
+
+DEFAULT_DATA_DIR = os.path.join("backend", "perf", ".data")
+DEFAULT_TOLERANCE = 0.20
+PER_MEDICINE_SAMPLE = 50
+
+
+# =====================================================
+# INSTRUMENTATION
+# =====================================================
+
+class QueryCounter:
+    """Counts cursor executions on an engine (all threads)."""
+
+    def __init__(self, engine):
+        self.count = 0
+        self._lock = threading.Lock()
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *_):
+        with self._lock:
+            self.count += 1
+
+
+class _OfflineWarehouseResponse:
+    status_code = 200
+
+    def json(self):
+        return {"message": "benchmark: warehouse call skipped"}
+
+
+@contextlib.contextmanager
+def offline_side_effects():
+    """
+    No network and no console spam: warehouse HTTP calls return a
+    canned 200 (all DB writes around them still happen) and job
+    output goes to /dev/null.
+    """
+    with open(os.devnull, "w") as devnull, \
+            patch("backend.app.services.warehouse_service.requests.post",
+                  return_value=_OfflineWarehouseResponse()), \
+            contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _drain_restock_queue() -> int:
+    # The demand scan enqueues restocks, and nothing in the app drains
+    # the queue (process_restock_queue has no caller), so in production
+    # it only grows. Report that growth, then empty it so every run
+    # starts from the same state
+    drained = 0
+    while not load_balancer_service.restock_queue.empty():
+        load_balancer_service.restock_queue.get_nowait()
+        drained += 1
+    return drained
+
+
+# =====================================================
+# CASES
+# =====================================================
+
+def _with_session(fn):
+    def run(*args):
+        db = SessionLocal()
+        try:
+            return fn(db, *args)
+        finally:
+            db.close()
+    return run
+
+
+def build_cases(medicine_sample: list) -> list:
+    """
+    (name, callable) in execution order. Per-medicine cases loop
+    over the same seeded sample of medicine ids.
+    """
+    def risk_snapshots(db):
+        for medicine_id in medicine_sample:
+            get_medicine_risk_snapshot(db, medicine_id)
+
+    def mitigations():
+        for medicine_id in medicine_sample:
+            execute_mitigation_if_safe(medicine_id)
+
+    # Full scans: incremental runs skip everything the first repeat
+    # already covered, so later repeats would measure a no-op
+    return [
+        ("run_predictive_demand_scan", partial(run_predictive_demand_scan, incremental=False)),
+        ("scan_and_create_refill_alerts",
+         _with_session(partial(scan_and_create_refill_alerts, incremental=False))),
+        ("inventory_threshold_scan", inventory_threshold_scan),
+        ("get_medicine_risk_snapshot", _with_session(risk_snapshots)),
+        ("execute_mitigation_if_safe", mitigations),
+        ("system_metrics", _with_session(ObservabilityService.system_metrics)),
+    ]
+
+
+def _wait_for_background_threads(baseline_threads: set, timeout: float = 30):
+    # inventory_threshold_scan publishes EscalationCreated; its restock
+    # and risk handlers run on the event bus pool
+    deadline = time.monotonic() + timeout
+    event_bus.wait_idle(timeout)
+    for thread in threading.enumerate():
+        if thread not in baseline_threads and thread.daemon:
+            thread.join(max(0, deadline - time.monotonic()))
+
+
+def measure(fn, counter: QueryCounter, repeat: int) -> dict:
+    timings, queries, queued = [], [], []
+
+    for _ in range(repeat):
+        threads_before = set(threading.enumerate())
+        queries_before = counter.count
+
+        started = time.perf_counter()
+        with offline_side_effects():
+            fn()
+            _wait_for_background_threads(threads_before)
+        timings.append((time.perf_counter() - started) * 1000)
+
+        queries.append(counter.count - queries_before)
+        queued.append(_drain_restock_queue())
+
+    # Separate run for memory: tracemalloc overhead would skew timings
+    tracemalloc.start()
+    try:
+        with offline_side_effects():
+            fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    event_bus.wait_idle(30)
+    _drain_restock_queue()
+
+    return {
+        "wall_ms": round(statistics.median(timings), 2),
+        "wall_ms_min": round(min(timings), 2),
+        "runs": repeat,
+        "queries": queries[-1],
+        "queries_first_run": queries[0],
+        "restock_queue_growth": queued[-1],
+        "peak_mem_mb": round(peak / (1024 * 1024), 2),
+    }
+
+
+# =====================================================
+# DATASETS + SUITE
+# =====================================================
+
+def prepare_dataset(scale: str, seed: int, data_dir: str, regenerate: bool) -> str:
+    os.makedirs(data_dir, exist_ok=True)
+    source = os.path.join(data_dir, f"{scale}-seed{seed}.db")
+
+    if regenerate or not os.path.exists(source):
+        generate(database_url=f"sqlite:///{source}", seed=seed, **SCALES[scale])
+
+    working = os.path.join(data_dir, f"{scale}-seed{seed}.work.db")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(working + suffix):
+            os.remove(working + suffix)
+    shutil.copyfile(source, working)
+
+    return working
+
+
+def run_scale(scale: str, seed: int, data_dir: str, repeat: int, regenerate: bool) -> dict:
+    path = prepare_dataset(scale, seed, data_dir, regenerate)
+    url = f"sqlite:///{path}"
+
+    engine = create_engine(url, **engine_kwargs(url))
+    counter = QueryCounter(engine)
+    SessionLocal.configure(bind=engine)
+    register_event_handlers()
+
+    db = SessionLocal()
+    medicine_ids = [mid for (mid,) in db.query(Medicine.id).order_by(Medicine.id).all()]
+    db.close()
+
+    medicine_sample = random.Random(seed).sample(
+        medicine_ids, min(PER_MEDICINE_SAMPLE, len(medicine_ids))
+    )
+
+    results = {}
+    for name, fn in build_cases(medicine_sample):
+        print(f"  [{scale}] {name} ...", file=sys.stderr)
+        results[name] = measure(fn, counter, repeat)
+        print(f"  [{scale}] {name}: {results[name]}", file=sys.stderr)
+
+    engine.dispose()
+    return results
+
+
+# =====================================================
+# BASELINE COMPARISON
+# =====================================================
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Regressions: wall time or peak memory above baseline × (1 + tolerance),
+    or any increase in query count.
+    """
+    regressions = []
+
+    for scale, cases in results["results"].items():
+        for case, current in cases.items():
+            previous = baseline.get("results", {}).get(scale, {}).get(case)
+            if not previous:
+                continue
+
+            for metric, allowed in (
+                ("wall_ms", previous["wall_ms"] * (1 + tolerance)),
+                ("peak_mem_mb", previous["peak_mem_mb"] * (1 + tolerance)),
+                ("queries", previous["queries"]),
+            ):
+                if current[metric] > allowed:
+                    regressions.append({
+                        "scale": scale,
+                        "case": case,
+                        "metric": metric,
+                        "baseline": previous[metric],
+                        "current": current[metric],
+                    })
+
+    return regressions
+
+
+def print_report(results: dict, baseline: dict = None):
+    header = f"{'scale':<8} {'case':<32} {'wall_ms':>10} {'queries':>9} {'peak_mb':>9}"
+    if baseline:
+        header += f" {'Δwall':>8} {'Δqueries':>9}"
+    print(header)
+
+    for scale, cases in results["results"].items():
+        for case, r in cases.items():
+            line = f"{scale:<8} {case:<32} {r['wall_ms']:>10} {r['queries']:>9} {r['peak_mem_mb']:>9}"
+
+            previous = (baseline or {}).get("results", {}).get(scale, {}).get(case)
+            if previous:
+                wall_delta = (r["wall_ms"] / previous["wall_ms"] - 1) * 100 if previous["wall_ms"] else 0
+                line += f" {wall_delta:>+7.1f}% {r['queries'] - previous['queries']:>+9}"
+
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scheduler / decision pipeline benchmark suite")
+    parser.add_argument("--scales", default="small", help=f"comma-separated: {','.join(SCALES)}")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR)
+    parser.add_argument("--regenerate", action="store_true", help="rebuild cached datasets")
+    parser.add_argument("--output", default="bench_pipeline.json")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown scales: {unknown}")
+
+    results = {
+        "meta": {
+            "generated_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "medicine_sample": PER_MEDICINE_SAMPLE,
+        },
+        "results": {
+            scale: run_scale(scale, args.seed, args.data_dir, args.repeat, args.regenerate)
+            for scale in scales
+        },
+    }
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print_report(results, baseline)
+
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        results["regressions"] = regressions
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if baseline and results["regressions"]:
+        print(f"\n{len(results['regressions'])} regression(s):")
+        for r in results["regressions"]:
+            print(f"  {r['scale']}/{r['case']} {r['metric']}: {r['baseline']} → {r['current']}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
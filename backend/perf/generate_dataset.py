@@ -0,0 +1,406 @@
+# backend/perf/generate_dataset.py
+# STEP 58 — Synthetic Large-Scale Dataset Generator
+# Fills a database with configurable volumes of medicines, patients,
+# years of orders (per-SKU demand curves), escalations, audit logs
+# and mitigation reviews. Seeded: same arguments → same dataset.
+# The target database is dropped and recreated.
+#
+# Usage:
+#   python -m backend.perf.generate_dataset --database-url sqlite:///./load.db \
+#       --medicines 5000 --patients 100000 --orders 10000000 --years 3
+
+import argparse
+import json
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine, event
+
+from backend.app.core.database import Base, engine_kwargs
+import backend.app.models  # noqa: F401  (registers all tables)
+from backend.app.core.security import get_password_hash
+from backend.app.models.audit_log import AuditLog
+from backend.app.models.inventory_escalation import InventoryEscalation
+from backend.app.models.medicine import Medicine
+from backend.app.models.mitigation_review import MitigationReview
+from backend.app.models.order import Order
+from backend.app.models.patient import Patient
+from backend.app.models.system_config import SystemConfig
+from backend.app.models.user import User
+from backend.app.services.catalog_search_service import ensure_catalog_fts
+from backend.app.services.consumption_rollup_service import ensure_consumption_rollup
+
+
+DEFAULT_BATCH_SIZE = 100_000
+
+BRANDS = ["NORSAN", "Vividrin", "Panthenol", "Ibuflam", "Aspirin", "Bepanthen",
+          "Voltaren", "Dolormin", "Sinupret", "Mucosolvan", "Cetirizin", "Omeprazol",
+          "Paracetamol", "Magnesium", "Vitamin D3", "Loperamid", "Ramipril", "Metformin"]
+FORMS = ["Tabletten", "Kapseln", "Spray", "Tropfen", "Salbe", "Gel", "Sirup", "Brausetabletten"]
+QUALIFIERS = ["Omega-3", "Total", "Vegan", "forte", "akut", "Junior", "Duo", "Protect", "extra"]
+
+# Mon..Sun demand shape (pharmacies are busier early in the week)
+WEEKDAY_FACTORS = np.array([1.15, 1.1, 1.05, 1.0, 1.05, 0.8, 0.35])
+
+DOSAGES = [("1-0-0", 1.0), ("1-0-1", 2.0), ("1-1-1", 3.0), ("Once daily", 1.0), ("2 per day", 2.0)]
+DOSAGE_WEIGHTS = [0.35, 0.3, 0.1, 0.15, 0.1]
+
+AUDIT_EVENTS = ["REVIEW_CREATED", "MITIGATION_EXECUTED", "SAFE_BLOCKED", "REVIEW_APPROVED",
+                "REVIEW_REJECTED", "OBSERVABILITY_CHECK", "CONFIDENCE_SCORE", "DRIFT_ALERT"]
+MODES = ["SAFE", "REVIEW", "AUTO"]
+ACTIONS = ["RESTOCK_IMMEDIATE", "SAFETY_STOCK_INCREASE", "SUPPLIER_ESCALATION"]
+
+
+# =====================================================
+# BULK WRITE
+# =====================================================
+
+def _insert_batches(engine, table, rows, batch_size: int) -> int:
+    """
+    rows: iterable of dicts. One executemany + commit per batch.
+    """
+    written = 0
+    batch = []
+
+    def flush():
+        with engine.begin() as conn:
+            conn.execute(table.insert(), batch)
+
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            flush()
+            written += len(batch)
+            batch = []
+
+    if batch:
+        flush()
+        written += len(batch)
+
+    return written
+
+
+def _timed(label: str, fn, *args) -> int:
+    started = time.perf_counter()
+    count = fn(*args)
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed else 0
+    print(f"  {label:<14} {count:>12,} rows  {elapsed:8.1f}s  {rate:>12,.0f} rows/sec")
+    return count
+
+
+# =====================================================
+# DEMAND MODEL
+# =====================================================
+
+def build_demand_curves(rng, medicine_count: int, days: int, start: date) -> tuple:
+    """
+    Per-SKU popularity (heavy-tailed) and a daily demand shape:
+    linear trend × annual seasonality × weekday factor.
+    Returns (popularity[m], shape[m, d]) — shape rows sum to 1.
+    """
+    popularity = rng.lognormal(mean=0.0, sigma=1.2, size=medicine_count)
+    popularity /= popularity.sum()
+
+    day_index = np.arange(days)
+    years = day_index / 365.0
+
+    trend = rng.uniform(-0.3, 0.6, size=(medicine_count, 1))
+    amplitude = rng.uniform(0.0, 0.5, size=(medicine_count, 1))
+    phase = rng.uniform(0, 2 * np.pi, size=(medicine_count, 1))
+
+    weekdays = (start.weekday() + day_index) % 7
+
+    shape = (
+        np.clip(1 + trend * years, 0.05, None)
+        * (1 + amplitude * np.sin(2 * np.pi * years + phase))
+        * WEEKDAY_FACTORS[weekdays]
+    )
+    shape /= shape.sum(axis=1, keepdims=True)
+
+    return popularity, shape
+
+
+def sample_orders(rng, order_count: int, patient_count: int, popularity, shape) -> dict:
+    """
+    Vectorized order sampling, sorted by day (ids grow with time).
+    """
+    medicine_count, days = shape.shape
+    per_medicine = rng.multinomial(order_count, popularity)
+
+    medicine_idx = np.repeat(np.arange(medicine_count, dtype=np.int32), per_medicine)
+    day_idx = np.empty(order_count, dtype=np.int32)
+
+    offset = 0
+    for m, count in enumerate(per_medicine):
+        if count:
+            day_idx[offset:offset + count] = rng.choice(days, size=count, p=shape[m])
+            offset += count
+
+    order = np.argsort(day_idx, kind="stable")
+
+    return {
+        "medicine_idx": medicine_idx[order],
+        "day_idx": day_idx[order],
+        # Heavy buyers: squared uniform skews toward low patient indices
+        "patient_idx": (rng.random(order_count) ** 2 * patient_count).astype(np.int32),
+        "quantity": (1 + rng.poisson(0.7, size=order_count)).astype(np.int32),
+        "dosage_idx": rng.choice(len(DOSAGES), size=order_count, p=DOSAGE_WEIGHTS).astype(np.int8),
+    }
+
+
+# =====================================================
+# GENERATOR
+# =====================================================
+
+def generate(
+    database_url: str,
+    medicines: int,
+    patients: int,
+    orders: int,
+    years: float,
+    escalations: int,
+    audit_logs: int,
+    reviews: int,
+    seed: int = 42,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict:
+    """
+    Drops and recreates every table, then bulk-loads. Row ids are
+    assigned sequentially from 1, which the foreign keys rely on.
+    """
+    rng = np.random.default_rng(seed)
+    engine = create_engine(database_url, **engine_kwargs(database_url))
+
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _fast_load_pragmas(dbapi_conn, _):
+            cursor = dbapi_conn.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=OFF")
+            cursor.close()
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    today = datetime.utcnow().date()
+    days = max(1, int(years * 365))
+    start = today - timedelta(days=days - 1)
+    calendar = [start + timedelta(days=d) for d in range(days)]
+
+    counts = {}
+    started = time.perf_counter()
+    print(f"Generating dataset (seed={seed}) → {database_url}")
+
+    # --- Medicines ---------------------------------------------------
+    brand = rng.integers(len(BRANDS), size=medicines)
+    qualifier = rng.integers(len(QUALIFIERS), size=medicines)
+    form = rng.integers(len(FORMS), size=medicines)
+    strength = rng.integers(5, 800, size=medicines)
+    price = np.round(rng.uniform(2, 120, size=medicines), 2)
+    stock = rng.integers(0, 600, size=medicines)
+    prescription = rng.random(medicines) < 0.25
+
+    names = [
+        f"{BRANDS[brand[i]]} {QUALIFIERS[qualifier[i]]} {strength[i]} mg {FORMS[form[i]]} #{i + 1}"
+        for i in range(medicines)
+    ]
+
+    counts["medicines"] = _timed("medicines", _insert_batches, engine, Medicine.__table__, (
+        {
+            "name": names[i],
+            "price": float(price[i]),
+            "stock": int(stock[i]),
+            "prescription_required": bool(prescription[i]),
+        }
+        for i in range(medicines)
+    ), batch_size)
+
+    # --- Users + patients (one bcrypt hash for all demo accounts) -------
+    password_hash = get_password_hash("password123")
+    ages = rng.integers(18, 95, size=patients)
+    genders = rng.choice(["F", "M"], size=patients)
+
+    counts["users"] = _timed("users", _insert_batches, engine, User.__table__, (
+        {"email": f"synthetic{i + 1}@load.test", "hashed_password": password_hash, "role": "patient"}
+        for i in range(patients)
+    ), batch_size)
+
+    # Fresh tables: user i+1 owns patient i+1
+    counts["patients"] = _timed("patients", _insert_batches, engine, Patient.__table__, (
+        {
+            "external_patient_id": f"SYN{i + 1:07d}",
+            "name": f"Patient SYN{i + 1:07d}",
+            "age": int(ages[i]),
+            "gender": str(genders[i]),
+            "user_id": i + 1,
+        }
+        for i in range(patients)
+    ), batch_size)
+
+    # --- Orders ---------------------------------------------------------
+    sample_started = time.perf_counter()
+    popularity, shape = build_demand_curves(rng, medicines, days, start)
+    sampled = sample_orders(rng, orders, patients, popularity, shape)
+    print(f"  {'(sampling)':<14} {orders:>12,} rows  {time.perf_counter() - sample_started:8.1f}s")
+
+    def order_rows():
+        medicine_idx = sampled["medicine_idx"]
+        patient_idx = sampled["patient_idx"]
+        day_idx = sampled["day_idx"]
+        quantity = sampled["quantity"]
+        dosage_idx = sampled["dosage_idx"]
+
+        for chunk_start in range(0, orders, batch_size):
+            chunk = slice(chunk_start, chunk_start + batch_size)
+            for m, p, d, q, k in zip(
+                medicine_idx[chunk].tolist(),
+                patient_idx[chunk].tolist(),
+                day_idx[chunk].tolist(),
+                quantity[chunk].tolist(),
+                dosage_idx[chunk].tolist(),
+            ):
+                frequency, daily = DOSAGES[k]
+                yield {
+                    "patient_id": p + 1,
+                    "medicine_id": m + 1,
+                    "quantity": q,
+                    "order_date": calendar[d],
+                    "daily_dosage": daily,
+                    "dosage_frequency": frequency,
+                }
+
+    counts["orders"] = _timed("orders", _insert_batches, engine, Order.__table__, order_rows(), batch_size)
+
+    # --- Escalations, audit logs, reviews --------------------------------
+    span_seconds = days * 86400
+
+    def timestamp(offset):
+        return datetime.combine(start, datetime.min.time()) + timedelta(seconds=int(offset))
+
+    esc_medicine = rng.integers(medicines, size=escalations)
+    esc_stock = rng.integers(0, 10, size=escalations)
+    esc_time = np.sort(rng.integers(span_seconds, size=escalations))
+    esc_triggered = rng.random(escalations) < 0.7
+
+    counts["escalations"] = _timed("escalations", _insert_batches, engine, InventoryEscalation.__table__, (
+        {
+            "medicine_id": int(esc_medicine[i]) + 1,
+            "medicine_name": names[esc_medicine[i]],
+            "current_stock": int(esc_stock[i]),
+            "threshold": 10,
+            "restock_triggered": bool(esc_triggered[i]),
+            "created_at": timestamp(esc_time[i]),
+        }
+        for i in range(escalations)
+    ), batch_size)
+
+    audit_event = rng.integers(len(AUDIT_EVENTS), size=audit_logs)
+    audit_mode = rng.integers(len(MODES), size=audit_logs)
+    audit_risk = rng.integers(0, 100, size=audit_logs)
+    audit_ref = rng.integers(medicines, size=audit_logs)
+    audit_time = np.sort(rng.integers(span_seconds, size=audit_logs))
+
+    counts["audit_logs"] = _timed("audit_logs", _insert_batches, engine, AuditLog.__table__, (
+        {
+            "event_type": AUDIT_EVENTS[audit_event[i]],
+            "actor": "system",
+            "risk_score": int(audit_risk[i]),
+            "mode_at_time": MODES[audit_mode[i]],
+            "decision": "synthetic",
+            "reference_id": int(audit_ref[i]) + 1,
+            "reference_table": "medicines",
+            "created_at": timestamp(audit_time[i]),
+        }
+        for i in range(audit_logs)
+    ), batch_size)
+
+    review_medicine = rng.integers(medicines, size=reviews)
+    review_risk = rng.integers(40, 100, size=reviews)
+    review_action = rng.integers(len(ACTIONS), size=reviews)
+    review_quantity = (rng.integers(4, 40, size=reviews) * 10)
+    review_status = rng.choice(["pending", "approved", "rejected"], size=reviews, p=[0.3, 0.5, 0.2])
+    review_time = np.sort(rng.integers(span_seconds, size=reviews))
+
+    # STEP 70 — Only the newest pending review per medicine stays pending
+    latest_pending = {
+        int(review_medicine[i]): i for i in range(reviews) if review_status[i] == "pending"
+    }
+
+    def review_rows():
+        for i in range(reviews):
+            medicine_id = int(review_medicine[i]) + 1
+            created_at = timestamp(review_time[i])
+            status = str(review_status[i])
+
+            if status == "pending" and latest_pending[medicine_id - 1] != i:
+                status = "superseded"
+            yield {
+                "mitigation_id": medicine_id,
+                "risk_score": int(review_risk[i]),
+                "action_type": ACTIONS[review_action[i]],
+                "payload": json.dumps({
+                    "medicine_id": medicine_id,
+                    "action": ACTIONS[review_action[i]],
+                    "quantity": int(review_quantity[i]),
+                    "risk_score": int(review_risk[i]),
+                }),
+                "status": status,
+                "reviewed_by": None if status == "pending" else 1,
+                "reviewed_at": None if status == "pending" else created_at + timedelta(hours=2),
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+    counts["reviews"] = _timed("reviews", _insert_batches, engine, MitigationReview.__table__, review_rows(), batch_size)
+
+    with engine.begin() as conn:
+        conn.execute(SystemConfig.__table__.insert(), [
+            {"id": 1, "current_mode": "REVIEW", "updated_by": None, "updated_at": datetime.utcnow()}
+        ])
+
+    ensure_catalog_fts(engine, rebuild=True)
+
+    # Triggers are added after the bulk load; one GROUP BY backfills the rollup
+    ensure_consumption_rollup(engine, rebuild=True)
+    engine.dispose()
+
+    elapsed = time.perf_counter() - started
+    print(f"Done in {elapsed:.1f}s")
+
+    return {"seed": seed, "days": days, "seconds": round(elapsed, 2), **counts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic PharmaAgentX dataset generator")
+    # No default: the target is dropped, so never fall back to the app's database
+    parser.add_argument("--database-url", required=True,
+                        help="Target database (dropped and recreated), e.g. sqlite:///./load.db")
+    parser.add_argument("--medicines", type=int, default=2000)
+    parser.add_argument("--patients", type=int, default=20000)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--years", type=float, default=2)
+    parser.add_argument("--escalations", type=int, default=20000)
+    parser.add_argument("--audit-logs", type=int, default=200000)
+    parser.add_argument("--reviews", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    generate(
+        database_url=args.database_url,
+        medicines=args.medicines,
+        patients=args.patients,
+        orders=args.orders,
+        years=args.years,
+        escalations=args.escalations,
+        audit_logs=args.audit_logs,
+        reviews=args.reviews,
+        seed=args.seed,
+        batch_size=args.batch_size,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+# backend/perf/load_http.py
+# STEP 60 — In-Process HTTP Load Harness
+# Drives the FastAPI app over ASGI (httpx.ASGITransport, no server,
+# no sockets) with a weighted mix of authenticated calls. Reports
+# p50/p95/p99 latency, throughput and SQL queries per request for
+# each route.
+#
+# Usage:
+#   python -m backend.perf.load_http --database-url sqlite:///./load.db \
+#       --concurrency 16 --requests 5000 --output load_http.json
+#
+# Point it at a generated dataset (backend.perf.generate_dataset). The
+# app's startup hook is not run, so the scheduler stays off and only
+# request traffic is measured.
+
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime
+
+import httpx
+from sqlalchemy import event
+
+
+# (name, weight, method, path template, token)
+# Weights approximate dashboard traffic: risk and mitigation views per
+# medicine dominate, admin metrics polls are rare.
+DEFAULT_MIX = [
+    ("explain_risk", 35, "GET", "/explain/risk/{medicine_id}", "admin"),
+    ("mitigation", 25, "GET", "/mitigation/{medicine_id}", "admin"),
+    ("refill_predict", 20, "GET", "/refill/predict?patient_id={patient_id}", "patient"),
+    ("ai_context", 15, "GET", "/ai-context/", "patient"),
+    ("system_metrics", 5, "GET", "/admin/system-metrics", "admin"),
+]
+
+LOAD_ADMIN_EMAIL = "load-admin@load.test"
+DEFAULT_PATIENT_SAMPLE = 200
+
+
+# =====================================================
+# QUERY ATTRIBUTION
+# =====================================================
+
+# Each request gets its own counter cell. ASGITransport calls the app
+# in the caller's task and Starlette copies the context into its
+# threadpool, so sync endpoints and dependencies increment the cell
+# of the request that spawned them.
+_request_queries = contextvars.ContextVar("request_queries", default=None)
+
+
+class RequestQueryCounter:
+    """Attributes cursor executions on an engine to the current request."""
+
+    def __init__(self, engine):
+        self.unattributed = 0
+        self._lock = threading.Lock()
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *_):
+        cell = _request_queries.get()
+        if cell is None:
+            with self._lock:
+                self.unattributed += 1
+            return
+        cell[0] += 1
+
+
+# =====================================================
+# FIXTURES
+# =====================================================
+
+def prepare_fixtures(patient_sample: int, seed: int) -> dict:
+    """
+    Ensures a load-test admin exists and mints tokens for it and a
+    seeded sample of patient accounts. Returns ids to parameterise
+    the route templates.
+    """
+    from backend.app.core.database import SessionLocal
+    from backend.app.core.security import create_access_token, get_password_hash
+    from backend.app.models import Medicine, Patient, User
+
+    db = SessionLocal()
+    try:
+        admin = db.query(User).filter(User.email == LOAD_ADMIN_EMAIL).first()
+        if admin is None:
+            admin = User(
+                email=LOAD_ADMIN_EMAIL,
+                hashed_password=get_password_hash("password123"),
+                role="admin",
+            )
+            db.add(admin)
+            db.commit()
+
+        medicine_ids = [mid for (mid,) in db.query(Medicine.id).order_by(Medicine.id).all()]
+
+        patients = (
+            db.query(Patient.id, User.email, User.role)
+            .join(User, Patient.user_id == User.id)
+            .order_by(Patient.id)
+            .all()
+        )
+    finally:
+        db.close()
+
+    if not medicine_ids or not patients:
+        raise SystemExit("Dataset has no medicines or patient accounts — generate one first")
+
+    rng = random.Random(seed)
+    sample = rng.sample(patients, min(patient_sample, len(patients)))
+
+    def token(email, role):
+        return create_access_token({"sub": email, "role": role})
+
+    return {
+        "medicine_ids": medicine_ids,
+        "admin_token": token(LOAD_ADMIN_EMAIL, "admin"),
+        "patients": [
+            {"patient_id": pid, "token": token(email, role)}
+            for pid, email, role in sample
+        ],
+    }
+
+
+# =====================================================
+# LOAD DRIVER
+# =====================================================
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+async def run_load(app, fixtures: dict, mix: list, concurrency: int,
+                   total_requests: int, duration: float, seed: int) -> tuple:
+    samples = {name: {"latency_ms": [], "queries": [], "status": {}} for name, *_ in mix}
+    names = [m[0] for m in mix]
+    weights = [m[1] for m in mix]
+    routes = {m[0]: m[2:] for m in mix}
+
+    issued = 0
+    deadline = time.monotonic() + duration if duration else None
+
+    def next_slot() -> bool:
+        nonlocal issued
+        if deadline is not None:
+            return time.monotonic() < deadline
+        if issued >= total_requests:
+            return False
+        issued += 1
+        return True
+
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://load.test") as client:
+
+        async def worker(worker_id: int):
+            rng = random.Random(seed * 1000 + worker_id)
+
+            while next_slot():
+                name = rng.choices(names, weights)[0]
+                method, template, role = routes[name]
+                patient = rng.choice(fixtures["patients"])
+
+                path = template.format(
+                    medicine_id=rng.choice(fixtures["medicine_ids"]),
+                    patient_id=patient["patient_id"],
+                )
+                token = fixtures["admin_token"] if role == "admin" else patient["token"]
+
+                cell = [0]
+                reset = _request_queries.set(cell)
+                started = time.perf_counter()
+                try:
+                    response = await client.request(
+                        method, path, headers={"Authorization": f"Bearer {token}"}
+                    )
+                    status = str(response.status_code)
+                except Exception as exc:
+                    status = type(exc).__name__
+                finally:
+                    elapsed = (time.perf_counter() - started) * 1000
+                    _request_queries.reset(reset)
+
+                bucket = samples[name]
+                bucket["latency_ms"].append(elapsed)
+                bucket["queries"].append(cell[0])
+                bucket["status"][status] = bucket["status"].get(status, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        wall = time.perf_counter() - started
+
+    return samples, wall
+
+
+def summarise(samples: dict, wall_seconds: float) -> dict:
+    routes = {}
+
+    for name, bucket in samples.items():
+        latencies = sorted(bucket["latency_ms"])
+        if not latencies:
+            continue
+
+        routes[name] = {
+            "requests": len(latencies),
+            "throughput_rps": round(len(latencies) / wall_seconds, 2),
+            "p50_ms": round(_percentile(latencies, 50), 2),
+            "p95_ms": round(_percentile(latencies, 95), 2),
+            "p99_ms": round(_percentile(latencies, 99), 2),
+            "max_ms": round(latencies[-1], 2),
+            "queries_per_request": round(statistics.mean(bucket["queries"]), 2),
+            "queries_max": max(bucket["queries"]),
+            "status": bucket["status"],
+        }
+
+    total = sum(r["requests"] for r in routes.values())
+    return {
+        "wall_seconds": round(wall_seconds, 3),
+        "total_requests": total,
+        "throughput_rps": round(total / wall_seconds, 2) if wall_seconds else 0,
+        "routes": routes,
+    }
+
+
+def print_report(summary: dict):
+    print(f"{'route':<16} {'reqs':>7} {'rps':>9} {'p50_ms':>9} {'p95_ms':>9} "
+          f"{'p99_ms':>9} {'q/req':>7}  status")
+
+    for name, r in summary["routes"].items():
+        status = ",".join(f"{code}:{n}" for code, n in sorted(r["status"].items()))
+        print(f"{name:<16} {r['requests']:>7} {r['throughput_rps']:>9} {r['p50_ms']:>9} "
+              f"{r['p95_ms']:>9} {r['p99_ms']:>9} {r['queries_per_request']:>7}  {status}")
+
+    print(f"\n{summary['total_requests']} requests in {summary['wall_seconds']}s "
+          f"→ {summary['throughput_rps']} req/s")
+
+
+def parse_mix(spec: str) -> list:
+    """'explain_risk=50,system_metrics=1' → DEFAULT_MIX reweighted (0 drops a route)."""
+    if not spec:
+        return DEFAULT_MIX
+
+    weights = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = int(weight)
+
+    known = {m[0] for m in DEFAULT_MIX}
+    unknown = set(weights) - known
+    if unknown:
+        raise SystemExit(f"unknown routes in --mix: {sorted(unknown)} (known: {sorted(known)})")
+
+    mix = [(name, weights.get(name, 0), *rest) for name, _, *rest in DEFAULT_MIX]
+    return [m for m in mix if m[1] > 0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process HTTP load harness (ASGI, no server)")
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL / the app default")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000, help="total requests (ignored with --duration)")
+    parser.add_argument("--duration", type=float, help="run for N seconds instead of a request count")
+    parser.add_argument("--mix", default="", help="route weights, e.g. explain_risk=50,system_metrics=1")
+    parser.add_argument("--patients", type=int, default=DEFAULT_PATIENT_SAMPLE, help="patient accounts to rotate")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results JSON here")
+    args = parser.parse_args()
+
+    # The engine is built from DATABASE_URL at import time
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    from backend.app.core.database import engine
+    from backend.app.main import app
+
+    mix = parse_mix(args.mix)
+    counter = RequestQueryCounter(engine)
+    fixtures = prepare_fixtures(args.patients, args.seed)
+
+    print(f"Driving {len(mix)} routes with {args.concurrency} workers ...", file=sys.stderr)
+    samples, wall = asyncio.run(run_load(
+        app, fixtures, mix, args.concurrency, args.requests, args.duration, args.seed
+    ))
+
+    summary = summarise(samples, wall)
+    print_report(summary)
+
+    if args.output:
+        result = {
+            "meta": {
+                "generated_at": datetime.utcnow().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "database_url": str(engine.url),
+                "concurrency": args.concurrency,
+                "seed": args.seed,
+                "mix": {m[0]: m[1] for m in mix},
+                "unattributed_queries": counter.unattributed,
+            },
+            **summary,
+        }
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
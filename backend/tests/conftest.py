@@ -0,0 +1,36 @@
+# backend/tests/conftest.py
+# Shared fixtures: one in-memory SQLite database per test. Modules seed
+# it by overriding `db` (def db(db): ...) rather than rebuilding it.
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.app.core.database import Base
+import backend.app.models  # noqa: F401  (registers all tables)
+
+
+@pytest.fixture
+def bare_engine():
+    """In-memory SQLite with no tables (legacy schema tests)."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def engine(bare_engine):
+    Base.metadata.create_all(bind=bare_engine)
+    return bare_engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
@@ -0,0 +1,107 @@
+# backend/tests/test_consumption_rollup.py
+# Tests for Step 64 — Daily Consumption Rollup
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models.medicine_daily_consumption import MedicineDailyConsumption
+from backend.app.models.order import Order
+from backend.app.services import consumption_rollup_service
+from backend.app.services.consumption_rollup_service import (
+    ensure_consumption_rollup,
+    rebuild_consumption_rollup,
+    window_order_count,
+    window_quantity,
+    window_totals,
+)
+
+
+DAY = date(2026, 3, 10)
+
+
+@pytest.fixture
+def engine(engine):
+    yield engine
+    consumption_rollup_service._rollup_available = None
+
+
+@pytest.fixture
+def db(engine, db):
+    ensure_consumption_rollup(engine)
+    return db
+
+
+def _order(db, medicine_id, quantity, order_date):
+    order = Order(patient_id=1, medicine_id=medicine_id, quantity=quantity,
+                  order_date=order_date, daily_dosage=1)
+    db.add(order)
+    db.commit()
+    return order
+
+
+def _rollup(db):
+    return {
+        (row.medicine_id, row.day): (row.qty, row.order_count)
+        for row in db.query(MedicineDailyConsumption).all()
+    }
+
+
+class TestTriggers:
+
+    def test_insert_accumulates_per_day(self, db):
+        _order(db, 1, 5, DAY)
+        _order(db, 1, 3, DAY)
+        assert _rollup(db)[(1, DAY)] == (8, 2)
+
+    def test_update_moves_quantity_between_days(self, db):
+        order = _order(db, 1, 5, DAY)
+        order.order_date = DAY + timedelta(days=1)
+        db.commit()
+
+        rollup = _rollup(db)
+        assert rollup[(1, DAY)] == (0, 0)
+        assert rollup[(1, DAY + timedelta(days=1))] == (5, 1)
+
+    def test_delete_subtracts(self, db):
+        order = _order(db, 1, 5, DAY)
+        _order(db, 1, 2, DAY)
+        db.delete(order)
+        db.commit()
+        assert _rollup(db)[(1, DAY)] == (2, 1)
+
+
+class TestRebuild:
+
+    def test_backfills_history_loaded_before_triggers(self, engine):
+        session = sessionmaker(bind=engine)()
+        _order(session, 4, 10, DAY)
+        _order(session, 4, 6, DAY - timedelta(days=2))
+
+        rebuild_consumption_rollup(engine)
+        assert _rollup(session) == {
+            (4, DAY): (10, 1),
+            (4, DAY - timedelta(days=2)): (6, 1),
+        }
+        session.close()
+
+
+class TestWindows:
+
+    def test_window_bounds_are_half_open(self, db):
+        _order(db, 1, 5, DAY - timedelta(days=7))
+        _order(db, 1, 3, DAY - timedelta(days=1))
+        _order(db, 2, 9, DAY)
+
+        assert window_quantity(db, 1, DAY - timedelta(days=7)) == 8
+        assert window_quantity(db, 1, DAY - timedelta(days=14), DAY - timedelta(days=1)) == 5
+        assert window_order_count(db, 1, DAY - timedelta(days=1)) == 1
+
+    def test_empty_window_is_zero(self, db):
+        assert window_totals(db, 99, DAY) == (0, 0)
+
+    def test_falls_back_to_orders_without_rollup(self, db):
+        _order(db, 1, 5, DAY)
+        consumption_rollup_service._rollup_available = False
+        assert window_totals(db, 1, DAY) == (5, 1)
@@ -0,0 +1,143 @@
+# backend/tests/test_event_bus.py
+# Tests for Step 63 — In-Process Event Bus
+
+import threading
+
+import pytest
+
+from backend.app.core.event_dispatcher import (
+    EscalationCreated,
+    EventBus,
+    ModeChanged,
+    OrderCreated,
+    StockChanged,
+)
+from backend.app.services import event_handlers
+
+
+def _order(medicine_id=1, patient_id=1, order_id=1):
+    return OrderCreated(order_id=order_id, patient_id=patient_id, medicine_id=medicine_id, quantity=2)
+
+
+@pytest.fixture
+def bus():
+    bus = EventBus(max_workers=2, max_pending=10)
+    yield bus
+    bus.shutdown()
+
+
+class TestDispatch:
+
+    def test_handler_receives_typed_event(self, bus):
+        seen = []
+        bus.subscribe(OrderCreated, seen.append)
+
+        bus.publish(_order(medicine_id=7))
+        assert bus.wait_idle(5)
+
+        assert seen == [_order(medicine_id=7)]
+
+    def test_only_matching_event_type_is_dispatched(self, bus):
+        seen = []
+        bus.subscribe(StockChanged, seen.append)
+
+        bus.publish(_order())
+        bus.publish(ModeChanged(old_mode="SAFE", new_mode="AUTO"))
+        assert bus.wait_idle(5)
+
+        assert seen == []
+
+    def test_publish_without_handlers_is_noop(self, bus):
+        bus.publish(_order())
+        assert bus.stats()["dispatched"] == 0
+
+    def test_failing_handler_is_counted_not_raised(self, bus):
+        def boom(event):
+            raise RuntimeError("handler failed")
+
+        bus.subscribe(OrderCreated, boom)
+        bus.publish(_order())
+        assert bus.wait_idle(5)
+
+        assert bus.stats()["failed"] == 1
+
+
+class TestCoalescingAndBounds:
+
+    def _blocked_bus(self, bus):
+        # Occupy both workers so later submissions stay queued
+        release = threading.Event()
+        started = threading.Barrier(3)
+
+        def hold(event):
+            started.wait(5)
+            release.wait(5)
+
+        bus.subscribe(StockChanged, hold)
+        bus.publish(StockChanged(medicine_id=100, delta=1, reason="hold"))
+        bus.publish(StockChanged(medicine_id=101, delta=1, reason="hold"))
+        started.wait(5)
+        return release
+
+    def test_same_key_coalesces_while_queued(self, bus):
+        calls = []
+        release = self._blocked_bus(bus)
+        bus.subscribe(OrderCreated, calls.append, key=lambda e: e.medicine_id)
+
+        for order_id in range(5):
+            bus.publish(_order(medicine_id=3, order_id=order_id))
+        bus.publish(_order(medicine_id=4))
+
+        release.set()
+        assert bus.wait_idle(5)
+
+        assert sorted(e.medicine_id for e in calls) == [3, 4]
+        assert bus.stats()["coalesced"] == 4
+
+    def test_queue_full_drops_and_counts(self):
+        bus = EventBus(max_workers=2, max_pending=2)
+        try:
+            calls = []
+            release = self._blocked_bus(bus)
+            bus.subscribe(OrderCreated, calls.append)
+
+            for order_id in range(5):
+                bus.publish(_order(order_id=order_id))
+
+            release.set()
+            assert bus.wait_idle(5)
+
+            assert len(calls) == 2
+            assert bus.stats()["dropped"] == 3
+        finally:
+            bus.shutdown()
+
+
+class TestRegistration:
+
+    def _handler_names(self, bus, event_type):
+        return {handler.__name__ for handler, _ in bus._handlers.get(event_type, [])}
+
+    def test_events_never_execute_or_enqueue_restocks(self, bus):
+        event_handlers.register_event_handlers(bus)
+
+        assert self._handler_names(bus, OrderCreated) == {
+            "refresh_patient_refills", "check_medicine_inventory", "evaluate_medicine_risk"
+        }
+        assert self._handler_names(bus, StockChanged) == {"check_medicine_inventory"}
+        assert self._handler_names(bus, EscalationCreated) == {"signal_restock", "evaluate_medicine_risk"}
+
+    def test_risk_evaluation_is_read_only(self, monkeypatch):
+        sessions = []
+
+        class FakeSession:
+            def close(self):
+                sessions.append("closed")
+
+        monkeypatch.setattr(event_handlers, "SessionLocal", FakeSession)
+        monkeypatch.setattr(event_handlers, "get_medicine_risk_snapshot",
+                            lambda db, medicine_id: {"risk_score": 95})
+
+        event_handlers.evaluate_medicine_risk(_order(medicine_id=7))
+
+        assert sessions == ["closed"]
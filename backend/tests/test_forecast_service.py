@@ -0,0 +1,69 @@
+# backend/tests/test_forecast_service.py
+# Tests for Step 66 — Vectorized Demand Forecasting + Backtest
+
+import numpy as np
+import pytest
+
+from backend.app.services.forecast_service import (
+    MODELS,
+    _mape,
+    _stockout_days,
+    forecast_matrix,
+)
+
+
+def _weekly_pattern(weeks: int, base: float = 10.0) -> np.ndarray:
+    shape = np.array([1.5, 1.2, 1.0, 1.0, 1.0, 0.5, 0.3])
+    return np.tile(shape * base, weeks)
+
+
+class TestModels:
+
+    @pytest.mark.parametrize("model", MODELS)
+    def test_constant_demand_is_forecast_flat(self, model):
+        history = np.full((3, 60), 4.0)
+        forecast = forecast_matrix(history, 10, model)
+
+        assert forecast.shape == (3, 10)
+        np.testing.assert_allclose(forecast, 4.0, atol=1e-6)
+
+    def test_rows_are_independent(self):
+        history = np.vstack([np.full(60, 2.0), np.full(60, 20.0)])
+        forecast = forecast_matrix(history, 5, "ses")
+        np.testing.assert_allclose(forecast[:, 0], [2.0, 20.0], atol=1e-6)
+
+    def test_holt_follows_upward_trend(self):
+        history = np.arange(60, dtype=float)[None, :]
+        forecast = forecast_matrix(history, 10, "holt")
+        assert forecast[0, -1] > forecast[0, 0] > 55
+
+    def test_falling_trend_is_clipped_at_zero(self):
+        history = np.linspace(30, 0, 60)[None, :]
+        assert forecast_matrix(history, 60, "holt").min() >= 0
+
+    def test_weekly_model_tracks_weekday_shape(self):
+        history = _weekly_pattern(12)[None, :]
+        forecast = forecast_matrix(history, 7, "holt_weekly")[0]
+        # history is 84 days → the forecast starts on weekday slot 0
+        np.testing.assert_allclose(forecast, _weekly_pattern(1), rtol=0.1)
+
+    def test_unknown_model_raises(self):
+        with pytest.raises(ValueError):
+            forecast_matrix(np.zeros((1, 10)), 5, "arima")
+
+    def test_empty_history_forecasts_zero(self):
+        assert forecast_matrix(np.zeros((2, 0)), 3, "holt").sum() == 0
+
+
+class TestScoring:
+
+    def test_mape_on_horizon_totals_ignores_zero_demand(self):
+        actual = np.array([[10.0, 10.0], [0.0, 0.0]])
+        forecast = np.array([[5.0, 5.0], [3.0, 3.0]])
+        assert _mape(actual, forecast) == pytest.approx(50.0)
+
+    def test_stockout_days_counts_days_below_zero(self):
+        actual = np.array([[5.0, 5.0, 5.0, 5.0]])
+        forecast = np.array([[2.0, 2.0, 2.0, 2.0]])
+        # stock = 8 + 2 * 1 safety day = 10 → dry after day 2
+        assert list(_stockout_days(actual, forecast, safety_days=1)) == [2]
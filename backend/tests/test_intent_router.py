@@ -0,0 +1,96 @@
+# backend/tests/test_intent_router.py
+# Tests for Step 50 — Deterministic Intent Fast Path
+
+from unittest.mock import patch
+
+from backend.app.agent import intent_router
+from backend.app.agent.intent_router import (
+    RouterStats,
+    classify_intent,
+    route_message,
+)
+
+
+class TestClassifyIntent:
+
+    def test_refill_question_routes_to_refill(self):
+        assert classify_intent("Do I need a refill?") == {"intent": "refill"}
+
+    def test_overdue_question_routes_to_refill(self):
+        assert classify_intent("Is anything overdue") == {"intent": "refill"}
+
+    def test_next_refill_question_routes_to_refill(self):
+        assert classify_intent("When is my next refill due?") == {"intent": "refill"}
+
+    def test_refill_request_falls_back_to_llm(self):
+        assert classify_intent("I need a refill of metformin") is None
+        assert classify_intent("Can I get a refill?") is None
+
+    def test_non_status_refill_mentions_fall_back_to_llm(self):
+        assert classify_intent("why did my refill get cancelled?") is None
+        assert classify_intent("what are the side effects of refills") is None
+        assert classify_intent(
+            "can you explain what overdue means for my insulin dosage"
+        ) is None
+
+    def test_in_stock_question_extracts_medicine_name(self):
+        result = classify_intent("Is Paracetamol 500mg in stock?")
+        assert result == {"intent": "inventory", "medicine_name": "paracetamol 500mg"}
+
+    def test_do_you_have_question_strips_filler(self):
+        result = classify_intent("Do you have any NORSAN Omega-3?")
+        assert result == {"intent": "inventory", "medicine_name": "norsan omega-3"}
+
+    def test_stock_of_question_extracts_medicine_name(self):
+        result = classify_intent("check stock of ibuprofen")
+        assert result["medicine_name"] == "ibuprofen"
+
+    def test_order_intent_falls_back_to_llm(self):
+        assert classify_intent("I want to order 2 ibuprofen") is None
+
+    def test_mixed_refill_and_inventory_is_ambiguous(self):
+        assert classify_intent("Is my refill in stock?") is None
+
+    def test_free_text_falls_back_to_llm(self):
+        assert classify_intent("What are the side effects of aspirin?") is None
+
+    def test_empty_message_falls_back_to_llm(self):
+        assert classify_intent("") is None
+
+
+class TestRouteMessage:
+
+    def test_refill_intent_calls_refill_tool_with_patient(self):
+        with patch.object(intent_router, "proactive_refill_check", return_value="ok") as tool:
+            result = route_message("check refill", patient_id=7)
+        tool.assert_called_once_with(7)
+        assert result == {"response": "ok", "intent": "refill"}
+
+    def test_inventory_intent_calls_inventory_tool(self):
+        with patch.object(intent_router, "check_inventory", return_value="in stock") as tool:
+            result = route_message("is aspirin available", patient_id=7)
+        tool.assert_called_once_with("aspirin")
+        assert result["intent"] == "inventory"
+
+    def test_ambiguous_message_returns_none(self):
+        assert route_message("hello there", patient_id=7) is None
+
+
+class TestRouterStats:
+
+    def test_snapshot_reports_share_and_latency_per_path(self):
+        stats = RouterStats()
+        stats.record("fast", 2.0)
+        stats.record("fast", 4.0)
+        stats.record("llm", 1000.0)
+
+        snapshot = stats.snapshot()
+
+        assert snapshot["total_requests"] == 3
+        assert snapshot["paths"]["fast"]["count"] == 2
+        assert snapshot["paths"]["fast"]["share"] == round(2 / 3, 4)
+        assert snapshot["paths"]["fast"]["avg_latency_ms"] == 3.0
+        assert snapshot["paths"]["llm"]["p95_latency_ms"] == 1000.0
+
+    def test_empty_snapshot(self):
+        assert RouterStats().snapshot() == {"total_requests": 0, "paths": {}}
@@ -0,0 +1,172 @@
+# backend/tests/test_inventory_simulation.py
+# Tests for Step 67 — Fast-Forward Inventory Simulation
+
+from dataclasses import replace
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from backend.app.services.demand_service import (
+    calculate_dynamic_restock_quantity,
+    calculate_priority,
+)
+from backend.app.services.explainability_service import compute_risk_score
+from backend.app.services.forecast_service import FIT_DAYS
+from backend.app.services.inventory_simulation_service import (
+    WAREHOUSE_RESTOCK_UNITS,
+    SimulationClock,
+    SimulationHistory,
+    SimulationPolicy,
+    priority_scores,
+    restock_quantities,
+    risk_scores,
+    run_simulation,
+    synthetic_history,
+)
+
+
+START = date(2026, 1, 1)
+
+
+def _history(daily_qty, skus=1, days=30, initial_stock=100.0):
+    total = FIT_DAYS + days
+    qty = np.full((skus, total), float(daily_qty))
+    return SimulationHistory(
+        medicine_ids=list(range(1, skus + 1)),
+        start=START,
+        qty=qty,
+        orders=(qty > 0).astype(np.int64),
+        initial_stock=np.full(skus, float(initial_stock)),
+        simulate_from=FIT_DAYS,
+    )
+
+
+class TestRuleParity:
+
+    def test_priority_matches_scalar_engine(self):
+        rng = np.random.default_rng(1)
+        days_left = rng.uniform(0, 20, 500)
+        avg = rng.uniform(0, 40, 500)
+        stock = rng.integers(0, 500, 500)
+        projected = rng.uniform(0, 900, 500)
+        escalation = rng.random(500) < 0.3
+
+        scores = priority_scores(days_left, avg, stock, projected, escalation)
+
+        for i in range(500):
+            expected = calculate_priority(days_left[i], avg[i], stock[i], projected[i], bool(escalation[i]))
+            actual = "CRITICAL" if scores[i] >= 70 else "WARNING" if scores[i] >= 40 else "STABLE"
+            assert actual == expected
+
+    def test_restock_quantity_matches_scalar_engine(self):
+        rng = np.random.default_rng(2)
+        avg = np.concatenate([[0.0], rng.uniform(0, 30, 499)])
+        stock = rng.integers(0, 800, 500)
+
+        quantities = restock_quantities(avg, stock)
+
+        for i in range(500):
+            assert quantities[i] == calculate_dynamic_restock_quantity(avg[i], int(stock[i]))
+
+    def test_risk_score_matches_scalar_engine(self):
+        rng = np.random.default_rng(3)
+        n = 500
+        args = (
+            rng.uniform(0, 20, n),
+            rng.uniform(0, 200, n),
+            rng.random(n) < 0.3,
+            rng.uniform(0, 2, n),
+            rng.uniform(-0.5, 0.8, n),
+            rng.integers(0, 6, n),
+        )
+
+        scores = risk_scores(*args)
+
+        for i in range(n):
+            assert scores[i] == compute_risk_score(*(float(a[i]) if a.dtype.kind == "f" else a[i].item() for a in args))
+
+
+class TestEngine:
+
+    def test_ample_stock_without_demand_does_nothing(self):
+        result = run_simulation(_history(0, initial_stock=100))
+
+        assert result["stockout_days"] == 0
+        assert result["restock_count"] == 0
+        assert result["avg_inventory_held"] == 100
+
+    def test_unmet_demand_counts_stockout_days(self):
+        result = run_simulation(_history(60, days=10, initial_stock=0), SimulationPolicy(mode="SAFE"))
+
+        # Day one is short; the scans restock from then on
+        assert result["stockout_days"] >= 1
+        assert result["unmet_units"] >= 60
+        assert result["restocks_by_source"]["inventory_scan"] > 0
+        assert result["fill_rate"] < 1
+
+    def test_low_stock_escalation_restocks_fixed_units(self):
+        policy = SimulationPolicy(mode="SAFE", predictive_depletion_threshold_days=0)
+        result = run_simulation(_history(0, days=5, initial_stock=5), policy)
+
+        assert result["restocks_by_source"]["inventory_scan"] == 1
+        assert result["units_restocked"] == WAREHOUSE_RESTOCK_UNITS
+
+    def test_lead_time_delays_delivery(self):
+        # 5 units at 2/day run out on day 3, before a 3-day delivery lands
+        policy = SimulationPolicy(mode="SAFE", predictive_depletion_threshold_days=0, lead_time_days=3)
+        instant = run_simulation(_history(2, days=10, initial_stock=5), replace(policy, lead_time_days=0))
+        delayed = run_simulation(_history(2, days=10, initial_stock=5), policy)
+
+        assert instant["stockout_days"] == 0
+        assert delayed["stockout_days"] > 0
+
+    def test_no_re_escalation_while_restock_in_transit(self):
+        policy = SimulationPolicy(mode="SAFE", predictive_depletion_threshold_days=0, lead_time_days=3)
+        result = run_simulation(_history(2, days=3, initial_stock=5), policy)
+
+        assert result["restocks_by_source"]["inventory_scan"] == 1
+
+    def test_review_mode_creates_reviews_instead_of_mitigations(self):
+        result = run_simulation(_history(10, days=5, initial_stock=0), SimulationPolicy(mode="REVIEW"))
+
+        assert result["restocks_by_source"]["mitigation"] == 0
+        assert result["reviews_created"] == 5
+
+    def test_honor_quantity_uses_dynamic_restock(self):
+        policy = SimulationPolicy(mode="SAFE", honor_restock_quantity=True, drain_restock_queue=True)
+        result = run_simulation(_history(10, days=1, initial_stock=0), policy)
+
+        # 30 days + 7 safety days of 10/day, one request
+        assert result["restocks_by_source"]["demand_scan"] == 1
+        assert result["units_restocked"] >= 370
+
+    def test_demand_scan_restocks_stay_queued(self):
+        policy = SimulationPolicy(mode="SAFE", low_stock_threshold=0)
+        result = run_simulation(_history(10, days=5, initial_stock=0), policy)
+
+        # Requested every day, never delivered: the queue is not drained
+        assert result["restocks_by_source"]["demand_scan"] == 5
+        assert result["units_queued"] == 5 * WAREHOUSE_RESTOCK_UNITS
+        assert result["units_restocked"] == 0
+        assert result["stockout_days"] == 5
+
+    def test_clock_is_injected_and_advanced(self):
+        first_day = START + timedelta(days=FIT_DAYS + 10)
+        clock = SimulationClock(first_day)
+
+        result = run_simulation(_history(1, days=30), clock=clock)
+
+        assert result["days"] == 20
+        assert clock.today == START + timedelta(days=FIT_DAYS + 30)
+
+    def test_clock_before_warm_up_is_rejected(self):
+        with pytest.raises(ValueError):
+            run_simulation(_history(1), clock=SimulationClock(START))
+
+    def test_synthetic_year_runs(self):
+        result = run_simulation(synthetic_history(skus=200, days=60))
+
+        assert result["skus"] == 200
+        assert result["days"] == 60
+        assert 0 < result["fill_rate"] <= 1
@@ -0,0 +1,83 @@
+# backend/tests/test_medicine_search.py
+# Tests for Step 51 — Indexed Fuzzy Medicine Name Search
+
+from backend.app.services.medicine_search_service import (
+    MedicineNameIndex,
+    normalize_name,
+    trigrams,
+)
+
+
+CATALOG = [
+    (1, "NORSAN Omega-3 Total"),
+    (2, "NORSAN Omega-3 Vegan"),
+    (3, "Vividrin® iso EDO® antiallergische Augentropfen"),
+    (4, "Panthenol Spray, 46,3 mg/g Schaum zur Anwendung auf der Haut"),
+    (5, "Ibuflam akut 400 mg Filmtabletten"),
+]
+
+
+def _index():
+    index = MedicineNameIndex()
+    index.build(CATALOG)
+    return index
+
+
+class TestNormalization:
+
+    def test_normalize_strips_symbols_and_case(self):
+        assert normalize_name("Vividrin® iso EDO®") == "vividrin iso edo"
+
+    def test_normalize_strips_accents(self):
+        assert normalize_name("Fördert Café") == "fordert cafe"
+
+    def test_trigrams_are_padded_per_token(self):
+        assert trigrams("ab") == {"  a", " ab", "ab "}
+
+
+class TestMedicineNameIndex:
+
+    def test_exact_name_scores_one(self):
+        results = _index().search("norsan omega-3 vegan")
+        assert results[0]["medicine_id"] == 2
+        assert results[0]["score"] == 1.0
+
+    def test_partial_name_matches_like_ilike(self):
+        results = _index().search("omega")
+        assert {r["medicine_id"] for r in results} == {1, 2}
+
+    def test_prefix_token_matches(self):
+        results = _index().search("panthen")
+        assert results[0]["medicine_id"] == 4
+
+    def test_typo_is_tolerated(self):
+        results = _index().search("ibuflm")
+        assert results[0]["medicine_id"] == 5
+
+    def test_more_specific_query_ranks_best_candidate_first(self):
+        results = _index().search("norsan total")
+        assert results[0]["medicine_id"] == 1
+
+    def test_unknown_name_returns_nothing(self):
+        assert _index().search("xylometazolin") == []
+
+    def test_limit_is_respected(self):
+        assert len(_index().search("norsan", limit=1)) == 1
+
+    def test_incremental_add_is_searchable(self):
+        index = _index()
+        index.add(6, "Aspirin Complex Granulat")
+        assert index.search("aspirin")[0]["medicine_id"] == 6
+        assert 6 in index
+
+    def test_remove_drops_medicine_from_results(self):
+        index = _index()
+        index.remove(1)
+        assert [r["medicine_id"] for r in index.search("omega")] == [2]
+        assert 1 not in index
+
+    def test_rename_replaces_old_tokens(self):
+        index = _index()
+        index.add(5, "Dolormin extra")
+        assert index.search("ibuflam") == []
+        assert index.search("dolormin")[0]["medicine_id"] == 5
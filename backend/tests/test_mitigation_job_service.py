@@ -0,0 +1,133 @@
+# backend/tests/test_mitigation_job_service.py
+# Tests for Step 72 — Background Execution of Approved Mitigations
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models.mitigation_job import MitigationJob
+from backend.app.services import mitigation_job_service
+from backend.app.services.mitigation_job_service import (
+    RUNNING_TIMEOUT_SECONDS,
+    get_job,
+    recover_jobs,
+    run_job,
+)
+
+
+PAYLOAD = {"medicine_id": 1, "action": "RESTOCK_IMMEDIATE", "quantity": 40, "risk_score": 90}
+
+
+@pytest.fixture
+def db(engine, db, monkeypatch):
+    monkeypatch.setattr(mitigation_job_service, "SessionLocal", sessionmaker(bind=engine))
+    return db
+
+
+@pytest.fixture
+def executions(monkeypatch):
+    """Queue of fake execute_mitigations_from_payloads outcomes."""
+    outcomes = []
+
+    def fake_execute(payloads):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return [dict(outcome) for _ in payloads]
+
+    monkeypatch.setattr(mitigation_job_service, "execute_mitigations_from_payloads", fake_execute)
+    return outcomes
+
+
+def _job(db, **overrides):
+    job = MitigationJob(
+        status=overrides.pop("status", "queued"),
+        review_ids=json.dumps([10]),
+        payloads=json.dumps([PAYLOAD]),
+        next_attempt_at=overrides.pop("next_attempt_at", datetime.utcnow() - timedelta(seconds=1)),
+        **overrides
+    )
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def _make_due(db, job_id):
+    db.query(MitigationJob).filter(MitigationJob.id == job_id).update(
+        {MitigationJob.next_attempt_at: datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+
+
+class TestRunJob:
+
+    def test_success_records_results(self, db, executions):
+        executions.append({"status": "executed", "action": "RESTOCK_IMMEDIATE", "quantity": 40})
+        job_id = _job(db)
+
+        assert run_job(job_id) == "succeeded"
+
+        job = get_job(db, job_id)
+        assert job["attempts"] == 1
+        assert job["last_error"] is None
+        assert job["results"][0]["status"] == "executed"
+        assert job["finished_at"] is not None
+
+    def test_finished_job_is_not_run_again(self, db, executions):
+        executions.append({"status": "executed"})
+        job_id = _job(db)
+        run_job(job_id)
+
+        assert run_job(job_id) is None
+        assert get_job(db, job_id)["attempts"] == 1
+
+    def test_failures_retry_with_backoff_then_fail(self, db, executions):
+        executions.extend([
+            {"status": "failed", "error": "timed out"},
+            RuntimeError("boom"),
+            {"status": "failed", "error": "timed out"},
+        ])
+        job_id = _job(db, max_attempts=3)
+
+        assert run_job(job_id) == "queued"
+        job = get_job(db, job_id)
+        assert job["last_error"] == "timed out"
+        assert job["next_attempt_at"] > datetime.utcnow()
+
+        # Backoff: not claimable until due
+        assert run_job(job_id) is None
+
+        _make_due(db, job_id)
+        assert run_job(job_id) == "queued"
+        assert get_job(db, job_id)["last_error"] == "RuntimeError: boom"
+
+        _make_due(db, job_id)
+        assert run_job(job_id) == "failed"
+
+        job = get_job(db, job_id)
+        assert (job["attempts"], job["next_attempt_at"]) == (3, None)
+
+
+class TestRecovery:
+
+    def test_abandoned_jobs_requeue_or_fail(self, db):
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=RUNNING_TIMEOUT_SECONDS + 1)
+
+        retryable = _job(db, status="running", started_at=stale, attempts=1, max_attempts=3)
+        exhausted = _job(db, status="running", started_at=stale, attempts=3, max_attempts=3)
+        active = _job(db, status="running", started_at=now, attempts=1)
+        later = _job(db, next_attempt_at=now + timedelta(minutes=5))
+        due = _job(db)
+
+        result = recover_jobs(db, now=now)
+
+        assert result == {"abandoned": 2, "due": [retryable, due]}
+        assert get_job(db, exhausted)["status"] == "failed"
+        assert get_job(db, active)["status"] == "running"
+        assert get_job(db, later)["status"] == "queued"
+
+    def test_unknown_job(self, db):
+        assert get_job(db, 404) is None
@@ -0,0 +1,211 @@
+# backend/tests/test_mitigation_review_service.py
+# Tests for Steps 70–72 — Mitigation Review Queue + Bulk Decisions
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models.audit_log import AuditLog
+from backend.app.models.fulfillment_log import FulfillmentLog
+from backend.app.models.mitigation_job import MitigationJob
+from backend.app.models.mitigation_review import MitigationReview
+from backend.app.services import mitigation_execution_service
+from backend.app.services.mitigation_review_service import (
+    decide_reviews,
+    ensure_mitigation_review_schema,
+    expire_stale_reviews,
+    get_review_queue,
+    upsert_pending_review,
+)
+
+
+NOW = datetime(2026, 3, 10, 12, 0)
+
+
+def _propose(db, medicine_id, risk_score, quantity=100, now=NOW):
+    return upsert_pending_review(
+        db, medicine_id, risk_score, "RESTOCK_IMMEDIATE",
+        {"medicine_id": medicine_id, "action": "RESTOCK_IMMEDIATE", "quantity": quantity},
+        now=now,
+    )
+
+
+class TestUpsert:
+
+    def test_reproposal_supersedes_in_place(self, db):
+        first_id, created = _propose(db, 7, 80, quantity=100)
+        second_id, recreated = _propose(db, 7, 90, quantity=150, now=NOW + timedelta(minutes=4))
+
+        review = db.query(MitigationReview).one()
+
+        assert created is True and recreated is False
+        assert first_id == second_id == review.id
+        assert review.risk_score == 90
+        assert '"quantity": 150' in review.payload
+        assert review.created_at == NOW
+        assert review.updated_at == NOW + timedelta(minutes=4)
+
+    def test_processed_reviews_do_not_block_a_new_one(self, db):
+        review_id, _ = _propose(db, 7, 80)
+        db.query(MitigationReview).update({MitigationReview.status: "rejected"})
+        db.commit()
+
+        new_id, created = _propose(db, 7, 85)
+
+        assert created is True
+        assert new_id != review_id
+
+    def test_second_pending_row_is_rejected_by_index(self, db):
+        _propose(db, 7, 80)
+        db.add(MitigationReview(mitigation_id=7, risk_score=1, action_type="MONITOR",
+                                payload="{}", status="pending"))
+
+        with pytest.raises(IntegrityError):
+            db.commit()
+
+
+class TestExpiry:
+
+    def test_stale_reviews_expire_and_report_medicines(self, db):
+        _propose(db, 1, 80, now=NOW - timedelta(hours=30))
+        _propose(db, 2, 80, now=NOW - timedelta(hours=1))
+
+        assert expire_stale_reviews(db, ttl_hours=24, now=NOW) == {1}
+        assert [r.status for r in db.query(MitigationReview).order_by(MitigationReview.mitigation_id)] == [
+            "expired", "pending"
+        ]
+
+
+class TestQueue:
+
+    def test_highest_risk_first_across_pages(self, db):
+        for medicine_id, risk in [(1, 70), (2, 95), (3, 80), (4, 95), (5, 60)]:
+            _propose(db, medicine_id, risk)
+
+        seen, cursor = [], None
+        while True:
+            page = get_review_queue(db, cursor=cursor, limit=2)
+            seen += [(item["medicine_id"], item["risk_score"]) for item in page["items"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == [(4, 95), (2, 95), (3, 80), (1, 70), (5, 60)]
+
+    def test_invalid_cursor(self, db):
+        with pytest.raises(ValueError):
+            get_review_queue(db, cursor="nope")
+
+
+class TestBulkDecisions:
+
+    def test_mixed_batch_commits_together(self, db):
+        ids = [_propose(db, medicine_id, 90)[0] for medicine_id in (1, 2, 3)]
+        db.query(MitigationReview).filter(MitigationReview.id == ids[2]).update(
+            {MitigationReview.status: "rejected"}
+        )
+        db.commit()
+
+        result = decide_reviews(db, approve_ids=[ids[0], ids[2], 999], reject_ids=[ids[1]],
+                                reviewer_id=5, now=NOW)
+
+        assert [item["review_id"] for item in result["approved"]] == [ids[0]]
+        assert result["approved"][0]["payload"]["medicine_id"] == 1
+        assert result["rejected"] == [ids[1]]
+        assert result["skipped"] == [ids[2], 999]
+
+        statuses = {r.id: (r.status, r.reviewed_by) for r in db.query(MitigationReview)}
+        assert statuses[ids[0]] == ("approved", 5)
+        assert statuses[ids[1]] == ("rejected", 5)
+
+        assert sorted(e for (e,) in db.query(AuditLog.event_type)) == ["REVIEW_APPROVED", "REVIEW_REJECTED"]
+        assert sorted(s for (s,) in db.query(FulfillmentLog.status)) == ["APPROVED_BY_ADMIN", "REJECTED_BY_ADMIN"]
+
+        job = db.query(MitigationJob).one()
+        assert result["job_id"] == job.id
+        assert (job.status, job.review_ids, job.created_by) == ("queued", f"[{ids[0]}]", 5)
+        assert '"medicine_id": 1' in job.payloads
+
+    def test_rejections_only_queue_no_job(self, db):
+        review_id, _ = _propose(db, 1, 90)
+
+        result = decide_reviews(db, approve_ids=[], reject_ids=[review_id], reviewer_id=5)
+
+        assert result["job_id"] is None
+        assert db.query(MitigationJob).count() == 0
+
+    def test_conflicting_decision_writes_nothing(self, db):
+        review_id, _ = _propose(db, 1, 90)
+
+        with pytest.raises(ValueError):
+            decide_reviews(db, approve_ids=[review_id], reject_ids=[review_id], reviewer_id=5)
+
+        assert db.query(MitigationReview).one().status == "pending"
+        assert db.query(AuditLog).count() == 0
+
+    def test_approved_payloads_execute_as_one_warehouse_call(self, engine, db, monkeypatch):
+        calls = []
+
+        def fake_bulk_restock(medicine_ids):
+            calls.append(list(medicine_ids))
+            return {"restocked": [1], "missing": [2]}
+
+        monkeypatch.setattr(mitigation_execution_service, "SessionLocal", sessionmaker(bind=engine))
+        monkeypatch.setattr(mitigation_execution_service, "trigger_bulk_restock", fake_bulk_restock)
+
+        results = mitigation_execution_service.execute_mitigations_from_payloads([
+            {"medicine_id": 1, "action": "RESTOCK_IMMEDIATE", "quantity": 40, "risk_score": 90},
+            {"medicine_id": 2, "action": "RESTOCK_IMMEDIATE", "quantity": 10, "risk_score": 85},
+            {"medicine_id": 3, "action": "RESTOCK_IMMEDIATE", "quantity": 10, "risk_score": 50},
+            {"medicine_id": 4, "action": "MONITOR", "quantity": 0, "risk_score": 90},
+        ])
+
+        assert calls == [[1, 2]]
+        assert [r["status"] for r in results] == ["executed", "executed", "blocked", "manual_required"]
+        assert [r.get("warehouse") for r in results[:2]] == ["restocked", "missing"]
+        assert db.query(FulfillmentLog).filter(FulfillmentLog.status == "AUTO_EXECUTED").count() == 2
+        assert db.query(AuditLog).filter(AuditLog.event_type == "MITIGATION_EXECUTED").count() == 2
+
+    def test_unreachable_warehouse_fails_without_logging(self, engine, db, monkeypatch):
+        monkeypatch.setattr(mitigation_execution_service, "SessionLocal", sessionmaker(bind=engine))
+        monkeypatch.setattr(mitigation_execution_service, "trigger_bulk_restock",
+                            lambda medicine_ids: {"error": "timed out"})
+
+        results = mitigation_execution_service.execute_mitigations_from_payloads([
+            {"medicine_id": 1, "action": "RESTOCK_IMMEDIATE", "quantity": 40, "risk_score": 90},
+        ])
+
+        assert results == [{"status": "failed", "action": "RESTOCK_IMMEDIATE", "quantity": 40,
+                            "error": "timed out"}]
+        assert db.query(FulfillmentLog).count() == 0
+        assert db.query(AuditLog).count() == 0
+
+
+class TestLegacySchema:
+
+    def test_duplicates_collapse_before_unique_index(self, bare_engine):
+        engine = bare_engine
+
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE mitigation_reviews (id INTEGER PRIMARY KEY, mitigation_id INTEGER NOT NULL, "
+                "risk_score INTEGER NOT NULL, action_type VARCHAR NOT NULL, payload TEXT NOT NULL, "
+                "status VARCHAR, reviewed_by INTEGER, reviewed_at DATETIME, created_at DATETIME)"
+            ))
+            for review_id in (1, 2, 3):
+                conn.execute(text(
+                    "INSERT INTO mitigation_reviews VALUES (:id, 7, 80, 'MONITOR', '{}', 'pending', "
+                    "NULL, NULL, '2026-03-10 12:00:00')"
+                ), {"id": review_id})
+
+        ensure_mitigation_review_schema(engine)
+        ensure_mitigation_review_schema(engine)
+
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT id, status, updated_at FROM mitigation_reviews ORDER BY id")).all()
+
+        assert [(r[0], r[1]) for r in rows] == [(1, "superseded"), (2, "superseded"), (3, "pending")]
+        assert all(r[2] is not None for r in rows)
@@ -0,0 +1,141 @@
+# backend/tests/test_order_column_store.py
+# Tests for Step 65 — Memory-Mapped Columnar Order History
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models.order import Order
+from backend.app.services import order_column_store
+from backend.app.services.order_column_store import (
+    OrderColumnStore,
+    export_order_store,
+    get_order_store,
+    refresh_order_store,
+    to_day,
+)
+
+
+DAY = date(2026, 3, 10)
+
+
+@pytest.fixture
+def add_orders(engine):
+    Session = sessionmaker(bind=engine)
+
+    def add(*rows):
+        db = Session()
+        db.add_all([
+            Order(patient_id=patient_id, medicine_id=medicine_id, quantity=qty,
+                  order_date=order_date, daily_dosage=1)
+            for medicine_id, patient_id, order_date, qty in rows
+        ])
+        db.commit()
+        db.close()
+
+    return add
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    return str(tmp_path / "order_store")
+
+
+class TestExport:
+
+    def test_rows_sorted_by_medicine_then_day(self, engine, add_orders, store_dir):
+        add_orders((2, 1, DAY, 5), (1, 1, DAY, 3), (1, 2, DAY - timedelta(days=1), 4))
+        export_order_store(engine, store_dir, chunk_rows=2)
+
+        store = OrderColumnStore(store_dir)
+        assert store.rows == 3
+        assert list(store.main["medicine_id"]) == [1, 1, 2]
+        assert list(store.main["day"]) == [to_day(DAY - timedelta(days=1)), to_day(DAY), to_day(DAY)]
+
+    def test_medicine_slice_is_zero_copy_view(self, engine, add_orders, store_dir):
+        add_orders((1, 1, DAY, 3), (2, 1, DAY, 5), (2, 2, DAY, 7))
+        export_order_store(engine, store_dir)
+
+        store = OrderColumnStore(store_dir)
+        qty = store.medicine_slice(2)["qty"]
+        assert list(qty) == [5, 7]
+        assert np.shares_memory(qty, store.main["qty"])
+
+    def test_unknown_medicine_is_empty(self, engine, add_orders, store_dir):
+        add_orders((1, 1, DAY, 3))
+        export_order_store(engine, store_dir)
+        assert len(OrderColumnStore(store_dir).medicine_slice(99)["qty"]) == 0
+
+    def test_empty_history_exports(self, engine, store_dir):
+        export_order_store(engine, store_dir)
+        assert OrderColumnStore(store_dir).rows == 0
+
+
+class TestRefresh:
+
+    def test_new_orders_land_in_delta_and_are_read(self, engine, add_orders, store_dir, monkeypatch):
+        monkeypatch.setattr(order_column_store, "COMPACT_RATIO", 10.0)
+        add_orders((1, 1, DAY, 3))
+        export_order_store(engine, store_dir)
+
+        add_orders((1, 2, DAY - timedelta(days=2), 4))
+        result = refresh_order_store(engine, store_dir)
+
+        store = OrderColumnStore(store_dir)
+        assert result["delta_rows"] == 1 and result["compacted"] is False
+        assert list(store.medicine_columns(1)["qty"]) == [4, 3]
+
+    def test_large_delta_is_compacted(self, engine, add_orders, store_dir):
+        add_orders((1, 1, DAY, 3))
+        export_order_store(engine, store_dir)
+
+        add_orders((3, 1, DAY, 6), (1, 1, DAY - timedelta(days=1), 2))
+        result = refresh_order_store(engine, store_dir)
+
+        store = OrderColumnStore(store_dir)
+        assert result["compacted"] is True
+        assert store.delta_rows == 0
+        assert list(store.main["medicine_id"]) == [1, 1, 3]
+        assert list(store.medicine_slice(1)["qty"]) == [2, 3]
+
+    def test_refresh_without_store_exports(self, engine, add_orders, store_dir):
+        add_orders((1, 1, DAY, 3))
+        assert refresh_order_store(engine, store_dir)["rows"] == 1
+
+
+class TestSharedInstance:
+
+    def test_reopens_after_refresh_by_another_worker(self, engine, add_orders, store_dir, monkeypatch):
+        monkeypatch.setattr(order_column_store, "COMPACT_RATIO", 10.0)
+        order_column_store.invalidate_order_store()
+
+        add_orders((1, 1, DAY, 3))
+        export_order_store(engine, store_dir)
+        first = get_order_store(store_dir)
+
+        # The leader's refresh never invalidates this worker's instance
+        monkeypatch.setattr(order_column_store, "invalidate_order_store", lambda: None)
+        add_orders((1, 2, DAY, 4))
+        refresh_order_store(engine, store_dir)
+
+        store = get_order_store(store_dir)
+        assert store is not first
+        assert store.last_order_id == 2
+        assert get_order_store(store_dir) is store
+
+        order_column_store._store = None
+
+
+class TestWindows:
+
+    def test_window_quantity_and_daily_series(self, engine, add_orders, store_dir):
+        add_orders((1, 1, DAY - timedelta(days=3), 2), (1, 1, DAY - timedelta(days=1), 5),
+                   (1, 2, DAY - timedelta(days=1), 1))
+        export_order_store(engine, store_dir)
+        store = OrderColumnStore(store_dir)
+
+        assert store.window_quantity(1, DAY - timedelta(days=2)) == 6
+        assert store.window_quantity(1, DAY - timedelta(days=3), DAY - timedelta(days=1)) == 2
+        assert list(store.daily_series(1, DAY - timedelta(days=3), DAY)) == [2, 0, 6]
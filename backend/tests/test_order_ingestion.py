@@ -0,0 +1,98 @@
+# backend/tests/test_order_ingestion.py
+# Tests for Step 57 — Streaming Order Feed Ingestion
+
+from datetime import date
+
+import pytest
+
+from backend.app.services.order_ingestion_service import (
+    build_column_mapping,
+    find_header_row,
+    iter_csv_batches,
+    normalize_row,
+    parse_daily_dosage,
+    row_hash,
+)
+
+
+HEADERS = ["Patient ID", "Patient Age", "Patient Gender", "Purchase Date",
+           "Product Name", "Quantity", "Dosage Frequency"]
+
+
+def _raw(**overrides):
+    raw = dict(zip(HEADERS, ["PAT001", "45", "F", "2024-03-15", "Panthenol Spray", "2", "1-0-1"]))
+    raw.update(overrides)
+    return raw
+
+
+class TestHeaderAndMapping:
+
+    def test_header_row_found_after_preamble(self):
+        rows = [["Order History Export"], [], ["patient id ", "Product Name"]]
+        assert find_header_row(rows) == 2
+
+    def test_missing_header_returns_none(self):
+        assert find_header_row([["a", "b"], ["c"]]) is None
+
+    def test_mapping_is_case_and_whitespace_insensitive(self):
+        mapping = build_column_mapping([" PRODUCT  NAME", "Patient ID", "Quantity", "Purchase Date"])
+        assert mapping[" PRODUCT  NAME"] == "product_name"
+
+    def test_override_maps_custom_column(self):
+        mapping = build_column_mapping(
+            ["Patient ID", "Product Name", "Qty", "Purchase Date"],
+            overrides={"Qty": "quantity"},
+        )
+        assert mapping["Qty"] == "quantity"
+
+    def test_missing_required_column_raises(self):
+        with pytest.raises(ValueError):
+            build_column_mapping(["Patient ID", "Product Name"])
+
+
+class TestRowNormalization:
+
+    def test_valid_row_is_typed(self):
+        row = normalize_row(_raw(), build_column_mapping(HEADERS))
+        assert row["quantity"] == 2
+        assert row["order_date"] == date(2024, 3, 15)
+        assert row["age"] == 45
+
+    def test_bad_quantity_is_rejected(self):
+        assert normalize_row(_raw(Quantity="abc"), build_column_mapping(HEADERS)) is None
+
+    def test_blank_required_field_is_rejected(self):
+        assert normalize_row(_raw(**{"Patient ID": " "}), build_column_mapping(HEADERS)) is None
+
+    def test_european_date_format(self):
+        row = normalize_row(_raw(**{"Purchase Date": "15.03.2024"}), build_column_mapping(HEADERS))
+        assert row["order_date"] == date(2024, 3, 15)
+
+    def test_row_hash_ignores_product_case_and_whitespace(self):
+        mapping = build_column_mapping(HEADERS)
+        a = normalize_row(_raw(), mapping)
+        b = normalize_row(_raw(**{"Product Name": "  PANTHENOL SPRAY "}), mapping)
+        assert row_hash(a) == row_hash(b)
+
+    def test_row_hash_changes_with_quantity(self):
+        mapping = build_column_mapping(HEADERS)
+        assert row_hash(normalize_row(_raw(), mapping)) != row_hash(normalize_row(_raw(Quantity="3"), mapping))
+
+    def test_daily_dosage_parsing(self):
+        assert parse_daily_dosage("1-0-1") == 2
+        assert parse_daily_dosage("3 per day") == 3.0
+        assert parse_daily_dosage("Once daily") == 1.0
+
+
+class TestCsvStreaming:
+
+    def test_csv_is_batched_after_detected_header(self, tmp_path):
+        path = tmp_path / "feed.csv"
+        lines = ["Export,,", ",,", ",".join(HEADERS)]
+        lines += [f"PAT{i},40,M,2024-01-01,Med {i},1,Once daily" for i in range(5)]
+        path.write_text("\n".join(lines) + "\n")
+
+        batches = list(iter_csv_batches(str(path), batch_size=2))
+
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert batches[0][0]["Patient ID"] == "PAT0"
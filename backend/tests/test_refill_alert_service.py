@@ -0,0 +1,87 @@
+# backend/tests/test_refill_alert_service.py
+# Tests for Step 69 — Refill Alert Listing + Export
+
+import json
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models.refill_alert import RefillAlert
+from backend.app.services import refill_alert_service
+from backend.app.services.refill_alert_service import (
+    ensure_refill_alert_indexes,
+    export_refill_alerts_ndjson,
+    list_refill_alerts,
+)
+
+
+@pytest.fixture
+def db(db):
+    for i in range(1, 26):
+        db.add(RefillAlert(
+            id=i,
+            patient_id=1 + i % 3,
+            medicine_name=f"Med {i}",
+            expected_refill_date="2026-03-01",
+            status="overdue" if i % 2 else "due_soon",
+            created_at=datetime(2026, 3, 1 + i // 10, 12, 0),
+        ))
+    db.commit()
+
+    return db
+
+
+class TestKeysetPagination:
+
+    def test_pages_cover_everything_once_newest_first(self, db):
+        seen, cursor = [], None
+
+        while True:
+            page = list_refill_alerts(db, cursor=cursor, limit=10)
+            seen += [item["alert_id"] for item in page["items"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == list(range(25, 0, -1))
+
+    def test_last_full_page_has_no_cursor(self, db):
+        page = list_refill_alerts(db, limit=25)
+        assert len(page["items"]) == 25
+        assert page["next_cursor"] is None
+
+    def test_filters_combine(self, db):
+        page = list_refill_alerts(db, status="overdue", patient_id=2, limit=100)
+        ids = [item["alert_id"] for item in page["items"]]
+
+        assert ids == [i for i in range(25, 0, -1) if i % 2 and 1 + i % 3 == 2]
+
+    def test_date_range_is_inclusive(self, db):
+        page = list_refill_alerts(db, created_from=date(2026, 3, 2), created_to=date(2026, 3, 2), limit=100)
+        assert sorted(item["alert_id"] for item in page["items"]) == list(range(10, 20))
+
+
+class TestExport:
+
+    def test_ndjson_streams_filtered_rows_in_id_order(self, engine, db, monkeypatch):
+        monkeypatch.setattr(refill_alert_service, "SessionLocal", sessionmaker(bind=engine))
+
+        lines = list(export_refill_alerts_ndjson(status="due_soon", batch_size=4))
+        rows = [json.loads(line) for line in lines]
+
+        assert all(line.endswith("\n") for line in lines)
+        assert [row["alert_id"] for row in rows] == list(range(2, 26, 2))
+
+
+class TestIndexes:
+
+    def test_filter_indexes_are_created_idempotently(self, engine):
+        ensure_refill_alert_indexes(engine)
+        ensure_refill_alert_indexes(engine)
+
+        with engine.connect() as conn:
+            names = {row[1] for row in conn.exec_driver_sql("PRAGMA index_list('refill_alerts')")}
+
+        assert {"ix_refill_alerts_status_id", "ix_refill_alerts_patient_id_id",
+                "ix_refill_alerts_created_at_id"} <= names
@@ -0,0 +1,126 @@
+# backend/tests/test_refill_engine.py
+# Tests for Step 68 — Unified Refill Engine
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models.medicine import Medicine
+from backend.app.models.order import Order
+from backend.app.models.patient import Patient
+from backend.app.models.refill_alert import RefillAlert
+from backend.app.models.refill_schedule import RefillSchedule
+from backend.app.services import proactive_refill_scanner
+from backend.app.services.refill_service import (
+    days_covered,
+    evaluate_refills,
+    scan_and_create_refill_alerts,
+)
+
+
+TODAY = date.today()
+
+
+@pytest.fixture
+def db(db):
+    db.add_all([
+        Medicine(id=1, name="Metformin", price=1.0, stock=100),
+        Medicine(id=2, name="Lisinopril", price=1.0, stock=100),
+        Patient(id=1, name="A", age=40, gender="F", user_id=1),
+        Patient(id=2, name="B", age=50, gender="M", user_id=1),
+    ])
+    db.commit()
+
+    return db
+
+
+def _order(db, order_id, patient_id, medicine_id, days_ago, quantity=30, daily_dosage=1):
+    db.add(Order(id=order_id, patient_id=patient_id, medicine_id=medicine_id, quantity=quantity,
+                 order_date=TODAY - timedelta(days=days_ago), daily_dosage=daily_dosage))
+    db.commit()
+
+
+def _alerts(db):
+    return sorted((a.patient_id, a.medicine_name, a.status) for a in db.query(RefillAlert).all())
+
+
+class TestDaysCovered:
+
+    def test_whole_days_only(self):
+        assert days_covered(7, 2) == 3
+        assert days_covered(10, 1.5) == 6
+        assert days_covered(30, 1) == 30
+
+    def test_invalid_dosage(self):
+        assert days_covered(30, 0) is None
+        assert days_covered(30, None) is None
+
+
+class TestEvaluateRefills:
+
+    def test_statuses_from_latest_order_only(self, db):
+        _order(db, 1, 1, 1, days_ago=90)               # superseded
+        _order(db, 2, 1, 1, days_ago=28)               # due in 2 days → due_soon
+        _order(db, 3, 2, 2, days_ago=40)               # 10 days past → overdue
+
+        created = evaluate_refills(db, today=TODAY)
+        db.commit()
+
+        assert created == 2
+        assert _alerts(db) == [(1, "Metformin", "due_soon"), (2, "Lisinopril", "overdue")]
+        assert {s.order_id for s in db.query(RefillSchedule).all()} == {2, 3}
+        assert all(a.created_at is not None for a in db.query(RefillAlert).all())
+
+    def test_existing_alerts_are_not_duplicated(self, db):
+        _order(db, 1, 2, 2, days_ago=40)
+
+        evaluate_refills(db, [2], today=TODAY)
+        db.commit()
+
+        assert evaluate_refills(db, [2], today=TODAY) == 0
+
+    def test_empty_patient_list_is_a_no_op(self, db):
+        _order(db, 1, 2, 2, days_ago=40)
+        assert evaluate_refills(db, [], today=TODAY) == 0
+
+
+class TestSharedCycle:
+
+    def test_second_caller_in_same_cycle_does_no_work(self, db):
+        _order(db, 1, 1, 1, days_ago=40)
+
+        first = scan_and_create_refill_alerts(db)
+        second = scan_and_create_refill_alerts(db)
+
+        assert first["mode"] == "full"
+        assert first["alerts_created"] == 1
+        assert second["mode"] == "incremental"
+        assert second["patients_scanned"] == 0
+        assert second["alerts_created"] == 0
+
+    def test_new_order_is_picked_up_incrementally(self, db):
+        _order(db, 1, 1, 1, days_ago=40)
+        scan_and_create_refill_alerts(db)
+
+        _order(db, 2, 2, 2, days_ago=35)
+        result = scan_and_create_refill_alerts(db)
+
+        assert result["patients_scanned"] == 1
+        assert (2, "Lisinopril", "overdue") in _alerts(db)
+
+    def test_admin_scans_in_one_process_do_not_overlap(self, db, monkeypatch):
+        monkeypatch.setattr(proactive_refill_scanner, "SessionLocal", sessionmaker(bind=db.get_bind()))
+        overlapping = []
+
+        def scan_while_another_request_arrives(session):
+            overlapping.append(proactive_refill_scanner.run_proactive_refill_scan())
+            return {"alerts_created": 0}
+
+        monkeypatch.setattr(proactive_refill_scanner, "scan_and_create_refill_alerts",
+                            scan_while_another_request_arrives)
+
+        result = proactive_refill_scanner.run_proactive_refill_scan()
+
+        assert result["message"] == "Proactive refill scan completed"
+        assert overlapping == [{"message": "Refill scan already running", "alerts_created": 0}]
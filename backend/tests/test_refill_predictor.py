@@ -0,0 +1,84 @@
+# backend/tests/test_refill_predictor.py
+# Tests for bulk refill predictions (latest order per medicine, one query)
+# and the shared days-covered definition (Step 68)
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from backend.app.models.medicine import Medicine
+from backend.app.models.order import Order
+from backend.app.services.refill_predictor import predict_refills, predict_refills_bulk
+from backend.app.services.refill_service import days_covered
+
+
+TODAY = date(2026, 3, 10)
+
+
+@pytest.fixture
+def db(db):
+    db.add_all([
+        Medicine(id=1, name="Metformin", price=1.0, stock=100),
+        Medicine(id=2, name="Lisinopril", price=1.0, stock=100),
+    ])
+    db.commit()
+
+    return db
+
+
+def _order(db, order_id, patient_id, medicine_id, order_date, quantity=30, daily_dosage=1):
+    db.add(Order(id=order_id, patient_id=patient_id, medicine_id=medicine_id,
+                 quantity=quantity, order_date=order_date, daily_dosage=daily_dosage))
+    db.commit()
+
+
+class TestPredictRefillsBulk:
+
+    def test_latest_order_per_medicine_only(self, db):
+        _order(db, 1, 1, 1, TODAY - timedelta(days=60))
+        _order(db, 2, 1, 1, TODAY - timedelta(days=10))
+        _order(db, 3, 1, 2, TODAY - timedelta(days=40))
+
+        predictions = predict_refills_bulk(db, [1], today=TODAY)[1]
+
+        assert [p["medicine_name"] for p in predictions] == ["Metformin", "Lisinopril"]
+        assert predictions[0]["last_order_date"] == str(TODAY - timedelta(days=10))
+        assert predictions[0]["days_remaining"] == 20
+        assert predictions[0]["overdue"] is False
+        assert predictions[1]["overdue"] is True
+        assert predictions[1]["days_remaining"] == 0
+
+    def test_supply_days_match_refill_engine(self, db):
+        _order(db, 1, 1, 1, TODAY, quantity=5, daily_dosage=2)     # 2.5 → 2
+        _order(db, 2, 2, 1, TODAY, quantity=7, daily_dosage=2)     # 3.5 → 3
+        _order(db, 3, 3, 1, TODAY, quantity=10, daily_dosage=1.5)  # 6.67 → 6
+
+        predictions = predict_refills_bulk(db, [1, 2, 3], today=TODAY)
+
+        for patient_id, (quantity, dosage) in {1: (5, 2), 2: (7, 2), 3: (10, 1.5)}.items():
+            assert predictions[patient_id][0]["days_supply"] == days_covered(quantity, dosage)
+
+    def test_invalid_dosage_and_unknown_patients(self, db):
+        _order(db, 1, 1, 1, TODAY, daily_dosage=0)
+
+        assert predict_refills_bulk(db, [1, 99], today=TODAY) == {1: [], 99: []}
+        assert predict_refills_bulk(db, []) == {}
+
+    def test_all_patients_in_one_query(self, db):
+        for patient_id in range(1, 21):
+            _order(db, patient_id * 10, patient_id, 1, TODAY - timedelta(days=patient_id))
+            _order(db, patient_id * 10 + 1, patient_id, 2, TODAY - timedelta(days=patient_id))
+
+        statements = []
+        event.listen(db.bind, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        predictions = predict_refills_bulk(db, today=TODAY)
+
+        assert len(predictions) == 20
+        assert all(len(items) == 2 for items in predictions.values())
+        assert len(statements) == 1
+
+    def test_single_patient_wrapper(self, db):
+        _order(db, 1, 1, 2, TODAY)
+        assert predict_refills(db, 1)[0]["medicine_id"] == 2
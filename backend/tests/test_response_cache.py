@@ -0,0 +1,136 @@
+# backend/tests/test_response_cache.py
+# Tests for Step 54 — LLM Response Cache
+
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+
+from backend.app.agent.response_cache import (
+    AgentResponseCache,
+    build_cache_key,
+    get_patient_data_version,
+    normalize_message,
+)
+from backend.app.models.medicine import Medicine
+from backend.app.models.order import Order
+from backend.app.models.refill_alert import RefillAlert
+from backend.app.services.order_service import release_stock, reserve_stock
+
+
+def _key(message="What should I take?", **overrides):
+    parts = dict(
+        provider="openai",
+        model="gpt-4o-mini",
+        prompt_version="v1",
+        patient_id=1,
+        message=message,
+        data_version="abc",
+    )
+    parts.update(overrides)
+    return build_cache_key(**parts)
+
+
+class TestCacheKey:
+
+    def test_normalization_ignores_case_whitespace_and_trailing_punctuation(self):
+        assert normalize_message("  What  should I TAKE?! ") == "what should i take"
+        assert _key("What should I take?") == _key("what should   i take")
+
+    def test_patient_data_version_changes_key(self):
+        assert _key(data_version="abc") != _key(data_version="def")
+
+    def test_model_and_prompt_version_change_key(self):
+        assert _key(model="gpt-4o") != _key()
+        assert _key(prompt_version="v2") != _key()
+
+    def test_patients_never_share_keys(self):
+        assert _key(patient_id=1) != _key(patient_id=2)
+
+
+@pytest.fixture
+def db(db):
+    db.add_all([
+        Medicine(id=1, name="Metformin", price=1.0, stock=100),
+        Medicine(id=2, name="Lisinopril", price=1.0, stock=100),
+        Medicine(id=3, name="Ibuprofen", price=1.0, stock=100),
+        Order(patient_id=1, medicine_id=1, quantity=30, order_date=date.today(), daily_dosage=1),
+        Order(patient_id=1, medicine_id=2, quantity=30, order_date=date.today(), daily_dosage=1),
+    ])
+    db.commit()
+
+    return db
+
+
+class TestPatientDataVersion:
+
+    def test_stock_moves_that_cancel_out_change_version(self, db):
+        before = get_patient_data_version(db, 1)
+
+        reserve_stock(db, 1, 50)
+        release_stock(db, 2, 50)
+        db.commit()
+
+        assert get_patient_data_version(db, 1) != before
+
+    def test_other_medicines_stock_keeps_version(self, db):
+        before = get_patient_data_version(db, 1)
+
+        reserve_stock(db, 3, 10)
+        db.commit()
+
+        assert get_patient_data_version(db, 1) == before
+
+    def test_alert_status_change_changes_version(self, db):
+        db.add(RefillAlert(patient_id=1, medicine_name="Metformin",
+                           expected_refill_date=str(date.today()), status="due_soon"))
+        db.commit()
+        before = get_patient_data_version(db, 1)
+
+        db.query(RefillAlert).update({RefillAlert.status: "overdue"})
+        db.commit()
+
+        assert get_patient_data_version(db, 1) != before
+
+    def test_unchanged_data_keeps_version(self, db):
+        assert get_patient_data_version(db, 1) == get_patient_data_version(db, 1)
+
+
+class TestAgentResponseCache:
+
+    def test_hit_and_miss_are_counted(self):
+        cache = AgentResponseCache(max_entries=10, ttl_seconds=60)
+
+        assert cache.get("k") is None
+        cache.put("k", "answer")
+        assert cache.get("k") == "answer"
+
+        snapshot = cache.snapshot()
+        assert snapshot["hits"] == 1
+        assert snapshot["misses"] == 1
+        assert snapshot["hit_rate"] == 0.5
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = AgentResponseCache(max_entries=2, ttl_seconds=60)
+
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.snapshot()["evictions"] == 1
+
+    def test_expired_entries_are_not_served(self):
+        cache = AgentResponseCache(max_entries=10, ttl_seconds=60)
+
+        with patch("backend.app.agent.response_cache.time.monotonic", return_value=1000.0):
+            cache.put("k", "answer")
+
+        with patch("backend.app.agent.response_cache.time.monotonic", return_value=1061.0):
+            assert cache.get("k") is None
+
+        snapshot = cache.snapshot()
+        assert snapshot["expirations"] == 1
+        assert snapshot["size"] == 0
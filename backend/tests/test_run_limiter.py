@@ -0,0 +1,91 @@
+# backend/tests/test_run_limiter.py
+# Tests for Step 53 — Agent Run Concurrency Limits
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from backend.app.agent.run_limiter import AgentQueueFull, AgentRunLimiter
+from backend.app.api import agent_routes
+
+
+class TestAgentRunLimiter:
+
+    def test_full_queue_rejects_immediately(self):
+        async def scenario():
+            limiter = AgentRunLimiter(max_concurrent=1, max_queue=1)
+            await limiter.acquire()
+
+            waiter = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+
+            with pytest.raises(AgentQueueFull):
+                await limiter.acquire()
+
+            limiter.release()
+            await waiter
+            limiter.release()
+
+            return limiter.snapshot()
+
+        snapshot = asyncio.run(scenario())
+
+        assert snapshot["rejected"] == 1
+        assert snapshot["completed"] == 2
+        assert (snapshot["active"], snapshot["waiting"]) == (0, 0)
+
+    def test_slot_release_is_idempotent(self):
+        async def scenario():
+            limiter = AgentRunLimiter(max_concurrent=1, max_queue=0)
+            slot = await limiter.acquire_slot()
+            slot.release()
+            slot.release()
+
+            # The single slot is free again, exactly once
+            await limiter.acquire()
+            return limiter.snapshot()
+
+        snapshot = asyncio.run(scenario())
+
+        assert (snapshot["active"], snapshot["completed"]) == (1, 1)
+
+
+class TestAgentRoutes:
+
+    @pytest.fixture
+    def limiter(self, monkeypatch):
+        limiter = AgentRunLimiter(max_concurrent=1, max_queue=0)
+        monkeypatch.setattr(agent_routes, "agent_limiter", limiter)
+        monkeypatch.setattr(agent_routes, "_get_patient_id", lambda user: 1)
+        monkeypatch.setattr(agent_routes, "route_message", lambda message, patient_id: None)
+        monkeypatch.setattr(agent_routes, "_get_cache_key", lambda patient_id, message: "uncached-key")
+        monkeypatch.setattr(agent_routes.response_cache, "get", lambda key: None)
+        return limiter
+
+    def test_queue_full_is_429_with_retry_after(self, limiter):
+        async def scenario():
+            await limiter.acquire()
+            await agent_routes._acquire_agent_slot()
+
+        with pytest.raises(HTTPException) as raised:
+            asyncio.run(scenario())
+
+        assert raised.value.status_code == 429
+        assert raised.value.headers["Retry-After"] == str(agent_routes.QUEUE_FULL_RETRY_AFTER_SECONDS)
+
+    def test_unread_stream_releases_its_slot(self, limiter):
+        async def scenario():
+            response = await agent_routes.agent_chat_stream("hello", user=SimpleNamespace(id=1))
+            assert limiter.snapshot()["active"] == 1
+
+            # Client gone before the body was iterated: only the
+            # background task runs
+            await response.background()
+            return limiter.snapshot()
+
+        snapshot = asyncio.run(scenario())
+
+        assert snapshot["active"] == 0
+        assert snapshot["completed"] == 1
@@ -0,0 +1,83 @@
+# backend/tests/test_scan_watermark.py
+# Tests for Step 62 — Watermark-Based Incremental Scans
+
+from datetime import date, timedelta
+
+from backend.app.models.order import Order
+from backend.app.models.refill_schedule import RefillSchedule
+from backend.app.services.scan_watermark_service import (
+    load_watermark,
+    needs_full_scan,
+    refill_transition_patient_ids,
+    save_watermark,
+    touched_medicine_ids,
+    touched_patient_ids,
+    window_exit_medicine_ids,
+)
+
+
+TODAY = date(2026, 3, 10)
+YESTERDAY = TODAY - timedelta(days=1)
+
+
+def _order(db, order_id, patient_id, medicine_id, order_date):
+    db.add(Order(id=order_id, patient_id=patient_id, medicine_id=medicine_id,
+                 quantity=10, order_date=order_date, daily_dosage=1))
+    db.commit()
+
+
+class TestWatermarks:
+
+    def test_missing_watermark_needs_full_scan(self, db):
+        assert needs_full_scan(load_watermark(db, "refill_scan")) is True
+
+    def test_saved_watermark_is_incremental(self, db):
+        save_watermark(db, "refill_scan", 42, TODAY)
+        mark = load_watermark(db, "refill_scan")
+        assert mark.last_order_id == 42
+        assert needs_full_scan(mark) is False
+
+    def test_context_change_forces_full_scan(self, db):
+        save_watermark(db, "mitigation_scan", 1, TODAY, context="SAFE")
+        assert needs_full_scan(load_watermark(db, "mitigation_scan"), context="AUTO") is True
+
+
+class TestTouched:
+
+    def test_only_orders_after_watermark_count(self, db):
+        _order(db, 1, patient_id=1, medicine_id=1, order_date=TODAY)
+        _order(db, 2, patient_id=2, medicine_id=5, order_date=TODAY)
+        _order(db, 3, patient_id=3, medicine_id=7, order_date=TODAY)
+
+        assert touched_patient_ids(db, 1, 3) == {2, 3}
+        assert touched_medicine_ids(db, 1, 2) == {5}
+
+
+class TestTimeTransitions:
+
+    def _schedule(self, db, order_id, patient_id, refill_date):
+        db.add(RefillSchedule(order_id=order_id, patient_id=patient_id,
+                              medicine_id=1, refill_date=refill_date))
+        db.commit()
+
+    def test_refill_becoming_overdue_is_found(self, db):
+        self._schedule(db, 1, patient_id=1, refill_date=YESTERDAY)
+        assert refill_transition_patient_ids(db, YESTERDAY, TODAY, 3) == {1}
+
+    def test_refill_becoming_due_soon_is_found(self, db):
+        self._schedule(db, 1, patient_id=1, refill_date=TODAY + timedelta(days=3))
+        assert refill_transition_patient_ids(db, YESTERDAY, TODAY, 3) == {1}
+
+    def test_unchanged_refills_are_skipped(self, db):
+        self._schedule(db, 1, patient_id=1, refill_date=TODAY + timedelta(days=20))
+        self._schedule(db, 2, patient_id=2, refill_date=TODAY - timedelta(days=20))
+        assert refill_transition_patient_ids(db, YESTERDAY, TODAY, 3) == set()
+
+    def test_same_day_rerun_has_no_transitions(self, db):
+        self._schedule(db, 1, patient_id=1, refill_date=TODAY)
+        assert refill_transition_patient_ids(db, TODAY, TODAY, 3) == set()
+
+    def test_orders_leaving_window_are_found(self, db):
+        _order(db, 1, patient_id=1, medicine_id=4, order_date=YESTERDAY - timedelta(days=30))
+        _order(db, 2, patient_id=1, medicine_id=9, order_date=TODAY - timedelta(days=10))
+        assert window_exit_medicine_ids(db, YESTERDAY, TODAY, (30,)) == {4}
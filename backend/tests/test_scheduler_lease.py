@@ -0,0 +1,80 @@
+# backend/tests/test_scheduler_lease.py
+# Tests for Step 61 — DB-Backed Scheduler Leases
+
+from datetime import datetime, timedelta
+
+from backend.app.models.scheduler_lease import SchedulerLease
+from backend.app.services.scheduler_lease_service import (
+    LEADER_LEASE,
+    get_scheduler_status,
+    job_lease_name,
+    record_skip,
+    release,
+    try_acquire,
+)
+
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+class TestLeaderLease:
+
+    def test_first_worker_acquires(self, db):
+        assert try_acquire(db, LEADER_LEASE, "w1", 30, now=NOW) is True
+
+    def test_second_worker_is_refused_while_live(self, db):
+        try_acquire(db, LEADER_LEASE, "w1", 30, now=NOW)
+        assert try_acquire(db, LEADER_LEASE, "w2", 30, now=NOW + timedelta(seconds=10)) is False
+
+    def test_holder_renews_and_keeps_acquired_at(self, db):
+        try_acquire(db, LEADER_LEASE, "w1", 30, now=NOW)
+        assert try_acquire(db, LEADER_LEASE, "w1", 30, now=NOW + timedelta(seconds=20)) is True
+
+        lease = db.get(SchedulerLease, LEADER_LEASE)
+        db.refresh(lease)
+        assert lease.acquired_at == NOW
+        assert lease.expires_at == NOW + timedelta(seconds=50)
+
+    def test_expired_lease_is_taken_over(self, db):
+        try_acquire(db, LEADER_LEASE, "w1", 30, now=NOW)
+        assert try_acquire(db, LEADER_LEASE, "w2", 30, now=NOW + timedelta(seconds=31)) is True
+
+        lease = db.get(SchedulerLease, LEADER_LEASE)
+        db.refresh(lease)
+        assert lease.holder == "w2"
+
+    def test_release_frees_lease_for_others(self, db):
+        try_acquire(db, LEADER_LEASE, "w1", 30, now=NOW)
+        assert release(db, LEADER_LEASE, "w1") is True
+        assert try_acquire(db, LEADER_LEASE, "w2", 30, now=NOW) is True
+
+    def test_release_by_non_holder_is_noop(self, db):
+        try_acquire(db, LEADER_LEASE, "w1", 30, now=NOW)
+        assert release(db, LEADER_LEASE, "w2") is False
+
+
+class TestJobLeases:
+
+    def test_finished_release_counts_run(self, db):
+        name = job_lease_name("refill_scan_job")
+        try_acquire(db, name, "w1", 30, now=NOW)
+        release(db, name, "w1", finished=True, now=NOW)
+
+        job = get_scheduler_status(db, now=NOW)["jobs"][0]
+        assert job["job_id"] == "refill_scan_job"
+        assert job["run_count"] == 1
+        assert job["running"] is False
+
+    def test_skips_are_counted_with_reason(self, db):
+        name = job_lease_name("predictive_demand_job")
+        record_skip(db, name, "overlap", now=NOW)
+        record_skip(db, name, "missed", now=NOW)
+
+        job = get_scheduler_status(db, now=NOW)["jobs"][0]
+        assert job["skipped_count"] == 2
+        assert job["last_skip_reason"] == "missed"
+
+    def test_status_reports_live_leader_only(self, db):
+        try_acquire(db, LEADER_LEASE, "w1", 30, now=NOW)
+        assert get_scheduler_status(db, now=NOW)["leader"]["holder"] == "w1"
+        assert get_scheduler_status(db, now=NOW + timedelta(seconds=60))["leader"]["holder"] is None
@@ -4,6 +4,14 @@ from backend.app.core.database import SessionLocal, engine, Base
 from backend.app.models import Patient, Medicine, Order
 from backend.app.models.user import User
 from backend.app.core.security import get_password_hash
+from backend.app.services.catalog_search_service import (
+    ensure_catalog_fts,
+    index_product_metadata,
+)
+from backend.app.services.order_ingestion_service import (
+    find_header_row,
+    parse_daily_dosage,
+)
 
 # ===============================
 # RESET DATABASE (Hackathon Safe)
@@ -11,6 +19,9 @@ from backend.app.core.security import get_password_hash
 Base.metadata.drop_all(bind=engine)
 Base.metadata.create_all(bind=engine)
 
+# FTS5 catalog survives drop_all — clear it and reinstall sync triggers
+ensure_catalog_fts(engine, rebuild=True)
+
 db = SessionLocal()
 
 # ===============================
@@ -20,6 +31,8 @@ db = SessionLocal()
 products_df = pd.read_excel("database/seed/products-export.xlsx")
 products_df.columns = products_df.columns.str.strip()
 
+product_metadata = []
+
 for _, row in products_df.iterrows():
     medicine = Medicine(
         name=str(row["product name"]).strip(),
@@ -29,32 +42,39 @@ for _, row in products_df.iterrows():
     )
     db.add(medicine)
 
+    # Searchable product metadata for the FTS5 catalog
+    metadata = " ".join(
+        str(row[col]).strip()
+        for col in ["pzn", "package size", "descriptions"]
+        if col in products_df.columns and not pd.isna(row[col])
+    )
+    product_metadata.append((medicine, metadata))
+
 db.commit()
+
+index_product_metadata(
+    db,
+    {medicine.id: metadata for medicine, metadata in product_metadata}
+)
 print("✅ Medicines seeded")
 
 # ===============================
 # 2️⃣ LOAD PATIENTS + USERS
 # ===============================
 
+# Single read: locate the 'Patient ID' header row, then promote it
 raw_df = pd.read_excel(
     "database/seed/Consumer Order History 1.xlsx",
     header=None
 )
 
-header_row = None
-for i in range(len(raw_df)):
-    if "Patient ID" in raw_df.iloc[i].values:
-        header_row = i
-        break
+header_row = find_header_row(raw_df.itertuples(index=False))
 
 if header_row is None:
     raise Exception("❌ Could not find 'Patient ID' header")
 
-history_df = pd.read_excel(
-    "database/seed/Consumer Order History 1.xlsx",
-    header=header_row
-)
-
+history_df = raw_df.iloc[header_row + 1:].reset_index(drop=True).infer_objects()
+history_df.columns = [str(c) for c in raw_df.iloc[header_row]]
 history_df.columns = history_df.columns.str.strip()
 history_df = history_df.dropna(subset=["Patient ID"])
 
@@ -98,26 +118,6 @@ for _, row in unique_patients.iterrows():
 
 print("✅ Patients & Users seeded")
 
-# ===============================
-# HELPER: Convert Dosage
-# ===============================
-
-def parse_daily_dosage(dosage_string):
-    try:
-        dosage_string = dosage_string.lower()
-
-        if "-" in dosage_string:
-            parts = dosage_string.split("-")
-            return sum(int(p) for p in parts if p.isdigit())
-
-        if "per day" in dosage_string:
-            return float(dosage_string.split()[0])
-
-        return 1.0
-
-    except:
-        return 1.0
-
 # ===============================
 # INSERT ORDERS
 # ===============================
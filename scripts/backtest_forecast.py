@@ -0,0 +1,57 @@
+import argparse
+import json
+
+from backend.app.core.database import SessionLocal
+from backend.app.models import Medicine
+from backend.app.services.forecast_service import DEFAULT_MODEL, MODELS, backtest
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Backtest demand forecasting models (MAPE + simulated stockout days)"
+    )
+    parser.add_argument("--models", default=",".join(MODELS), help=f"comma-separated: {','.join(MODELS)}")
+    parser.add_argument("--horizon", type=int, default=30)
+    parser.add_argument("--folds", type=int, default=4)
+    parser.add_argument("--step-days", type=int, default=7)
+    parser.add_argument("--safety-days", type=int, default=7)
+    parser.add_argument("--output", help="write results JSON here")
+    args = parser.parse_args()
+
+    models = tuple(m.strip() for m in args.models.split(",") if m.strip())
+    unknown = [m for m in models if m not in MODELS]
+    if unknown:
+        raise SystemExit(f"Unknown models: {unknown} (known: {list(MODELS)})")
+
+    db = SessionLocal()
+    try:
+        medicine_ids = [mid for (mid,) in db.query(Medicine.id).order_by(Medicine.id).all()]
+        result = backtest(
+            db,
+            medicine_ids,
+            models=models,
+            horizon=args.horizon,
+            folds=args.folds,
+            step_days=args.step_days,
+            safety_days=args.safety_days,
+        )
+    finally:
+        db.close()
+
+    print(f"{'model':<12} {'MAPE %':>8} {'stockout d/SKU':>15} {'SKUs out':>9}")
+    for model, scores in result["models"].items():
+        marker = " *" if model == DEFAULT_MODEL else ""
+        print(f"{model:<12} {scores['mape']:>8} {scores['avg_stockout_days_per_sku']:>15} "
+              f"{scores['skus_with_stockout']:>9}{marker}")
+
+    print(f"\n{result['skus']} SKUs, {result['folds']} folds × {result['horizon_days']} days "
+          f"(* = current DEMAND_FORECAST_MODEL)")
+    print(f"🎯 Recommended model: {result['recommended_model']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import argparse
+import time
+
+from backend.app.core.database import engine
+from backend.app.services.order_column_store import (
+    DEFAULT_CHUNK_ROWS,
+    DEFAULT_STORE_DIR,
+    compact_order_store,
+    export_order_store,
+    refresh_order_store,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export orders to the memory-mapped columnar order store"
+    )
+    parser.add_argument("mode", choices=["export", "refresh", "compact"], nargs="?", default="refresh",
+                        help="export = full rebuild, refresh = append new orders (default), "
+                             "compact = merge the delta segment")
+    parser.add_argument("--dir", default=DEFAULT_STORE_DIR)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+
+    if args.mode == "export":
+        result = export_order_store(engine, args.dir, args.chunk_rows)
+    elif args.mode == "refresh":
+        result = refresh_order_store(engine, args.dir, args.chunk_rows)
+    else:
+        compact_order_store(args.dir)
+        result = {"compacted": True}
+
+    print(f"🎉 Order store {args.mode} completed in {time.perf_counter() - started:.1f}s:", result)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,117 +1,288 @@
+import argparse
+import hashlib
 import os
+import time
+from datetime import datetime
+
 import pandas as pd
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
-from backend.app.core.database import SessionLocal
-from backend.app.models.patient import Patient
-from backend.app.models.medicine import Medicine
-from backend.app.models.order import Order
+from backend.app.core.database import SessionLocal, engine
+from backend.app.core.security import get_password_hash
+from backend.app.models import ImportCheckpoint, Medicine, Order, Patient, User
+
+
+# ✅ Default: seed sheet shipped with the repo
+EXCEL_FILE_PATH = os.path.join("database", "seed", "Consumer Order History 1.xlsx")
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Same demo credentials seed_data.py gives imported patients.
+# Hashed once per run — bcrypt per patient dominates large imports.
+DEFAULT_PATIENT_PASSWORD = "password123"
+
+
+# =====================================================
+# SOURCE
+# =====================================================
+
+def file_fingerprint(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_order_sheet(path: str) -> pd.DataFrame:
+    """
+    Reads the sheet once, promotes the auto-detected 'Patient ID'
+    header row and returns a cleaned, typed frame:
+    external_id, age, gender, product_name, quantity, order_date.
+    Row order is deterministic, so row offsets are stable resume points.
+    """
+    raw = pd.read_excel(path, header=None)
+
+    # 🔍 Auto-detect header row (vectorized)
+    header_rows = raw.index[raw.eq("Patient ID").any(axis=1)]
+
+    if len(header_rows) == 0:
+        raise ValueError("Could not find 'Patient ID' header row.")
+
+    header_row = header_rows[0]
+    print(f"✅ Header found at row index: {header_row}")
+
+    df = raw.iloc[header_row + 1:]
+    df.columns = [str(c).strip() for c in raw.iloc[header_row]]
+    df = df.dropna(subset=["Patient ID"])
+
+    gender_column = "Patient Gender" if "Patient Gender" in df.columns else "Patient Gen"
+
+    frame = pd.DataFrame({
+        "external_id": df["Patient ID"].astype(str).str.strip(),
+        "age": pd.to_numeric(df.get("Patient Age"), errors="coerce"),
+        "gender": df.get(gender_column),
+        "product_name": df["Product Name"].astype(str).str.strip(),
+        "quantity": pd.to_numeric(df["Quantity"], errors="coerce"),
+        "order_date": pd.to_datetime(df["Purchase Date"], errors="coerce"),
+    })
+
+    frame = frame.dropna(subset=["quantity", "order_date"])
+    frame["quantity"] = frame["quantity"].astype(int)
+    frame["order_date"] = frame["order_date"].dt.date
+
+    return frame.reset_index(drop=True)
+
+
+# =====================================================
+# IN-MEMORY RESOLUTION + BULK CREATE
+# =====================================================
+
+def resolve_patients(db: Session, frame: pd.DataFrame) -> tuple:
+    """
+    Returns ({external_id: patient_id}, created_count).
+    Missing patients (and their login users) are bulk-inserted.
+    """
+    patient_ids = dict(db.query(Patient.external_patient_id, Patient.id).all())
+
+    missing = (
+        frame.drop_duplicates("external_id")
+        .loc[lambda f: ~f["external_id"].isin(patient_ids.keys())]
+    )
+
+    if missing.empty:
+        return patient_ids, 0
+
+    password_hash = get_password_hash(DEFAULT_PATIENT_PASSWORD)
+    user_ids = dict(db.query(User.email, User.id).all())
+
+    emails = {ext: f"patient{ext}@demo.com" for ext in missing["external_id"]}
+    new_users = [
+        {"email": email, "hashed_password": password_hash, "role": "patient"}
+        for email in emails.values()
+        if email not in user_ids
+    ]
+
+    if new_users:
+        db.execute(insert(User), new_users)
+        user_ids = dict(db.query(User.email, User.id).all())
+
+    db.execute(insert(Patient), [
+        {
+            "external_patient_id": ext,
+            "name": f"Patient {ext}",
+            "age": int(age) if not pd.isna(age) else 0,
+            "gender": str(gender).strip() if not pd.isna(gender) else "Unknown",
+            "user_id": user_ids[emails[ext]],
+        }
+        for ext, age, gender in zip(missing["external_id"], missing["age"], missing["gender"])
+    ])
+    db.commit()
+
+    patient_ids = dict(db.query(Patient.external_patient_id, Patient.id).all())
+    return patient_ids, len(missing)
+
 
+def resolve_medicines(db: Session, frame: pd.DataFrame) -> tuple:
+    """
+    Returns ({product_name: medicine_id}, created_count).
+    Unknown products are bulk-inserted with placeholder price/stock.
+    """
+    medicine_ids = dict(db.query(Medicine.name, Medicine.id).all())
 
-# ✅ Exact file path
-EXCEL_FILE_PATH = r"D:\Hackfusion\Website\1\pharmaagentx\database\seed\Consumer Order History 1.xlsx"
+    missing = [
+        name for name in frame["product_name"].unique()
+        if name not in medicine_ids
+    ]
 
+    if not missing:
+        return medicine_ids, 0
 
-def import_orders():
+    db.execute(insert(Medicine), [
+        {"name": name, "price": 0.0, "stock": 100, "prescription_required": False}
+        for name in missing
+    ])
+    db.commit()
+
+    medicine_ids = dict(db.query(Medicine.name, Medicine.id).all())
+    return medicine_ids, len(missing)
+
+
+# =====================================================
+# CHECKPOINT
+# =====================================================
+
+def get_checkpoint(db: Session, source_key: str, path: str, total_rows: int, restart: bool):
+    checkpoint = db.query(ImportCheckpoint).filter(
+        ImportCheckpoint.source_key == source_key
+    ).first()
+
+    if not checkpoint:
+        checkpoint = ImportCheckpoint(source_key=source_key, source_path=path)
+        db.add(checkpoint)
+
+    if restart:
+        checkpoint.rows_committed = 0
+
+    checkpoint.total_rows = total_rows
+    checkpoint.status = "RUNNING"
+    checkpoint.updated_at = datetime.utcnow()
+    db.commit()
+
+    return checkpoint
+
+
+# =====================================================
+# IMPORT
+# =====================================================
+
+def import_orders(
+    path: str = EXCEL_FILE_PATH,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    restart: bool = False
+) -> dict:
+    """
+    Chunked, resumable order history import.
+
+    Each chunk of orders is inserted with one executemany and
+    committed together with the checkpoint offset, so a rerun
+    after a crash continues from the last committed chunk.
+    Re-running a completed import inserts nothing.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Order history file not found: {path}")
+
+    ImportCheckpoint.__table__.create(bind=engine, checkfirst=True)
+
+    started = time.perf_counter()
     db: Session = SessionLocal()
 
     try:
-        print("📂 Checking file path...")
-        print("File exists:", os.path.exists(EXCEL_FILE_PATH))
-
-        if not os.path.exists(EXCEL_FILE_PATH):
-            print("❌ Excel file not found.")
-            return
-
-        print("📂 Reading Excel without header...")
-        raw_df = pd.read_excel(EXCEL_FILE_PATH, header=None)
-
-        # 🔍 Auto-detect header row
-        header_row_index = None
-        for i, row in raw_df.iterrows():
-            if "Patient ID" in row.values:
-                header_row_index = i
-                break
-
-        if header_row_index is None:
-            print("❌ Could not find 'Patient ID' header row.")
-            return
-
-        print(f"✅ Header found at row index: {header_row_index}")
-
-        # Re-read using correct header
-        df = pd.read_excel(EXCEL_FILE_PATH, header=header_row_index)
-
-        print("✅ Columns detected:", df.columns.tolist())
-
-        for _, row in df.iterrows():
-
-            if pd.isna(row.get("Patient ID")):
-                continue
-
-            # --------- Extract Data ---------
-            external_id = str(row["Patient ID"]).strip()
-            age = row.get("Patient Age")
-            gender = row.get("Patient Gen") or row.get("Patient Gender")
-            product_name = str(row["Product Name"]).strip()
-            quantity = int(row["Quantity"])
-            order_date = pd.to_datetime(row["Purchase Date"]).date()
-
-            # --------- 1️⃣ Get or Create Patient ---------
-            patient = db.query(Patient).filter(
-                Patient.external_patient_id == external_id
-            ).first()
-
-            if not patient:
-                patient = Patient(
-                    external_patient_id=external_id,
-                    name=external_id,
-                    age=int(age) if not pd.isna(age) else None,
-                    gender=str(gender) if gender else None
-                )
-                db.add(patient)
-                db.commit()
-                db.refresh(patient)
-                print(f"👤 Created patient {external_id}")
-
-            # --------- 2️⃣ Get or Create Medicine ---------
-            medicine = db.query(Medicine).filter(
-                Medicine.name == product_name
-            ).first()
-
-            if not medicine:
-                medicine = Medicine(
-                    name=product_name,
-                    price=0.0,
-                    stock=100,
-                    prescription_required=False
-                )
-                db.add(medicine)
-                db.commit()
-                db.refresh(medicine)
-                print(f"💊 Created medicine {product_name}")
-
-            # --------- 3️⃣ Create Order ---------
-            order = Order(
-                patient_id=patient.id,
-                medicine_id=medicine.id,
-                quantity=quantity,
-                order_date=order_date,
-                daily_dosage=1,
-                dosage_frequency="Once daily"
-            )
-
-            db.add(order)
+        print(f"📂 Reading {path} ...")
+        frame = load_order_sheet(path)
+        print(f"✅ {len(frame)} order rows parsed in {time.perf_counter() - started:.1f}s")
 
+        checkpoint = get_checkpoint(db, file_fingerprint(path), path, len(frame), restart)
+        start_row = checkpoint.rows_committed
+
+        if start_row >= len(frame):
+            print("✅ Already imported — nothing to do.")
+            checkpoint.status = "COMPLETED"
+            db.commit()
+            return {"rows_imported": 0, "resumed_from": start_row, "total_rows": len(frame)}
+
+        if start_row:
+            print(f"↩ Resuming from row {start_row}")
+
+        patient_ids, patients_created = resolve_patients(db, frame)
+        medicine_ids, medicines_created = resolve_medicines(db, frame)
+        print(f"👤 {patients_created} patients created, 💊 {medicines_created} medicines created")
+
+        patient_column = frame["external_id"].map(patient_ids).tolist()
+        medicine_column = frame["product_name"].map(medicine_ids).tolist()
+        quantity_column = frame["quantity"].tolist()
+        date_column = frame["order_date"].tolist()
+
+        import_started = time.perf_counter()
+
+        for chunk_start in range(start_row, len(frame), chunk_size):
+            chunk_end = min(chunk_start + chunk_size, len(frame))
+            chunk_timer = time.perf_counter()
+
+            db.execute(insert(Order), [
+                {
+                    "patient_id": patient_column[i],
+                    "medicine_id": medicine_column[i],
+                    "quantity": quantity_column[i],
+                    "order_date": date_column[i],
+                    "daily_dosage": 1,
+                    "dosage_frequency": "Once daily",
+                }
+                for i in range(chunk_start, chunk_end)
+            ])
+
+            checkpoint.rows_committed = chunk_end
+            checkpoint.updated_at = datetime.utcnow()
+            db.commit()
+
+            chunk_rate = (chunk_end - chunk_start) / (time.perf_counter() - chunk_timer)
+            print(f"📦 rows {chunk_start}-{chunk_end} committed ({chunk_rate:,.0f} rows/sec)")
+
+        checkpoint.status = "COMPLETED"
         db.commit()
-        print("🎉 Excel import completed successfully!")
 
-    except Exception as e:
-        print("❌ Error during import:", e)
+        imported = len(frame) - start_row
+        import_seconds = time.perf_counter() - import_started
+        total_seconds = time.perf_counter() - started
+
+        result = {
+            "rows_imported": imported,
+            "resumed_from": start_row,
+            "total_rows": len(frame),
+            "patients_created": patients_created,
+            "medicines_created": medicines_created,
+            "insert_rows_per_sec": round(imported / import_seconds) if import_seconds else None,
+            "end_to_end_rows_per_sec": round(imported / total_seconds) if total_seconds else None,
+            "seconds": round(total_seconds, 2),
+        }
+
+        print("🎉 Import completed:", result)
+        return result
+
+    except Exception:
+        db.rollback()
+        raise
 
     finally:
         db.close()
 
 
 if __name__ == "__main__":
-    import_orders()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Import consumer order history")
+    parser.add_argument("--file", default=EXCEL_FILE_PATH)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--restart", action="store_true", help="ignore the saved checkpoint")
+    args = parser.parse_args()
+
+    import_orders(args.file, args.chunk_size, args.restart)
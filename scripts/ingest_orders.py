@@ -0,0 +1,61 @@
+import argparse
+
+from backend.app.core.database import SessionLocal, engine
+from backend.app.models import OrderIngestionRecord
+from backend.app.services.order_ingestion_service import (
+    DEFAULT_BATCH_SIZE,
+    READERS,
+    ingest_order_feed,
+)
+
+
+def _parse_mapping(pairs) -> dict:
+    overrides = {}
+    for pair in pairs or []:
+        source, _, field = pair.partition("=")
+        if not field:
+            raise SystemExit(f"Invalid --map '{pair}', expected 'Source Column=field'")
+        overrides[source.strip()] = field.strip()
+    return overrides
+
+
+def _print_progress(batch_number, batch_stats, totals):
+    print(
+        f"📦 batch {batch_number}: +{batch_stats['inserted']} inserted, "
+        f"{batch_stats['duplicates']} duplicates, {batch_stats['rejected']} rejected "
+        f"(total rows {totals['rows']})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Stream a CSV / NDJSON / Parquet order feed into the orders table"
+    )
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=list(READERS), default=None,
+                        help="defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--map", action="append", metavar="'Source Column=field'",
+                        help="extra column mapping, e.g. 'Qty=quantity' (repeatable)")
+    args = parser.parse_args()
+
+    OrderIngestionRecord.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        result = ingest_order_feed(
+            db,
+            args.path,
+            fmt=args.format,
+            batch_size=args.batch_size,
+            column_overrides=_parse_mapping(args.map),
+            progress=_print_progress,
+        )
+    finally:
+        db.close()
+
+    print("🎉 Ingestion completed:", result)
+
+
+if __name__ == "__main__":
+    main()
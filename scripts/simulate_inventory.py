@@ -0,0 +1,103 @@
+import argparse
+import json
+from dataclasses import replace
+
+from backend.app.core.database import SessionLocal
+from backend.app.services.forecast_service import MODELS
+from backend.app.services.inventory_simulation_service import (
+    SimulationPolicy,
+    load_history,
+    run_simulation,
+    synthetic_history,
+)
+
+
+METRICS = (
+    "stockout_days",
+    "skus_with_stockout",
+    "fill_rate",
+    "restock_count",
+    "units_restocked",
+    "units_queued",
+    "avg_inventory_held",
+    "reviews_created",
+    "elapsed_seconds",
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay order history through the inventory, demand and mitigation logic "
+                    "under candidate thresholds and compare against the current ones"
+    )
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--initial-cover-days", type=float,
+                        help="start every SKU at N days of demand instead of its current stock")
+    parser.add_argument("--synthetic-skus", type=int,
+                        help="simulate generated demand for N SKUs instead of the database")
+    parser.add_argument("--seed", type=int, default=42)
+
+    parser.add_argument("--depletion-days", type=float, help="PREDICTIVE_DEPLETION_THRESHOLD_DAYS")
+    parser.add_argument("--safety-buffer-days", type=float, help="SAFETY_BUFFER_DAYS")
+    parser.add_argument("--low-stock", type=int, help="LOW_STOCK_THRESHOLD")
+    parser.add_argument("--safe-auto", type=int, help="SAFE_AUTO_THRESHOLD")
+    parser.add_argument("--mode", choices=["AUTO", "REVIEW", "SAFE"], default="AUTO")
+    parser.add_argument("--model", choices=MODELS, help="demand forecast model")
+    parser.add_argument("--honor-quantity", action="store_true",
+                        help="restock the requested quantity (the warehouse currently adds a fixed 50)")
+    parser.add_argument("--drain-queue", action="store_true",
+                        help="deliver demand-scan restocks (the restock queue is currently never drained)")
+    parser.add_argument("--lead-time", type=int, default=0, help="days between restock request and delivery")
+    parser.add_argument("--output", help="write results JSON here")
+    args = parser.parse_args()
+
+    if args.synthetic_skus:
+        history = synthetic_history(args.synthetic_skus, args.days, args.seed)
+    else:
+        db = SessionLocal()
+        try:
+            history = load_history(db, days=args.days, initial_cover_days=args.initial_cover_days)
+        finally:
+            db.close()
+
+    baseline = SimulationPolicy(
+        mode=args.mode,
+        honor_restock_quantity=args.honor_quantity,
+        drain_restock_queue=args.drain_queue,
+        lead_time_days=args.lead_time,
+    )
+
+    overrides = {
+        field: value
+        for field, value in (
+            ("predictive_depletion_threshold_days", args.depletion_days),
+            ("safety_buffer_days", args.safety_buffer_days),
+            ("low_stock_threshold", args.low_stock),
+            ("safe_auto_threshold", args.safe_auto),
+            ("forecast_model", args.model),
+        )
+        if value is not None
+    }
+
+    results = {"baseline": run_simulation(history, baseline)}
+
+    if overrides:
+        results["candidate"] = run_simulation(history, replace(baseline, **overrides))
+
+    print(f"{len(history.medicine_ids)} SKUs × {results['baseline']['days']} days "
+          f"from {results['baseline']['start']}")
+
+    if overrides:
+        print("Candidate:", ", ".join(f"{k}={v}" for k, v in overrides.items()))
+
+    print(f"\n{'metric':<22}" + "".join(f"{name:>14}" for name in results))
+    for metric in METRICS:
+        print(f"{metric:<22}" + "".join(f"{r[metric]:>14}" for r in results.values()))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()